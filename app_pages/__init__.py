@@ -0,0 +1,3 @@
+# app_pages/__init__.py
+# Pages de l'app Streamlit (st.navigation, cf. app_yorgios.py) et leur couche
+# données commune (common.py). Chaque page est un script exécuté seul à chaque clic.
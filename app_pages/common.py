@@ -0,0 +1,528 @@
+# app_pages/common.py
+# Couche données partagée par les pages de l'app (cf. app_yorgios.py) : journal
+# d'écritures, lectures Sheets en cache, handles, catalogue produits, livraisons
+# et vitrine. Importé une fois par processus : rien ici ne parle à Google au
+# chargement du module, seulement quand une page en a besoin.
+from __future__ import annotations
+import os
+import time
+import re
+import unicodedata
+import uuid
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple
+
+import pandas as pd
+import gspread
+import streamlit as st
+from gspread.exceptions import WorksheetNotFound
+
+from yorgios_core import runtime
+from yorgios_core.config import (
+    SHEET_COMMANDES_ID, SHEET_HYGIENE_ID, SHEET_TEMP_ID, SHEET_PLANNING_ID,
+    SHEET_PRODUITS_ID, SHEET_RESP_ID,
+    LIVRAISON_PHOTO_FOLDER_ID_DEFAULT, LIVRAISON_WS, LIVRAISON_HEADERS,
+)
+from yorgios_core.snapshots import Snapshot, sheet_tag, worksheet_tag
+from yorgios_core.runtime import drive_client, read_ttl, snapshot_cache
+from yorgios_core.pdf_jobs import PdfJobManager
+from yorgios_core.protocol_search import ProtocolIndex
+from yorgios_core.photo_queue import PhotoUploadQueue
+from yorgios_core.journal import OP_MERGE_CELLS, OP_MERGE_RECORDS, OP_REPLACE_VALUES, WriteJournal, overlay_values
+from yorgios_core.concurrency import merge_grid
+from yorgios_core.idempotency import REQ_ID_COLUMN, dedup_frame
+from yorgios_core.fefo import SOURCE_FRIGO, SOURCE_VITRINE, FefoIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ———————————————————————————————
+# FONCTIONS UTILITAIRES GÉNÉRALES
+# ———————————————————————————————
+def normalize_text_no_accents(s: str) -> str:
+    if not isinstance(s, str):
+        s = str(s or "")
+    s = s.strip().lower()
+    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+    return s
+
+def normalize_col(c: str) -> str:
+    nfkd = unicodedata.normalize("NFKD", c)
+    return (
+        nfkd.encode("ascii", "ignore")
+        .decode()
+        .strip()
+        .lower()
+        .replace(" ", "_")
+    )
+
+# ———————————————————————————————
+# CACHES LECTURE SHEETS
+# ———————————————————————————————
+# Rendus PDF en arrière-plan, mis en cache par période + empreinte des données
+@st.cache_resource
+def pdf_jobs() -> PdfJobManager:
+    return PdfJobManager()
+
+# Journal local des écritures : toute modification des Sheets passe par lui
+# (cf. yorgios_core/journal.py) ; un thread la rejoue dès que le réseau répond.
+# Partageable entre répliques d'un même nœud (chaque entrée est prise avant
+# d'être appliquée), comme le spool des photos et LAST_KNOWN_DIR.
+JOURNAL_PATH = st.secrets.get(
+    "JOURNAL_PATH",
+    os.path.join(ROOT, ".spool", "journal.db"),
+)
+
+@st.cache_resource
+def write_journal() -> WriteJournal:
+    # client avec reprises automatiques (429/5xx), du même compte de service que
+    # les lectures (cf. runtime) : les ajouts étant idempotents (colonne __req_id),
+    # rejouer une requête ne crée pas de doublon
+    client = runtime.retrying_sheets_client()
+    cache = snapshot_cache()
+
+    def on_applied(entry):
+        # seul l'onglet écrit (et ce qui en dérive) est rechargé, pas les autres caches
+        cache.invalidate_worksheet(entry.sheet_id, entry.worksheet)
+
+    return WriteJournal(JOURNAL_PATH, client.open_by_key, on_applied=on_applied).start()
+
+def device_id() -> str:
+    """Identifiant stable de l'appareil, porté par l'URL (?device=…) pour survivre aux rechargements."""
+    dev = st.query_params.get("device")
+    if not dev:
+        dev = uuid.uuid4().hex[:10]
+        st.query_params["device"] = dev
+    return dev
+
+def journal_write(sheet_id: str, worksheet: str, op: str, payload: dict, key=None) -> str:
+    return write_journal().submit(sheet_id, worksheet, op, payload, key=key, device=device_id())
+
+def journal_merge(sheet_id: str, title: str, changes, value_input_option: str = "RAW") -> str:
+    """
+    Écriture cellule par cellule avec fusion à trois voies. Vérifiée tout de suite
+    contre la grille en cache (lève WriteConflict pour l'afficher à l'utilisateur),
+    puis rejouée par le journal, qui refait la fusion contre l'état réel au moment
+    d'écrire : l'enregistrement n'attend jamais Google.
+    """
+    changes = [c.as_dict() for c in changes]
+    try:
+        current = ws_values(sheet_id, title)
+    except Exception:
+        # pas de grille lisible : la fusion (et la détection de conflit) se fera au rejeu
+        current = None
+    if current is not None:
+        merge_grid(current, changes)
+    return journal_write(sheet_id, title, OP_MERGE_CELLS, {
+        "changes": changes, "key_col": 0, "value_input_option": value_input_option,
+    })
+
+def ws_titles(key: str):
+    return runtime.worksheet_titles(key)
+
+def ws_values(key: str, title: str):
+    """
+    Valeurs brutes (tuples immuables) de l’onglet, partagées entre sessions
+    (cf. runtime.worksheet_values), avec les écritures du journal pas encore appliquées.
+    """
+    return write_journal().overlay(key, title, runtime.worksheet_values(key, title))
+
+def ws_values_safe(key: str, title: str, retries: int = 3, base_delay: float = 0.7):
+    for i in range(retries):
+        try:
+            return ws_values(key, title)
+        except Exception:
+            if i == retries - 1:
+                raise
+            time.sleep(base_delay * (i + 1))
+
+# ———————————————————————————————
+# RETRY POUR open_by_key
+# ———————————————————————————————
+def open_sheet_retry(key):
+    # handle ouvert au premier usage, une fois par processus : un sheet injoignable
+    # n'arrête plus toute l'app, les lectures passent en mode dégradé (cf. runtime._read)
+    return runtime.LazySpreadsheet(key)
+
+# ———————————————————————————————
+# CLIENT DRIVE & LECTURE PROTOCOLES
+# ———————————————————————————————
+
+@st.cache_resource
+def protocol_index() -> ProtocolIndex:
+    return ProtocolIndex()
+
+def upload_livraison_photo(uploaded_file, produit: str, horodatage):
+    """
+    Met une photo de réception en file d'envoi vers le dossier Drive dédié.
+    Retourne aussitôt un marqueur « en attente », remplacé dans le sheet par le
+    lien partageable une fois l'upload fait, ou directement le lien si la même
+    image a déjà été envoyée (cf. yorgios_core/photo_queue.py).
+    """
+    if uploaded_file is None:
+        return ""
+    if not LIVRAISON_PHOTO_FOLDER_ID:
+        st.warning("Dossier Drive pour les photos de livraison non configuré (LIVRAISON_PHOTO_FOLDER_ID).")
+        return ""
+    try:
+        if isinstance(horodatage, datetime):
+            ts = horodatage.strftime("%Y%m%d-%H%M%S")
+        else:
+            ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+        base_name = f"{produit}-{ts}".strip().replace(" ", "_")
+        base_name = re.sub(r"[^A-Za-z0-9._-]", "_", base_name)
+
+        mime_type = getattr(uploaded_file, "type", None) or "image/jpeg"
+        return photo_queue().enqueue(uploaded_file.getvalue(), base_name, mime_type)
+    except Exception as e:
+        st.warning(f"Impossible d’enregistrer la photo pour {produit} : {e}")
+        return ""
+
+# ———————————————————————————————
+# IDS Google Sheets & CHARGEMENT
+# ———————————————————————————————
+# (identifiants centralisés dans yorgios_core/config.py, partagés avec les scripts)
+LIVRAISON_PHOTO_FOLDER_ID = st.secrets.get(
+    "LIVRAISON_PHOTO_FOLDER_ID",
+    LIVRAISON_PHOTO_FOLDER_ID_DEFAULT
+).strip()
+
+
+# handles mis en cache par processus ; plus de ss.worksheet(...) ici : chacun coûtait
+# un appel de métadonnées à chaque rerun
+ss_cmd      = open_sheet_retry(SHEET_COMMANDES_ID)
+
+ss_hygiene  = open_sheet_retry(SHEET_HYGIENE_ID)
+ss_temp     = open_sheet_retry(SHEET_TEMP_ID)
+ss_planning = open_sheet_retry(SHEET_PLANNING_ID)
+ss_resp     = open_sheet_retry(SHEET_RESP_ID)
+
+# ———————————————————————————————
+# UTILITAIRES STOCKAGE FRIGO
+# ———————————————————————————————
+def load_df(sh, ws_name):
+    # lecture en cache : les écritures fusionnent avec l'état courant (OP_MERGE_RECORDS)
+    values = ws_values(sh.id, ws_name)
+    if not values:
+        return pd.DataFrame()
+    return pd.DataFrame(values[1:], columns=values[0])
+
+STOCK_COLUMNS = ["frigo", "article", "quantite", "dlc"]
+
+def _stock_records(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.reindex(columns=STOCK_COLUMNS).copy()
+    df["dlc"] = pd.to_datetime(df["dlc"], format="mixed", dayfirst=True, errors="coerce") \
+                  .dt.strftime("%Y-%m-%d") \
+                  .fillna("")
+    return df.fillna("").astype(str)
+
+def save_df(sh, ws_name, df: pd.DataFrame, base: pd.DataFrame):
+    """
+    Enregistre `df` comme modification de `base` (les lignes brutes lues avant
+    modification) : seuls les articles retirés / ajoutés sont appliqués à l'état
+    courant de l'onglet, sans écraser ce que les autres appareils ont saisi entre-temps.
+    """
+    base = base.reindex(columns=STOCK_COLUMNS).fillna("").astype(str)
+    fmt_base, fmt_new = _stock_records(base), _stock_records(df)
+    new = []
+    for i, rec in zip(fmt_new.index, fmt_new.values.tolist()):
+        # ligne inchangée : on garde sa forme d'origine pour qu'elle ne compte pas comme modifiée
+        if i in base.index and fmt_base.loc[i].tolist() == rec:
+            rec = base.loc[i].tolist()
+        new.append(rec)
+    journal_write(sh.id, ws_name, OP_MERGE_RECORDS, {
+        "columns": STOCK_COLUMNS,
+        "base": base.values.tolist(),
+        "new": new,
+        "value_input_option": "RAW",
+    })
+
+# === Objectifs CA ===
+def _build_objectifs_snapshot() -> Snapshot:
+    try:
+        try:
+            ws = ss_cmd.worksheet("objectifs")
+        except WorksheetNotFound:
+            ws = ss_cmd.worksheet("Objectifs")
+    except WorksheetNotFound:
+        return Snapshot(pd.DataFrame())
+
+    values = ws.get_all_values()
+    if not values or len(values) < 2:
+        return Snapshot(pd.DataFrame())
+
+    header = values[0]
+    rows   = values[1:]
+    return Snapshot(pd.DataFrame(rows, columns=header))
+
+def load_objectifs_df() -> pd.DataFrame:
+    """Vue zéro-copie de l’instantané 'objectifs' (rafraîchi toutes les 10 min)."""
+    return snapshot_cache().get(
+        ("objectifs",), _build_objectifs_snapshot, ttl=read_ttl(600),
+        tags=[sheet_tag(SHEET_COMMANDES_ID), worksheet_tag(SHEET_COMMANDES_ID, "objectifs")],
+    ).view()
+
+# ———————————————————————————————
+# PRODUITS + DÉNOMINATION GEP
+# ———————————————————————————————
+def _norm_gep_key(s: str) -> str:
+    s = unicodedata.normalize("NFKD", str(s)).encode("ascii", "ignore").decode("ascii")
+    return s.strip().lower()
+
+class Catalogue(NamedTuple):
+    gep_mapping: Dict[str, str]      # produit → dénomination GEP
+    produits: List[str]              # première colonne de l'onglet « Produits »
+    livraison_produits: List[str]    # produits ayant une dénomination GEP (sinon tous)
+
+def _build_catalogue() -> Catalogue:
+    try:
+        df_produits = pd.DataFrame(runtime.worksheet_records(SHEET_PRODUITS_ID, "Produits"))
+    except Exception:
+        df_produits = pd.DataFrame()
+
+    if not df_produits.empty:
+        cols_norm = {normalize_col(c): c for c in df_produits.columns}
+
+        col_nom = None
+        for key in ("produit", "nom_produit", "produit_yorgios"):
+            if key in cols_norm:
+                col_nom = cols_norm[key]
+                break
+
+        col_gep = None
+        for key in ("denomination_gep", "denomination_gep_", "gep", "categorie_gep"):
+            if key in cols_norm:
+                col_gep = cols_norm[key]
+                break
+
+        if col_nom:
+            df_produits["__nom__"] = df_produits[col_nom].astype(str).str.strip()
+        else:
+            df_produits["__nom__"] = ""
+
+        if col_gep:
+            df_produits["__gep__"] = df_produits[col_gep].astype(str).str.strip()
+        else:
+            df_produits["__gep__"] = ""
+    else:
+        df_produits = pd.DataFrame(columns=["__nom__", "__gep__"])
+
+    gep_mapping = {
+        row["__nom__"]: row["__gep__"]
+        for _, row in df_produits.iterrows()
+        if str(row.get("__nom__", "")).strip() and str(row.get("__gep__", "")).strip()
+    }
+    produits_gep_list = sorted(gep_mapping.keys())
+
+    try:
+        produits_list = sorted(set(
+            row[0].strip() for row in runtime.worksheet_values(SHEET_PRODUITS_ID, "Produits")
+            if row and row[0].strip()
+        ))
+    except Exception:
+        produits_list = produits_gep_list
+
+    return Catalogue(gep_mapping, produits_list, produits_gep_list if produits_gep_list else produits_list)
+
+def load_catalogue() -> Catalogue:
+    """Catalogue construit une fois par lecture de l'onglet, plus à chaque rerun de chaque page."""
+    return snapshot_cache().get(
+        ("catalogue",), _build_catalogue, ttl=read_ttl(600),
+        tags=[sheet_tag(SHEET_PRODUITS_ID), worksheet_tag(SHEET_PRODUITS_ID, "Produits")],
+    )
+
+GEP_RULES = {
+    "viande hachee":       {"min": 0.0, "max": 2.0, "max_tol": 3.0},
+    "viande":              {"min": 0.0, "max": 3.0, "max_tol": 5.0},
+    "lait":                {"min": 0.0, "max": 4.0, "max_tol": 6.0},
+    "plat cuisine":        {"min": 0.0, "max": 3.0, "max_tol": 5.0},
+    "plat cuisine frais":  {"min": 0.0, "max": 3.0, "max_tol": 5.0},
+    "patisserie":          {"min": 0.0, "max": 3.0, "max_tol": 5.0},
+    "patisserie fraiche":  {"min": 0.0, "max": 3.0, "max_tol": 5.0},
+    "legume":              {"min": 0.0, "max": 8.0, "max_tol": 10.0},
+    "legumes":             {"min": 0.0, "max": 8.0, "max_tol": 10.0},
+    "poisson":             {"min": 0.0, "max": 2.0, "max_tol": 3.0},
+}
+
+def get_gep_rule(denom_gep: str):
+    key = _norm_gep_key(denom_gep)
+    return GEP_RULES.get(key)
+
+def parse_temp_to_float(temp_str: str):
+    if not isinstance(temp_str, str):
+        temp_str = str(temp_str or "")
+    temp_str = temp_str.replace(" ", "").replace(",", ".")
+    try:
+        return float(temp_str)
+    except ValueError:
+        return None
+
+def compute_reception_result(temp_recep_txt: str, denomination_gep: str) -> str:
+    t = parse_temp_to_float(temp_recep_txt)
+    if t is None:
+        return ""
+    rule = get_gep_rule(denomination_gep)
+    if not rule:
+        return ""
+    return "✅ Accepté" if t <= rule["max_tol"] else "❌ Refusé"
+
+# ———————————————————————————————
+# TEMPÉRATURES DE LIVRAISON (sheet)
+# ———————————————————————————————
+# Onglet vérifié (en-têtes) une fois par processus : plus de lecture complète à chaque écriture
+@st.cache_resource
+def get_livraison_temp_ws():
+    headers_target = LIVRAISON_HEADERS
+    try:
+        ws = ss_cmd.worksheet(LIVRAISON_WS)
+    except WorksheetNotFound:
+        ws = ss_cmd.add_worksheet(LIVRAISON_WS, rows=1000, cols=len(headers_target))
+        ws.update("A1", [headers_target])
+        return ws
+
+    try:
+        existing = ws.get_all_values()
+        if not existing:
+            ws.update("A1", [headers_target])
+            return ws
+
+        current_header = existing[0]
+        # la colonne masquée __req_id (ajouts idempotents) peut suivre les en-têtes attendus
+        n = len(headers_target)
+        if current_header[:n] != headers_target:
+            if REQ_ID_COLUMN in current_header[:n]:
+                # en-tête plus court : colonnes vides insérées avant __req_id (et ses
+                # valeurs), qui reste ainsi derrière les en-têtes attendus
+                i = current_header.index(REQ_ID_COLUMN)
+                ws.insert_cols([[] for _ in range(n - i)], col=i + 1)
+            # seules les cellules d'en-tête sont réécrites : données et colonnes
+            # suivantes restent en place (pas de clear() suivi d'une réécriture)
+            ws.update(f"A1:{gspread.utils.rowcol_to_a1(1, n)}", [headers_target])
+    except Exception:
+        pass
+
+    return ws
+
+LIVRAISON_TAGS = [sheet_tag(SHEET_COMMANDES_ID), worksheet_tag(SHEET_COMMANDES_ID, LIVRAISON_WS)]
+
+def _livraison_values():
+    # get_livraison_temp_ws crée l'onglet et complète l'en-tête au besoin
+    return runtime.worksheet_values(
+        SHEET_COMMANDES_ID, LIVRAISON_WS, ttl=300,
+        load=lambda: get_livraison_temp_ws().get_all_values() or [LIVRAISON_HEADERS],
+    )
+
+def livraison_headers() -> List[str]:
+    """En-tête réel de l'onglet, sans les colonnes ajoutées par l'instantané (__row__)."""
+    values = _livraison_values()
+    return list(values[0]) if values and values[0] else list(LIVRAISON_HEADERS)
+
+def livraison_snapshot(values) -> Snapshot:
+    header = list(values[0]) if values else LIVRAISON_HEADERS
+    df = pd.DataFrame([list(r) for r in values[1:]], columns=header)
+    # n° de ligne Sheets (pour les mises à jour) fixé avant d'écarter les doublons
+    df["__row__"] = range(2, 2 + len(df))
+    df = dedup_frame(df).reset_index(drop=True)
+    derived = {}
+    if "Horodatage départ" in df.columns:
+        # parsé une seule fois par instantané, plus à chaque rerun
+        derived["Horodatage départ"] = lambda d: pd.to_datetime(d["Horodatage départ"], errors="coerce")
+    return Snapshot(df, derived=derived)
+
+def load_livraison_snapshot() -> Snapshot:
+    pending = write_journal().pending(SHEET_COMMANDES_ID, LIVRAISON_WS)
+    if pending:
+        # écritures locales pas encore dans le sheet : instantané propre à ce rerun
+        return livraison_snapshot(overlay_values(_livraison_values(), pending))
+    return snapshot_cache().get(("livraison",), lambda: livraison_snapshot(_livraison_values()), ttl=read_ttl(300), tags=LIVRAISON_TAGS)
+
+def load_livraison_temp_df() -> pd.DataFrame:
+    """Vue zéro-copie du journal de livraison, « Horodatage départ » déjà en datetime."""
+    return load_livraison_snapshot().view()
+
+PHOTO_SPOOL_DIR = st.secrets.get(
+    "PHOTO_SPOOL_DIR",
+    os.path.join(ROOT, ".spool", "photos"),
+)
+
+def _prepare_livraison_photo(data: bytes, name: str, mime: str, settings):
+    """Orientation, redimensionnement et recompression avant l'upload (exécuté par le worker)."""
+    from yorgios_core.photos import prepare_photo   # Pillow chargé par le worker seulement
+    photo = prepare_photo(data, settings, mime)
+    return photo.data, f"{name}.{photo.ext}", photo.mime
+
+@st.cache_resource
+def photo_queue() -> PhotoUploadQueue:
+    # objet capturé ici : le report des liens tourne hors du contexte Streamlit.
+    # Il passe par le journal, donc après la saisie de réception qui a posé le marqueur.
+    from yorgios_core.photos import PhotoSettings
+    journal = write_journal()
+    settings = PhotoSettings.from_mapping(st.secrets)
+
+    def backfill(links):
+        journal.submit(
+            SHEET_COMMANDES_ID, LIVRAISON_WS, OP_REPLACE_VALUES,
+            {"column": "Lien photo", "default_col": 7, "mapping": links},
+        )
+
+    return PhotoUploadQueue(
+        drive_client(), LIVRAISON_PHOTO_FOLDER_ID, PHOTO_SPOOL_DIR, backfill,
+        prepare=lambda data, name, mime: _prepare_livraison_photo(data, name, mime, settings),
+    )
+
+def livraison_jour_depart(snap: Snapshot) -> pd.Series:
+    """Date (sans l’heure) de départ, calculée une fois par instantané."""
+    return snap.derived("jour_depart", lambda d: d["Horodatage départ"].dt.date)
+
+# ———————————————————————————————
+# VITRINE – OUTILS COMMUNS
+# ———————————————————————————————
+def vitrine_df_norm_active(raw=None):
+    if raw is None:
+        raw = ws_values_safe(SHEET_COMMANDES_ID, "Vitrine")
+    if not raw:
+        return pd.DataFrame(), []
+    header_raw = raw[0]
+    cols = [normalize_col(c) for c in header_raw]
+    df_raw = pd.DataFrame(raw[1:], columns=cols)
+    if "date_retrait" not in df_raw.columns:
+        df_raw["date_retrait"] = ""
+    actifs = df_raw[df_raw["date_retrait"] == ""].copy()
+    return actifs, cols
+
+def df_dlc_alerts(raw=None):
+    actifs, cols = vitrine_df_norm_active(raw)
+    if actifs.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    today_dt = pd.Timestamp(date.today())
+    if "dlc" not in actifs.columns:
+        return pd.DataFrame(), pd.DataFrame()
+    dlc = pd.to_datetime(actifs["dlc"], errors="coerce")
+    depassee = actifs[dlc < today_dt].copy()
+    dujour   = actifs[dlc == today_dt].copy()
+    drop_cols = [c for c in ["date_retrait"] if c in actifs.columns]
+    base_cols = [c for c in actifs.columns if c not in drop_cols]
+    return depassee[base_cols], dujour[base_cols]
+
+def style_dlc_alert(df: pd.DataFrame):
+    def styler(_):
+        return ["background-color: #b71c1c; color: black;"] * len(df.columns)
+    return df.style.apply(styler, axis=1)
+
+# ———————————————————————————————
+# FEFO – STOCKAGE FRIGO + VITRINE
+# ———————————————————————————————
+@st.cache_resource
+def fefo_index() -> FefoIndex:
+    return FefoIndex()
+
+def load_fefo() -> FefoIndex:
+    """
+    Index FEFO à jour des deux onglets (écritures en attente comprises). Tant que
+    les valeurs en cache n'ont pas changé, la mise à jour ne coûte rien ; sinon
+    seules les lignes modifiées sont reparsées (cf. yorgios_core/fefo.py).
+    """
+    index = fefo_index()
+    index.sync(SOURCE_FRIGO, ws_values_safe(SHEET_COMMANDES_ID, "Stockage Frigo"))
+    index.sync(SOURCE_VITRINE, ws_values_safe(SHEET_COMMANDES_ID, "Vitrine"))
+    return index
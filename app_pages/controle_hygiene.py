@@ -0,0 +1,166 @@
+# app_pages/controle_hygiene.py
+# Contrôle hygiène : relevés d’une période, export des données et PDF.
+# Seule page qui importe reportlab (rendu PDF).
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from yorgios_core.audit import fetch_audit_sources, iter_audit_tables
+from yorgios_core.audit_export import FORMATS as EXPORT_FORMATS, export_audit_tables
+from yorgios_core.history import render_history_table
+from yorgios_core.idempotency import REQ_ID_COLUMN
+from yorgios_core.pdf_jobs import report_key
+from yorgios_core.pdf_report import generate_controle_hygiene_pdf
+from app_pages.common import load_livraison_temp_df, pdf_jobs, ss_cmd, ss_hygiene, ss_temp
+
+st.header("🧾 Contrôle Hygiène – Visualisation & Export PDF")
+
+date_debut = st.date_input(
+    "📅 Date de début",
+    value=date(2025, 5, 1),
+    key="ch_debut"
+)
+date_fin = st.date_input(
+    "📅 Date de fin",
+    value=date(2025, 6, 1),
+    key="ch_fin"
+)
+
+cle_temp = "ch_df_temp"
+cle_hyg  = "ch_df_hyg"
+cle_vit  = "ch_df_vit"
+cle_liv  = "ch_df_liv"
+
+if st.button("🔄 Charger & Afficher les relevés"):
+    try:
+        df_liv_src = load_livraison_temp_df()
+    except Exception:
+        df_liv_src = pd.DataFrame()
+    # un batchGet par classeur au lieu d’un appel par onglet « Semaine »
+    sources = fetch_audit_sources(
+        ss_temp, ss_hygiene, ss_cmd, livraisons=df_liv_src
+    ).period(date_debut, date_fin)
+    df_all_temp = sources.temperatures
+    df_filtre   = sources.hygiene
+    vitrine_df  = sources.vitrine
+    df_liv      = sources.livraisons
+
+    st.session_state[cle_temp] = df_all_temp
+    st.session_state[cle_hyg]  = df_filtre
+    st.session_state[cle_vit]  = vitrine_df
+    st.session_state[cle_liv]  = df_liv
+
+    for k in ("pdf_hygiene_key", "ch_export"):
+        if k in st.session_state:
+            del st.session_state[k]
+
+if (
+    cle_temp in st.session_state and
+    cle_hyg in st.session_state and
+    cle_vit in st.session_state and
+    cle_liv in st.session_state
+):
+    df_all_temp = st.session_state[cle_temp]
+    df_filtre   = st.session_state[cle_hyg]
+    vitrine_df  = st.session_state[cle_vit]
+    df_liv      = st.session_state[cle_liv]
+
+    st.markdown("### 🌡️ Relevés Températures (Vue complète)")
+    if df_all_temp.empty:
+        st.warning("Aucun relevé de températures sur la période sélectionnée.")
+    else:
+        render_history_table(df_all_temp, key="ch_hist_temp", default_sort="Date")
+
+    st.markdown("### 🧼 Relevés Hygiène (Vue complète)")
+    if df_filtre.empty:
+        st.warning("Aucun relevé d’hygiène sur la période sélectionnée.")
+    else:
+        render_history_table(df_filtre, key="ch_hist_hyg", default_sort="Date")
+
+    st.markdown("### 🖥️ Articles en Vitrine (Vue complète)")
+    if vitrine_df.empty:
+        st.warning("Aucun article en vitrine pour la période sélectionnée.")
+    else:
+        render_history_table(vitrine_df, key="ch_hist_vit", default_sort="DateAjout")
+
+    st.markdown("### 🚚 Températures de livraison (Vue complète)")
+    if df_liv.empty:
+        st.warning("Aucun relevé de température de livraison sur la période sélectionnée.")
+    else:
+        render_history_table(
+            df_liv, key="ch_hist_liv", default_sort="Horodatage départ",
+            hidden_cols=("__row__", REQ_ID_COLUMN),
+        )
+
+    st.markdown("---")
+
+    st.markdown("### 📊 Export des données brutes")
+    fmt_export = st.radio(
+        "Format",
+        list(EXPORT_FORMATS.keys()),
+        format_func=lambda k: EXPORT_FORMATS[k][0],
+        horizontal=True,
+        key="ch_export_fmt",
+    )
+    if st.button("📦 Préparer l’export des données"):
+        try:
+            # relu au fil de l’eau depuis les Sheets (cf. audit.iter_audit_tables) :
+            # la période complète n’est jamais tenue en mémoire pour l’export
+            st.session_state["ch_export"] = (
+                fmt_export,
+                export_audit_tables(
+                    iter_audit_tables(ss_temp, ss_hygiene, ss_cmd, date_debut, date_fin),
+                    fmt_export,
+                    meta={"Période": f"{date_debut.strftime('%d/%m/%Y')} au {date_fin.strftime('%d/%m/%Y')}"},
+                ),
+            )
+        except Exception as e:
+            st.error(f"❌ Erreur lors de l’export des données : {e}")
+
+    if st.session_state.get("ch_export", (None,))[0] == fmt_export:
+        _, ext, mime = EXPORT_FORMATS[fmt_export]
+        st.download_button(
+            "⬇️ Télécharger les données",
+            st.session_state["ch_export"][1],
+            file_name=f"controle_hygiene_{date_debut.isoformat()}_{date_fin.isoformat()}.{ext}",
+            mime=mime,
+        )
+
+    st.markdown("---")
+
+    if st.button("📤 Générer PDF Contrôle Hygiène"):
+        frames = (df_all_temp, df_filtre, vitrine_df, df_liv)
+        key_pdf = report_key(date_debut, date_fin, frames)
+        pdf_jobs().submit(
+            key_pdf, generate_controle_hygiene_pdf,
+            df_all_temp, df_filtre, vitrine_df, date_debut, date_fin,
+            livraison_df=df_liv,
+        )
+        st.session_state["pdf_hygiene_key"] = key_pdf
+
+    job = pdf_jobs().get(st.session_state.get("pdf_hygiene_key", ""))
+
+    @st.fragment(run_every=1.0)
+    def _pdf_progress():
+        # seul ce bloc se rafraîchit pendant le rendu ; le reste de la page reste utilisable
+        j = pdf_jobs().get(st.session_state.get("pdf_hygiene_key", ""))
+        if j is None or j.done:
+            st.rerun()
+        st.progress(j.progress, text=f"⏳ Génération du PDF… {int(j.progress * 100)} %")
+
+    if job is not None and not job.done:
+        _pdf_progress()
+    elif job is not None and job.error is not None:
+        st.error(f"❌ Erreur lors de la génération du PDF : {job.error}")
+    elif job is not None:
+        st.success("✅ PDF généré, vous pouvez maintenant le télécharger.")
+        st.download_button(
+            "📄 Télécharger le PDF Contrôle Hygiène",
+            job.result,
+            file_name="controle_hygiene.pdf",
+            mime="application/pdf"
+        )
+
+else:
+    st.info("Cliquez sur « 🔄 Charger & Afficher les relevés » pour voir les données puis générer le PDF.")
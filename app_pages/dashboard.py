@@ -0,0 +1,224 @@
+# app_pages/dashboard.py
+# Accueil : responsable de la semaine, relevés du jour et alertes DLC.
+import re
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from yorgios_core import runtime
+from yorgios_core.config import SHEET_COMMANDES_ID, SHEET_HYGIENE_ID, SHEET_RESP_ID, SHEET_TEMP_ID
+from yorgios_core.idempotency import dedup_values
+from app_pages.common import (
+    df_dlc_alerts, normalize_col, ss_planning, style_dlc_alert, ws_titles, ws_values,
+)
+
+JOURS_FR = {
+    "Monday":"Lundi","Tuesday":"Mardi","Wednesday":"Mercredi",
+    "Thursday":"Jeudi","Friday":"Vendredi","Saturday":"Samedi","Sunday":"Dimanche"
+}
+
+def _compose_responsable_from_row(row, candidates=("responsable","nom","nom_1","nom1","nom_2","nom2")) -> str | None:
+    names = []
+    for c in candidates:
+        if c in row.index:
+            v = str(row[c]).strip()
+            if v and v.lower() not in ("nan", "none"):
+                names.append(v)
+    if not names:
+        return None
+    unique = []
+    for n in names:
+        if n not in unique:
+            unique.append(n)
+    return " & ".join(unique)
+
+# Les panneaux du jour sont des fragments : chacun relit ses propres onglets (depuis
+# le cache) et se rafraîchit seul toutes les REFRESH secondes, sans réexécuter la page.
+REFRESH = float(runtime.setting("DASHBOARD_REFRESH", 60))
+
+def panneau_responsable():
+    """Responsable de la semaine (onglet dédié, sinon planning)."""
+    today = date.today()
+    iso_year, semaine_iso, _ = today.isocalendar()
+    st.subheader("👤 Responsable de la semaine")
+    resp_nom = "—"
+    try:
+        titles = ws_titles(SHEET_RESP_ID)
+        raw = ws_values(SHEET_RESP_ID, titles[0]) if titles else []
+
+        if len(raw) >= 2:
+            cols_norm = [normalize_col(c) for c in raw[0]]
+            df = pd.DataFrame(raw[1:], columns=cols_norm)
+
+            if "date_debut" not in df.columns and "debut" in df.columns:
+                df["date_debut"] = df["debut"]
+            if "date_fin" not in df.columns and "fin" in df.columns:
+                df["date_fin"] = df["fin"]
+
+            if "semaine" in df.columns and resp_nom == "—":
+                def _parse_week(v):
+                    m = re.search(r"\d+", str(v))
+                    return int(m.group()) if m else None
+                df["semaine_num"] = df["semaine"].apply(_parse_week)
+                row = df.loc[df["semaine_num"] == semaine_iso].head(1)
+                if not row.empty:
+                    who = _compose_responsable_from_row(
+                        row.iloc[0],
+                        candidates=("responsable","nom","nom_1","nom1","nom_2","nom2")
+                    )
+                    if who:
+                        resp_nom = who
+
+            if resp_nom == "—" and ("date_debut" in df.columns and "date_fin" in df.columns):
+                ddeb = pd.to_datetime(df["date_debut"], errors="coerce", dayfirst=True)
+                dfin = pd.to_datetime(df["date_fin"],   errors="coerce", dayfirst=True)
+                if ddeb.isna().mean() > 0.5 or dfin.isna().mean() > 0.5:
+                    ddeb = pd.to_datetime(df["date_debut"], errors="coerce")
+                    dfin = pd.to_datetime(df["date_fin"],   errors="coerce")
+                df = df.assign(date_debut=ddeb, date_fin=dfin)
+                ts = pd.to_datetime(today)
+                row = df[(df["date_debut"] <= ts) & (ts < df["date_fin"])].head(1)
+                if row.empty:
+                    row = df[(df["date_debut"] <= ts) & (ts <= df["date_fin"])].head(1)
+                if not row.empty:
+                    who = _compose_responsable_from_row(
+                        row.iloc[0],
+                        candidates=("nom","nom_1","nom1","nom_2","nom2","responsable")
+                    )
+                    if who:
+                        resp_nom = who
+    except Exception:
+        pass
+
+    if resp_nom == "—":
+        try:
+            titres = [w.title for w in ss_planning.worksheets() if w.title.lower().startswith("semaine")]
+            titres.sort(key=lambda x: int(re.search(r"\d+", x).group()))
+            target = f"Semaine {semaine_iso}"
+            if target not in titres and titres:
+                target = titres[-1]
+            if titres:
+                ws = ss_planning.worksheet(target)
+                raw = ws.get_all_values()
+                if len(raw) >= 2:
+                    df_pl = pd.DataFrame(raw[1:], columns=raw[0]).replace("", None)
+                    cols_lower = [c.lower() for c in df_pl.columns]
+                    if "responsable" in cols_lower and not df_pl["Responsable"].dropna().empty:
+                        resp_nom = str(df_pl["Responsable"].dropna().iloc[0])
+                    elif "manager" in cols_lower and not df_pl["Manager"].dropna().empty:
+                        resp_nom = str(df_pl["Manager"].dropna().iloc[0])
+        except Exception:
+            pass
+
+    st.info(f"**Responsable semaine {semaine_iso} :** {resp_nom}")
+
+@st.fragment(run_every=REFRESH)
+def panneau_temperatures():
+    """Relevés de températures du jour : complets ou non."""
+    today = date.today()
+    iso_year, semaine_iso, _ = today.isocalendar()
+    st.subheader("🌡️ Températures – Aujourd’hui")
+    candidates = [f"Semaine {semaine_iso} {iso_year}", f"Semaine {semaine_iso}"]
+    ws_title = None
+    titres_all = ws_titles(SHEET_TEMP_ID)
+    for cand in candidates:
+        if cand in titres_all:
+            ws_title = cand
+            break
+    if ws_title is None:
+        semaines = [t for t in titres_all if t.lower().startswith("semaine")]
+        if semaines:
+            semaines.sort(key=lambda x: int(re.search(r"\d+", x).group()))
+            ws_title = semaines[-1]
+
+    if ws_title is None:
+        st.warning("Feuille températures introuvable.")
+    else:
+        raw = ws_values(SHEET_TEMP_ID, ws_title)
+        if len(raw) < 2:
+            st.warning("Feuille vide.")
+        else:
+            header = [h.strip() for h in raw[0]]
+            df = pd.DataFrame(raw[1:], columns=header)
+            jour_fr = ["Lundi","Mardi","Mercredi","Jeudi","Vendredi","Samedi","Dimanche"][today.weekday()]
+            target_cols = [h for h in header if re.match(rf"^{jour_fr}\s+(Matin|Soir)$", h, flags=re.I)]
+            if not target_cols:
+                st.warning("Colonnes du jour absentes dans cette feuille.")
+            else:
+                missing_cols = []
+                for col in target_cols:
+                    series = df[col].astype(str)
+                    if (series.str.strip()=="").any():
+                        missing_cols.append(col)
+                if not missing_cols:
+                    st.success("OK – toutes les valeurs du jour sont saisies.")
+                else:
+                    st.error("À faire – colonnes incomplètes : " + ", ".join(missing_cols))
+
+@st.fragment(run_every=REFRESH)
+def panneau_hygiene():
+    """Cases d’hygiène quotidienne du jour."""
+    today = date.today()
+    st.subheader("🧼 Hygiène – Quotidien (Aujourd’hui)")
+    try:
+        raw = ws_values(SHEET_HYGIENE_ID, "Quotidien")
+        if len(raw) < 2:
+            st.warning("Feuille Quotidien vide.")
+        else:
+            dfh = pd.DataFrame(raw[1:], columns=raw[0])
+            today_str = today.strftime("%Y-%m-%d")
+            if "Date" not in dfh.columns:
+                st.warning("Colonne Date manquante.")
+            else:
+                if today_str not in dfh["Date"].values:
+                    st.error("À faire – aucune ligne pour aujourd’hui.")
+                else:
+                    idx = int(dfh.index[dfh["Date"] == today_str][0])
+                    cols = [c for c in dfh.columns if c != "Date"]
+                    not_ok = [c for c in cols if str(dfh.at[idx, c]).strip() != "✅"]
+                    if not not_ok:
+                        st.success("OK – toutes les cases sont cochées.")
+                    else:
+                        st.error(f"À faire – {len(not_ok)} case(s) restante(s).")
+                        with st.expander("Voir les cases manquantes"):
+                            st.write(", ".join(not_ok))
+    except Exception as e:
+        st.warning(f"Impossible de lire l’onglet Hygiène Quotidien : {e}")
+
+@st.fragment(run_every=REFRESH)
+def panneau_dlc():
+    """DLC dépassées et du jour en vitrine."""
+    st.subheader("⚠️ Alertes DLC – Vitrine")
+    raw_vitrine = ws_values(SHEET_COMMANDES_ID, "Vitrine")
+    depassee, dujour = df_dlc_alerts(dedup_values(raw_vitrine))
+    cA, cB = st.columns(2)
+    with cA:
+        st.caption("DLC dépassées")
+        if depassee.empty:
+            st.success("RAS")
+        else:
+            st.dataframe(style_dlc_alert(depassee), use_container_width=True)
+    with cB:
+        st.caption("DLC du jour")
+        if dujour.empty:
+            st.success("RAS")
+        else:
+            st.dataframe(style_dlc_alert(dujour), use_container_width=True)
+
+st.header("🏠 Dashboard")
+
+panneau_responsable()
+
+st.markdown("---")
+
+# Températures & Hygiène
+col_temp, col_hyg = st.columns(2)
+with col_temp:
+    panneau_temperatures()
+with col_hyg:
+    panneau_hygiene()
+
+st.markdown("---")
+
+panneau_dlc()
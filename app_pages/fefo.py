@@ -0,0 +1,59 @@
+# app_pages/fefo.py
+# À utiliser en premier : lots du Stockage Frigo et de la Vitrine par DLC (FEFO).
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from yorgios_core.fefo import SOURCE_FRIGO, SOURCE_VITRINE
+from app_pages.common import load_fefo
+
+SOURCES = {"Frigos": SOURCE_FRIGO, "Vitrine": SOURCE_VITRINE}
+
+def couleur_jours(d):
+    if pd.isna(d):
+        return ""
+    if d > 1:
+        return "background-color:#e3f4ea"
+    if d == 1:
+        return "background-color:#fff3cf"
+    return "background-color:#fbd9dc"
+
+def tableau(lots):
+    today = date.today()
+    df = pd.DataFrame([lot.as_dict(today) for lot in lots],
+                      columns=["Produit", "Emplacement", "Quantité", "DLC", "Jours restants"])
+    df["Jours restants"] = df["Jours restants"].astype("Int64")
+    st.dataframe(
+        df.style.map(couleur_jours, subset=["Jours restants"]),
+        use_container_width=True, hide_index=True,
+    )
+
+st.header("🥇 À utiliser en premier")
+
+index = load_fefo()
+if not len(index):
+    st.info("Aucun lot en stock ni en vitrine.")
+    st.stop()
+
+c1, c2 = st.columns([2, 1])
+with c1:
+    choix = st.multiselect("Où", list(SOURCES), default=list(SOURCES), key="fefo_sources")
+with c2:
+    nb = st.number_input("Nombre de lots", min_value=5, max_value=200, value=20, step=5, key="fefo_nb")
+
+lots = index.first(int(nb), sources=[SOURCES[c] for c in choix]) if choix else []
+if lots:
+    tableau(lots)
+else:
+    st.info("Aucun lot pour cette sélection.")
+
+st.markdown("---")
+
+st.subheader("🔎 Par produit")
+produit = st.selectbox("Produit", index.products(), index=None,
+                       placeholder="Choisir un produit…", key="fefo_produit")
+if produit:
+    lots_produit = index.for_product(produit)
+    st.caption(f"{len(lots_produit)} lot(s), le premier à sortir en haut.")
+    tableau(lots_produit)
@@ -0,0 +1,88 @@
+# app_pages/hygiene.py
+# Relevé hygiène du jour (tâches quotidiennes, hebdomadaires, mensuelles).
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from yorgios_core.config import SHEET_HYGIENE_ID
+from yorgios_core.concurrency import WriteConflict, cell_changes
+from app_pages.common import journal_merge, ws_values
+
+st.header("🧼 Relevé Hygiène – Aujourd’hui")
+typ = st.selectbox("📋 Type de tâches", ["Quotidien", "Hebdomadaire", "Mensuel"], key="hyg_type")
+
+# Cases et validation dans un fragment : cocher une case ne réexécute que ce bloc.
+@st.fragment
+def releve_du_jour(typ: str):
+    df_key  = f"df_hyg_{typ}"
+    idx_key = f"df_hyg_idx_{typ}"
+
+    if df_key not in st.session_state:
+        try:
+            raw = ws_values(SHEET_HYGIENE_ID, typ)
+        except Exception as e:
+            st.error(f"❌ Impossible d’ouvrir l’onglet '{typ}' : {e}")
+            return
+
+        if len(raw) < 2:
+            st.warning("⚠️ La feuille est vide ou mal formatée (pas assez de lignes).")
+            return
+
+        df_hyg = pd.DataFrame(raw[1:], columns=raw[0])
+        st.session_state[f"df_hyg_len_{typ}"] = len(df_hyg)
+
+        today_str = date.today().strftime("%Y-%m-%d")
+        if today_str in df_hyg["Date"].values:
+            idx = int(df_hyg.index[df_hyg["Date"] == today_str][0])
+        else:
+            idx = len(df_hyg)
+            new_row = {col: "" for col in df_hyg.columns}
+            new_row["Date"] = today_str
+            df_hyg = pd.concat([df_hyg, pd.DataFrame([new_row])], ignore_index=True)
+
+        st.session_state[df_key]  = df_hyg
+        st.session_state[idx_key] = idx
+
+    df_hyg = st.session_state[df_key]
+    idx    = st.session_state[idx_key]
+    today_str = date.today().strftime("%Y-%m-%d")
+
+    st.subheader(f"✅ Cochez les tâches effectuées pour le {today_str}")
+
+    checks = {}
+    for col in df_hyg.columns[1:]:
+        chk_key = f"hyg_chk_{typ}_{col}"
+        if chk_key not in st.session_state:
+            st.session_state[chk_key] = (str(df_hyg.at[idx, col]) == "✅")
+        checks[col] = st.checkbox(col, value=st.session_state[chk_key], key=chk_key)
+
+    if st.button("📅 Valider la journée"):
+        # ligne telle qu'elle était au chargement (vide si la journée n'existait pas encore)
+        existait = idx < st.session_state.get(f"df_hyg_len_{typ}", len(df_hyg))
+        base_row = {col: str(df_hyg.at[idx, col]) for col in df_hyg.columns} if existait else {}
+        for col, val in checks.items():
+            df_hyg.at[idx, col] = "✅" if val else ""
+
+        # seules les cases modifiées du jour sont écrites, fusionnées avec l'état courant
+        new_row = {col: str(df_hyg.at[idx, col]) for col in df_hyg.columns}
+        changes = cell_changes(today_str, base_row, new_row)
+
+        try:
+            if changes:
+                journal_merge(SHEET_HYGIENE_ID, typ, changes)
+            st.success("✅ Hygiène enregistrée (synchronisation Google Sheets en arrière-plan).")
+            del st.session_state[df_key]
+            del st.session_state[idx_key]
+            for col in df_hyg.columns[1:]:
+                chk_key = f"hyg_chk_{typ}_{col}"
+                if chk_key in st.session_state:
+                    del st.session_state[chk_key]
+        except WriteConflict as e:
+            st.error(f"❌ {e}. Les cases ont été modifiées sur un autre appareil : rechargez l’onglet.")
+            del st.session_state[df_key]
+            del st.session_state[idx_key]
+        except Exception as e:
+            st.error(f"❌ Erreur lors de la mise à jour du Google Sheet : {e}")
+
+releve_du_jour(typ)
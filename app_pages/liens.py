@@ -0,0 +1,21 @@
+# app_pages/liens.py
+# Liens vers les Google Sheets utilisés.
+import streamlit as st
+
+st.header("🔗 Liens vers les Google Sheets utilisés")
+
+sheets = {
+    "📦 Commandes + HACCP + Vitrine" : "https://docs.google.com/spreadsheets/d/1cBP7iEeWK5whbHzoZAWUhq_HQ5OcAEjTBkUro2cmkoc",
+    "🧼 Hygiène"                     : "https://docs.google.com/spreadsheets/d/1XMYhh2CSIv1zyTtXKM4_ACEhW-6kXxoFi4ACzNhbuDE",
+    "🌡️ Températures"               : "https://docs.google.com/spreadsheets/d/1e4hS6iawCa1IizhzY3xhskLy8Gj3todP3zzk38s7aq0",
+    "📅 Planning"                   : "https://docs.google.com/spreadsheets/d/1OBYGNHtHdDB2jufKKjoAwq6RiiS_pnz4ta63sAM-t_0",
+    "🛒 Liste Produits"             : "https://docs.google.com/spreadsheets/d/1FbRV4KgXyCwqwLqJkyq8cHZbo_BfB7kyyPP3pO53Snk",
+    "👤 Responsables semaine"       : "https://docs.google.com/spreadsheets/d/1nWEel6nizI0LKC84uaBDyqTNg1hzwPSVdZw41YJaBV8"
+}
+
+for label, url in sheets.items():
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        st.markdown(f"**{label}**")
+    with col2:
+        st.link_button("🔗 Ouvrir", url)
@@ -0,0 +1,408 @@
+# app_pages/livraison.py
+# Températures de livraison cuisine → corner (départ, réception, historique).
+import re
+from datetime import date, datetime
+
+import pandas as pd
+import gspread
+import streamlit as st
+
+from yorgios_core.config import LIVRAISON_HEADERS, LIVRAISON_WS, SHEET_COMMANDES_ID
+from yorgios_core.history import render_history_table, search_text
+from yorgios_core.idempotency import REQ_ID_COLUMN, new_request_id
+from yorgios_core.journal import OP_APPEND_UNIQUE, OP_UPDATE_CELLS
+from yorgios_core.photo_queue import is_pending
+from app_pages.common import (
+    GEP_RULES, _norm_gep_key, compute_reception_result, device_id, get_gep_rule, journal_write,
+    livraison_headers, livraison_jour_depart, load_catalogue, load_livraison_snapshot,
+    upload_livraison_photo, write_journal,
+)
+
+catalogue = load_catalogue()
+PROD_GEP_MAPPING = catalogue.gep_mapping
+livraison_produits_list = catalogue.livraison_produits
+
+st.header("🚚 Température de livraison (cuisine → corner)")
+st.caption("Saisir les températures au départ (cuisine) ou à réception (corner), selon le poste.")
+
+mode_liv = st.radio(
+    "Lieu d’utilisation",
+    ["Cuisine – départ", "Corner – réception"],
+    horizontal=True,
+    key="liv_mode"
+)
+
+# ——————————— MODE CUISINE : UNIQUEMENT FORMULAIRE DE DÉPART, SANS GOOGLE SHEETS ———————————
+if mode_liv == "Cuisine – départ":
+    st.subheader("Produits à contrôler au départ (cuisine)")
+    st.caption(
+        "Choisissez un produit dans la liste, saisissez la température de départ, "
+        "cliquez sur « ➕ Ajouter ». Une fois tous les produits saisis, "
+        "cliquez sur « ✅ Enregistrer les relevés de départ » pour envoyer vers Google Sheets."
+    )
+
+    if not livraison_produits_list:
+        st.error("Impossible de charger la liste des produits Yorgios avec Dénomination GEP.")
+    else:
+        # Buffer local tant que rien n’est envoyé (brouillon conservé par appareil)
+        if "liv_depart_buffer" not in st.session_state:
+            st.session_state["liv_depart_buffer"] = write_journal().load_draft(
+                device_id(), "liv_depart_buffer", []
+            )
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            prod = st.selectbox(
+                "Produit",
+                options=[""] + livraison_produits_list,
+                key="liv_depart_prod"
+            )
+        with col2:
+            # pas de key → pas d’erreur session_state, champ vidé à chaque rerun
+            temp_dep = st.text_input(
+                "Température départ (°C)",
+                value="",
+                placeholder="ex : 3,8"
+            )
+        with col3:
+            add_clicked = st.button("➕ Ajouter", key="liv_depart_add")
+
+        if add_clicked:
+            prod_clean = str(prod or "").strip()
+            temp_str_raw = str(temp_dep or "").strip().replace(" ", "")
+            dep_txt = temp_str_raw.replace(".", ",")
+
+            if not prod_clean:
+                st.error("Choisissez un produit avant d’ajouter.")
+            elif not temp_str_raw:
+                st.error("Saisissez la température de départ.")
+            elif not re.match(r"^-?\d+(,\d+)?$", dep_txt):
+                st.error("Température de départ invalide. Exemple attendu : 3,8")
+            else:
+                st.session_state["liv_depart_buffer"].append(
+                    {
+                        "Produit": prod_clean,
+                        "Température départ (°C)": dep_txt,
+                    }
+                )
+                write_journal().save_draft(
+                    device_id(), "liv_depart_buffer", st.session_state["liv_depart_buffer"]
+                )
+                st.success(f"Ligne ajoutée : {prod_clean} ({dep_txt}°C)")
+
+        buffer = st.session_state["liv_depart_buffer"]
+
+        if buffer:
+            st.markdown("#### Lignes en attente d’enregistrement")
+            df_buffer = pd.DataFrame(buffer)
+            st.table(df_buffer)
+
+            # Rappels GEP pour les produits déjà saisis
+            produits_buf = sorted({entry["Produit"] for entry in buffer})
+            with st.expander("ℹ️ Rappels GEP et seuils de températures pour les produits saisis"):
+                for p in produits_buf:
+                    denom = PROD_GEP_MAPPING.get(p, "")
+                    rule = get_gep_rule(denom) if denom else None
+                    if denom and rule:
+                        st.write(
+                            f"- **{p}** → {denom} : "
+                            f"{rule['min']}°C à {rule['max']}°C "
+                            f"(max tolérée {rule['max_tol']}°C)"
+                        )
+                    elif denom:
+                        st.write(f"- **{p}** → {denom}")
+                    else:
+                        st.write(f"- **{p}** : catégorie GEP non trouvée dans la liste produits.")
+
+            if st.button("✅ Enregistrer les relevés de départ", key="liv_depart_save"):
+                try:
+                    try:
+                        headers = livraison_headers()
+                    except Exception:
+                        headers = LIVRAISON_HEADERS
+                    horodatage = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+                    lignes = []
+                    recap_rows = []
+                    for entry in buffer:
+                        prod_clean = entry["Produit"]
+                        dep_txt = entry["Température départ (°C)"]
+
+                        denom = PROD_GEP_MAPPING.get(prod_clean, "")
+                        row_dict = {
+                            "Produit": prod_clean,
+                            "Température départ (°C)": dep_txt,
+                            "Horodatage départ": horodatage,
+                            "Dénomination GEP": denom,
+                            "Température réception (°C)": "",
+                            "Résultat réception": "",
+                            "Lien photo": "",
+                        }
+                        lignes.append([str(row_dict.get(h, "")) for h in headers])
+
+                        rule = get_gep_rule(denom) if denom else None
+                        recap_rows.append(
+                            {
+                                "Produit": prod_clean,
+                                "Dénomination GEP": denom or "(non trouvée)",
+                                "Température départ (°C)": dep_txt,
+                                "Plage cible (°C)": (
+                                    f"{rule['min']} à {rule['max']} (tol. {rule['max_tol']})"
+                                    if rule else "-"
+                                ),
+                            }
+                        )
+
+                    if not lignes:
+                        st.error("Aucune ligne à enregistrer. Ajoutez au moins un produit.")
+                    else:
+                        # même identifiant tant que l'envoi n'a pas abouti (double clic, rerun)
+                        req = st.session_state.setdefault("liv_depart_req", new_request_id())
+                        journal_write(
+                            SHEET_COMMANDES_ID, LIVRAISON_WS, OP_APPEND_UNIQUE,
+                            {
+                                "rows": lignes,
+                                "ids": [f"{req}-{i}" for i in range(len(lignes))],
+                                "value_input_option": "USER_ENTERED",
+                            },
+                            key=req,
+                        )
+                        st.session_state.pop("liv_depart_req", None)
+                        st.success(f"{len(lignes)} relevé(s) de départ enregistrés (synchronisation Google Sheets en arrière-plan).")
+
+                        if recap_rows:
+                            st.markdown("#### Récapitulatif des catégories GEP et seuils")
+                            st.dataframe(
+                                pd.DataFrame(recap_rows),
+                                use_container_width=True
+                            )
+
+                        # on vide le buffer une fois que tout est journalisé
+                        st.session_state["liv_depart_buffer"] = []
+                        write_journal().clear_draft(device_id(), "liv_depart_buffer")
+                except Exception as e:
+                    st.error(f"Erreur lors de l’enregistrement dans Google Sheets : {e}")
+        else:
+            st.info("Aucune ligne en attente. Ajoutez un produit et une température pour commencer.")
+
+# ——————————— MODE CORNER : RÉCEPTION + TABLEAU JOUR + HISTORIQUE ———————————
+else:  # Corner – réception
+    st.subheader("À compléter au corner – livraisons du jour sans température de réception")
+
+    snap_liv = load_livraison_snapshot()
+    df_liv = snap_liv.view()
+    if df_liv.empty:
+        st.info("Aucune livraison à compléter pour l’instant.")
+    else:
+        if "Horodatage départ" not in df_liv.columns:
+            st.warning("Colonne 'Horodatage départ' manquante dans le sheet Livraison Température.")
+            df_edit_corner = pd.DataFrame()
+        else:
+            today_dt = date.today()
+            mask_today = livraison_jour_depart(snap_liv) == today_dt
+
+            col_recep = "Température réception (°C)"
+            if col_recep not in df_liv.columns:
+                st.warning(f"Colonne « {col_recep} » introuvable dans le sheet Livraison Température.")
+                df_edit_corner = pd.DataFrame()
+            else:
+                mask_no_recep = df_liv[col_recep].astype(str).str.strip().isin(["", "nan", "None"])
+                df_edit_corner = df_liv[mask_today & mask_no_recep].copy()
+
+        if df_edit_corner.empty:
+            st.success("Toutes les températures de réception du jour sont saisies ✅.")
+        else:
+            df_edit_corner = df_edit_corner.sort_values("Horodatage départ", ascending=False)
+
+            with st.form("form_livraison_recep"):
+                updates = []
+                st.caption("Pour chaque ligne, renseigne la température à réception et, si besoin, ajoute une photo preuve.")
+
+                for _, row in df_edit_corner.iterrows():
+                    produit = str(row.get("Produit", ""))
+                    t_dep = row.get("Température départ (°C)", "")
+                    h_dep = row.get("Horodatage départ", pd.NaT)
+                    h_txt = h_dep.strftime("%H:%M") if pd.notna(h_dep) else ""
+                    denom = row.get("Dénomination GEP", "") or PROD_GEP_MAPPING.get(produit, "")
+                    rule = GEP_RULES.get(_norm_gep_key(denom)) if denom else None
+
+                    key_suffix = int(row["__row__"])
+
+                    with st.expander(f"{produit} — départ {t_dep}°C à {h_txt}", expanded=True):
+                        if denom:
+                            if rule:
+                                st.caption(
+                                    f"Catégorie GEP : {denom} — "
+                                    f"{rule['min']}°C à {rule['max']}°C "
+                                    f"(max tolérée {rule['max_tol']}°C)"
+                                )
+                            else:
+                                st.caption(f"Catégorie GEP : {denom}")
+
+                        temp_input = st.text_input(
+                            "Température réception (°C)",
+                            key=f"liv_recep_{key_suffix}",
+                            placeholder="ex : 3,8",
+                        )
+                        photo_file = st.file_uploader(
+                            "📷 Photo (optionnelle)",
+                            type=["jpg", "jpeg", "png", "webp"],
+                            key=f"liv_photo_{key_suffix}",
+                            help="Sur mobile, le bouton permet souvent 'Prendre une photo' ou 'Photothèque'.",
+                        )
+
+                        updates.append(
+                            {
+                                "row_idx": key_suffix,
+                                "produit": produit,
+                                "denom": denom,
+                                "horodatage": h_dep,
+                                "temp_recep_txt": temp_input,
+                                "photo_file": photo_file,
+                            }
+                        )
+
+                submitted_recep = st.form_submit_button("✅ Enregistrer les températures de réception")
+
+            if submitted_recep:
+                try:
+                    headers = list(snap_liv.columns)
+
+                    def _col_idx(name, default_idx):
+                        try:
+                            return headers.index(name) + 1
+                        except ValueError:
+                            return default_idx
+
+                    col_idx_recep = _col_idx("Température réception (°C)", 4)
+                    col_idx_gep = _col_idx("Dénomination GEP", 5)
+                    col_idx_result = _col_idx("Résultat réception", 6)
+                    col_idx_photo = _col_idx("Lien photo", 7)
+
+                    # toutes les cellules partent en un seul batch_update
+                    cells = []
+
+                    def _set(row_idx, col_idx, value):
+                        cells.append({
+                            "range": gspread.utils.rowcol_to_a1(row_idx, col_idx),
+                            "values": [[value]],
+                        })
+
+                    # toutes les valeurs sont validées avant de mettre la moindre photo
+                    # en file : une saisie refusée ne laisse pas de photo orpheline sur Drive
+                    valides = []
+                    for upd in updates:
+                        val_str = (upd["temp_recep_txt"] or "").strip().replace(" ", "")
+                        if not val_str:
+                            continue
+
+                        rec_txt = val_str.replace(".", ",")
+                        if not re.match(r"^-?\d+(,\d+)?$", rec_txt):
+                            st.error(
+                                f"Valeur de réception invalide pour « {upd['produit']} » : {val_str}. "
+                                f"Utilise par ex. 3,8"
+                            )
+                            st.stop()
+                        valides.append((upd, rec_txt))
+
+                    n_ok = 0
+                    for upd, rec_txt in valides:
+                        _set(upd["row_idx"], col_idx_recep, rec_txt)
+
+                        denom = upd["denom"] or PROD_GEP_MAPPING.get(upd["produit"], "")
+                        if denom:
+                            _set(upd["row_idx"], col_idx_gep, denom)
+                            res_txt = compute_reception_result(rec_txt, denom)
+                            if res_txt:
+                                _set(upd["row_idx"], col_idx_result, res_txt)
+
+                        if upd["photo_file"] is not None:
+                            lien = upload_livraison_photo(
+                                upd["photo_file"],
+                                upd["produit"],
+                                upd["horodatage"],
+                            )
+                            if lien:
+                                _set(upd["row_idx"], col_idx_photo, lien)
+
+                        n_ok += 1
+
+                    if cells:
+                        journal_write(
+                            SHEET_COMMANDES_ID, LIVRAISON_WS, OP_UPDATE_CELLS,
+                            {"cells": cells, "value_input_option": "USER_ENTERED"},
+                        )
+                    if n_ok > 0:
+                        st.success(f"{n_ok} température(s) de réception enregistrée(s).")
+                        if any(is_pending(c["values"][0][0]) for c in cells):
+                            st.caption("📷 Photos en cours d’envoi vers Drive : les liens apparaîtront d’ici quelques instants.")
+                    else:
+                        st.info("Aucune valeur de réception renseignée, rien à enregistrer.")
+                except Exception as e:
+                    st.error(f"Erreur lors de la mise à jour des températures de réception : {e}")
+
+    # 3) TABLEAU DU JOUR – DÉPART & RÉCEPTION
+    st.markdown("---")
+    st.subheader("Tableau du jour – départ & réception")
+
+    snap_liv_today = load_livraison_snapshot()
+    df_liv_today = snap_liv_today.view()
+    if df_liv_today.empty:
+        st.info("Aucun relevé de livraison pour l’instant.")
+    else:
+        if "Horodatage départ" in df_liv_today.columns:
+            today_dt2 = date.today()
+            mask_today2 = livraison_jour_depart(snap_liv_today) == today_dt2
+            df_today = df_liv_today[mask_today2].copy()
+        else:
+            df_today = df_liv_today.copy()
+
+        if df_today.empty:
+            st.info("Aucune livraison enregistrée aujourd’hui.")
+        else:
+            if (
+                "Température réception (°C)" in df_today.columns
+                and "Dénomination GEP" in df_today.columns
+            ):
+                def _compute_res(row):
+                    existing = str(row.get("Résultat réception", "")).strip()
+                    if existing:
+                        return existing
+                    return compute_reception_result(
+                        row["Température réception (°C)"],
+                        row["Dénomination GEP"],
+                    )
+                df_today["Résultat réception"] = df_today.apply(_compute_res, axis=1)
+
+            cols_to_show = [
+                c
+                for c in [
+                    "Produit",
+                    "Dénomination GEP",
+                    "Température départ (°C)",
+                    "Température réception (°C)",
+                    "Résultat réception",
+                ]
+                if c in df_today.columns
+            ]
+            st.dataframe(
+                df_today[cols_to_show],
+                use_container_width=True,
+            )
+
+    # 4) HISTORIQUE COMPLET
+    st.markdown("---")
+    afficher_hist = st.checkbox("Afficher l’historique complet des relevés de livraison", value=False)
+    if afficher_hist:
+        snap_hist = load_livraison_snapshot()
+        st.subheader("Historique des relevés de livraison")
+        if snap_hist.empty:
+            st.info("Aucun relevé de température de livraison pour l’instant.")
+        else:
+            render_history_table(
+                snap_hist.view(),
+                key="hist_liv",
+                default_sort="Horodatage départ",
+                hidden_cols=("__row__", REQ_ID_COLUMN),
+                haystack=snap_hist.derived("__search__", search_text),
+            )
@@ -0,0 +1,63 @@
+# app_pages/objectifs.py
+# Objectifs de chiffre d'affaires et primes.
+import re
+
+import pandas as pd
+import streamlit as st
+
+from app_pages.common import load_objectifs_df
+
+st.header("📊 Objectifs Chiffres d'affaires")
+
+df_obj = load_objectifs_df()
+if df_obj.empty:
+    st.info("La feuille 'objectifs' est vide ou introuvable dans le fichier europoseidon_liaison.")
+else:
+    cols = list(df_obj.columns)
+
+    col_mois = cols[0] if cols else None
+    col_ht = "HT" if "HT" in cols else (cols[1] if len(cols) > 1 else None)
+    col_res = None
+    for c in cols:
+        if "result" in c.lower():
+            col_res = c
+            break
+    if col_res is None and len(cols) > 2:
+        col_res = cols[2]
+
+    if not (col_mois and col_ht and col_res):
+        st.error("Impossible d’identifier les colonnes Mois / HT / Résultat dans la feuille 'objectifs'.")
+    else:
+        def _to_float(x):
+            s = str(x or "").strip()
+            if not s:
+                return None
+            s = s.replace(" ", "")
+            s = s.replace(",", ".")
+            s = re.sub(r"[^0-9.\-]", "", s)
+            try:
+                return float(s)
+            except ValueError:
+                return None
+
+        df_obj["_ht_val"] = df_obj[col_ht].apply(_to_float)
+        df_obj["_res_val"] = df_obj[col_res].apply(_to_float)
+
+        def _prime(row):
+            ht = row["_ht_val"]
+            res = row["_res_val"]
+            if ht is None or res is None:
+                return ""
+            return "✅" if res >= ht else "❌"
+
+        df_obj["Prime"] = df_obj.apply(_prime, axis=1)
+
+        df_aff = pd.DataFrame({
+            "Mois": df_obj[col_mois],
+            "Objectif HT": df_obj[col_ht],
+            "Résultat": df_obj[col_res],
+            "Prime": df_obj["Prime"],
+        })
+
+        st.caption("✅ = objectif atteint ou dépassé • ❌ = objectif non atteint (Résultat < Objectif HT)")
+        st.dataframe(df_aff, use_container_width=True)
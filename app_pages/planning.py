@@ -0,0 +1,7 @@
+# app_pages/planning.py
+# Planning (en attente de la Planning app).
+import streamlit as st
+
+st.header("📅 Planning – en construction")
+st.info("Cette page est temporairement mise de côté. Nous l’intégrerons une fois la ‘Planning app’ finalisée.")
+st.caption("Le Dashboard continue de récupérer le « Responsable de la semaine » via le Google Sheet dédié / Planning existant.")
@@ -0,0 +1,62 @@
+# app_pages/protocoles.py
+# Protocoles opérationnels (dossier Drive) avec recherche plein texte.
+import textwrap
+from datetime import datetime
+
+import pandas as pd
+import pytz
+import streamlit as st
+
+from yorgios_core.protocols import PROTOCOLES
+from yorgios_core.runtime import protocol_store
+from app_pages.common import protocol_index
+
+st.header("📋 Protocoles opérationnels")
+
+store = protocol_store()
+
+recherche = st.text_input(
+    "🔎 Rechercher dans les protocoles",
+    placeholder="ex. glaçons, fermeture alarme…",
+    key="proto_search",
+)
+if recherche.strip():
+    if not store.docs():
+        store.refresh(max_age=store.revalidate_after)
+    index = protocol_index()
+    index.update(store.docs())  # ne réindexe que les documents modifiés
+    resultats = index.search(recherche)
+    if not resultats:
+        st.info("Aucun passage ne correspond à cette recherche.")
+    for hit in resultats:
+        st.markdown(f"**🗂️ {hit.label}** — {hit.snippet}")
+    st.markdown("---")
+
+choix_proto = st.selectbox(
+    "🧾 Choisir un protocole à consulter", 
+    list(PROTOCOLES.keys()),
+    key="select_proto"
+)
+
+try:
+    doc = store.get(choix_proto)
+    if doc is None:
+        st.error(f"⚠️ Le fichier « {PROTOCOLES[choix_proto]} » n’a pas été trouvé dans le dossier Drive.")
+    else:
+        texte = doc.text.replace("•", "\n\n•")
+        st.markdown(
+            f"### 🗂️ {choix_proto}\n\n" +
+            textwrap.indent(texte, prefix=""),
+            unsafe_allow_html=True
+        )
+        maj = pd.to_datetime(doc.modified_time, errors="coerce", utc=True)
+        if pd.notna(maj):
+            st.caption(f"Mis à jour sur Drive le {maj.tz_convert(pytz.timezone('Europe/Paris')).strftime('%d/%m/%Y à %H:%M')}")
+        if store.is_stale():
+            if store.saved_at:
+                copie = datetime.fromtimestamp(store.saved_at, pytz.timezone("Europe/Paris")).strftime("%d/%m/%Y à %H:%M")
+                st.caption(f"⚠️ Drive ne répond pas : affichage de la copie enregistrée le {copie}.")
+            else:
+                st.caption("⚠️ Drive ne répond pas : affichage de la dernière version en cache.")
+except Exception as e:
+    st.error(f"❌ Impossible de charger « {choix_proto} » depuis Drive : {e}")
@@ -0,0 +1,87 @@
+# app_pages/ruptures.py
+# Ruptures & commandes : message SMS / WhatsApp pour la cuisine.
+import urllib.parse
+
+import pandas as pd
+import streamlit as st
+
+from yorgios_core.config import SHEET_COMMANDES_ID
+from app_pages.common import load_catalogue, normalize_col, ws_values_safe
+
+produits_list = load_catalogue().produits
+
+st.header("🛎️ Ruptures & Commandes")
+st.write("Sélectionnez les produits par niveau de priorité puis générez le message SMS / WhatsApp.")
+
+try:
+    options_produits = produits_list
+except Exception:
+    try:
+        raw_vit = ws_values_safe(SHEET_COMMANDES_ID, "Vitrine")
+        if raw_vit and len(raw_vit) > 1:
+            cols = [normalize_col(c) for c in raw_vit[0]]
+            df_v = pd.DataFrame(raw_vit[1:], columns=cols)
+            options_produits = sorted(
+                [p for p in df_v["produit"].dropna().unique().tolist() if str(p).strip()]
+            ) if "produit" in df_v.columns else []
+        else:
+            options_produits = []
+    except Exception:
+        options_produits = []
+
+col_u, col_j2, col_surplus = st.columns(3)
+with col_u:
+    urgence = st.multiselect("🔥 URGENCE", options=options_produits, key="rupt_urgence",
+                             help="Produits à commander immédiatement.")
+with col_j2:
+    j2 = st.multiselect("⏳ Demande à J+2", options=options_produits, key="rupt_j2",
+                        help="Produits à commander sous 48h.")
+with col_surplus:
+    surplus = st.multiselect("🟩 Produit en trop – ne pas envoyer", options=options_produits, key="rupt_surplus",
+                             help="Trop de stock : merci de NE PAS ENVOYER.")
+
+commentaire = st.text_area("📝 Commentaire / Quantités (optionnel)")
+
+header = st.secrets.get("RUPTURES_HEADER", "Commandes Corner")
+
+def _build_message(urgence_list, j2_list, surplus_list, note, header_text):
+    lines = [str(header_text).strip()]
+    if urgence_list:
+        lines.append("URGENCE : " + ", ".join(urgence_list))
+    if j2_list:
+        lines.append("Demande à J+2 : " + ", ".join(j2_list))
+    if surplus_list:
+        lines.append("Produit en trop — ne pas envoyer : " + ", ".join(surplus_list))
+    if note and note.strip():
+        lines.append("Commentaire : " + note.strip())
+    if len(lines) == 1:
+        lines.append("Aucune sélection.")
+    return "\n".join(lines)
+
+msg = _build_message(urgence, j2, surplus, commentaire, header)
+
+st.markdown("#### 📨 Aperçu du message")
+st.code(msg, language="text")
+
+sms_num = str(st.secrets.get("CONTACT_SMS", "")).strip()
+wa_num  = str(st.secrets.get("CONTACT_WHATSAPP", "")).strip()
+
+wa_flag_str = str(st.secrets.get("SHOW_WHATSAPP", "")).strip().lower()
+wa_flag = wa_flag_str in ("true", "1", "yes", "on")
+show_whatsapp = wa_flag and bool(wa_num)
+
+cols2 = st.columns(2) if show_whatsapp else st.columns(1)
+
+with cols2[0]:
+    if st.button("📲 Générer SMS"):
+        if not sms_num:
+            st.error("🚨 Configurez CONTACT_SMS dans vos secrets.")
+        else:
+            url = f"sms:{sms_num}?&body={urllib.parse.quote(msg)}"
+            st.markdown(f"[➡️ Ouvrir SMS]({url})")
+
+if show_whatsapp:
+    with cols2[1]:
+        if st.button("💬 Générer WhatsApp"):
+            url = f"https://wa.me/{wa_num}?text={urllib.parse.quote(msg)}"
+            st.markdown(f"[➡️ Ouvrir WhatsApp]({url})")
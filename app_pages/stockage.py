@@ -0,0 +1,125 @@
+# app_pages/stockage.py
+# Stockage frigo : contenu, transferts, ajouts et suppressions.
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from app_pages.common import load_df, save_df, ss_cmd
+
+def load_stock():
+    """(articles avec DLC en date et jours restants, valeurs brutes : base de la fusion à l'enregistrement)."""
+    df_all = load_df(ss_cmd, "Stockage Frigo")
+    df_all.columns = [c.strip().lower().replace(" ", "_") for c in df_all.columns]
+    df_lu  = df_all.copy()
+    df_all["dlc"] = pd.to_datetime(df_all["dlc"], dayfirst=True, errors="coerce").dt.date
+    df_all["jours_restants"] = (
+        pd.to_datetime(df_all["dlc"]) - pd.Timestamp.today().normalize()
+    ).dt.days
+    return df_all, df_lu
+
+def bordure_color(d):
+    if pd.isna(d):
+        return ""
+    if d > 1:
+        return "border-left:4px solid #a8d5ba"
+    if d == 1:
+        return "border-left:4px solid #ffe5a1"
+    return "border-left:4px solid #f7b2b7"
+
+st.header("🧊 Stockage Frigo")
+
+df_all, _ = load_stock()
+
+st.subheader("📦 Tous les frigos")
+display_df = df_all[["frigo", "article", "quantite", "dlc"]]
+styled = display_df.style.apply(
+    lambda row: [bordure_color(df_all.loc[row.name, "jours_restants"])] * len(row),
+    axis=1
+).set_properties(**{"font-size": "0.9em"})
+st.dataframe(styled, use_container_width=True)
+
+st.markdown("---")
+
+frigos = ["Frigo 1", "Frigo 2", "Frigo 3", "Grand Frigo", "Chambre Froide"]
+
+# Un frigo à la fois dans un fragment : changer de frigo, supprimer, transférer
+# ou ajouter ne réexécute que ce bloc (le tableau d'ensemble suit au prochain rerun).
+@st.fragment
+def contenu_frigo():
+    df_all, df_lu = load_stock()
+    choix_frigo = st.selectbox("🔍 Afficher un seul frigo :", frigos, key="sel_frigo")
+    df = df_all[df_all["frigo"] == choix_frigo].reset_index()
+
+    st.subheader(f"📋 Contenu de « {choix_frigo} »")
+    if df.empty:
+        st.info("Aucun article dans ce frigo.")
+    else:
+        for _, row in df.iterrows():
+            jr = row["jours_restants"]
+            style = bordure_color(jr)
+            c1, c2, c3 = st.columns([4, 1, 1])
+            with c1:
+                st.markdown(
+                    f"<div style='{style}; padding:8px 12px; border-radius:4px;'>"
+                    f"<strong>{row['article']}</strong>  •  Qté : {row['quantite']}  •  DLC : {row['dlc']}"
+                    f"</div>",
+                    unsafe_allow_html=True
+                )
+            with c2:
+                if st.button("❌", key=f"del_{choix_frigo}_{row['index']}", help="Supprimer"):
+                    new_df = df_all.drop(row["index"])
+                    save_df(ss_cmd, "Stockage Frigo", new_df, df_lu)
+                    st.success("Article supprimé.")
+            with c3:
+                if st.button("🔁", key=f"tf_{choix_frigo}_{row['index']}", help="Transférer"):
+                    st.session_state["to_transfer"] = row["index"]
+                    st.session_state["transfer_src"] = choix_frigo
+
+    if "to_transfer" in st.session_state:
+        st.markdown("---")
+        src = st.session_state["transfer_src"]
+        article = df_all.at[st.session_state["to_transfer"], "article"]
+        st.warning(f"🔁 Transfert de « {article} » depuis **{src}**")
+        dest = st.selectbox(
+            "Choisissez le frigo de destination",
+            [f for f in frigos if f != src],
+            key="dest_frigo"
+        )
+        if st.button("✅ Confirmer le transfert"):
+            df2 = load_df(ss_cmd, "Stockage Frigo")
+            df2.columns = [c.strip().lower().replace(" ", "_") for c in df2.columns]
+            lu2 = df2.copy()
+            df2.at[st.session_state["to_transfer"], "frigo"] = dest
+            save_df(ss_cmd, "Stockage Frigo", df2, lu2)
+            st.success("🔁 Transfert effectué !")
+            del st.session_state["to_transfer"]
+            del st.session_state["transfer_src"]
+
+    st.markdown("---")
+    if st.button(f"🗑️ Vider complètement « {choix_frigo} »"):
+        df2 = df_all[df_all["frigo"] != choix_frigo]
+        save_df(ss_cmd, "Stockage Frigo", df2, df_lu)
+        st.success(f"Contenu de « {choix_frigo} » vidé.")
+
+    st.markdown("---")
+    st.subheader("➕ Ajouter un article")
+    c1, c2, c3, c4 = st.columns([3, 1, 2, 1])
+    art = c1.text_input("Article", key="add_art")
+    qte = c2.number_input("Qté", min_value=1, value=1, key="add_qte")
+    dlc_in = c3.date_input("DLC", value=date.today() + timedelta(days=3), key="add_dlc")
+    if c4.button("✅ Ajouter"):
+        if not art.strip():
+            st.error("Le nom de l’article est vide.")
+        else:
+            nouveau = {
+                "frigo":    choix_frigo,
+                "article":  art.strip(),
+                "quantite": qte,
+                "dlc":       dlc_in.strftime("%Y-%m-%d")
+            }
+            df2 = pd.concat([df_all, pd.DataFrame([nouveau])], ignore_index=True)
+            save_df(ss_cmd, "Stockage Frigo", df2, df_lu)
+            st.success(f"« {art.strip()} » ajouté.")
+
+contenu_frigo()
@@ -0,0 +1,90 @@
+# app_pages/temperatures.py
+# Relevé des températures des frigos, par semaine ISO.
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from yorgios_core.config import SHEET_TEMP_ID
+from yorgios_core.concurrency import WriteConflict, cell_changes
+from yorgios_core.runtime import snapshot_cache
+from app_pages.common import journal_merge, ss_temp, ws_titles, ws_values
+
+st.header("🌡️ Relevé des températures")
+
+jour = st.date_input(
+    "🗓️ Sélectionner la date",
+    value=date.today(),
+    key="rt_jour"
+)
+
+iso_year, iso_week, _ = jour.isocalendar()
+nom_ws = f"Semaine {iso_week} {iso_year}"
+if nom_ws not in ws_titles(SHEET_TEMP_ID):
+    st.warning(f"⚠️ Feuille « {nom_ws} » introuvable.")
+    if st.button("➕ Créer la semaine", key="rt_create"):
+        model = ss_temp.worksheet("Semaine 38")
+        ss_temp.duplicate_sheet(source_sheet_id=model.id, new_sheet_name=nom_ws)
+        snapshot_cache().invalidate_sheet(SHEET_TEMP_ID)
+    st.stop()
+
+raw       = ws_values(SHEET_TEMP_ID, nom_ws)
+header    = [h.strip() for h in raw[0]]
+# état vu par l'utilisateur avant sa saisie : base de la fusion à l'enregistrement
+base_key  = f"rt_base_{nom_ws}"
+if base_key not in st.session_state:
+    st.session_state[base_key] = pd.DataFrame(raw[1:], columns=header)
+df_base   = st.session_state[base_key]
+df_temp   = pd.DataFrame(raw[1:], columns=header)
+frigos    = df_temp.iloc[:, 0].tolist()
+
+moment = st.selectbox(
+    "🕒 Moment du relevé",
+    ["Matin", "Soir"],
+    key="rt_moment"
+)
+
+with st.form("rt_form"):
+    saisies = {
+        f: st.text_input(f"Température {f}", key=f"rt_temp_{f}")
+        for f in frigos
+    }
+    if st.form_submit_button("✅ Valider les relevés"):
+        jours_fr = ["Lundi","Mardi","Mercredi","Jeudi","Vendredi","Samedi","Dimanche"]
+        cible    = f"{jours_fr[jour.weekday()]} {moment}".strip()
+
+        header_lower = [h.lower() for h in header]
+        if cible.lower() not in header_lower:
+            st.error(
+                f"Colonne « {cible} » introuvable.\n"
+                f"Colonnes disponibles : {', '.join(header)}"
+            )
+        else:
+            col_reelle = header[header_lower.index(cible.lower())]
+            vus = dict(zip(df_base.iloc[:, 0], df_base[col_reelle])) if col_reelle in df_base else {}
+            changes = []
+            for i, f in enumerate(frigos):
+                if not saisies[f].strip():
+                    continue  # champ laissé vide : on n'efface pas un relevé saisi ailleurs
+                # clé de ligne sans espaces parasites, comme merge_grid côté feuille
+                changes += cell_changes(f.strip(), {col_reelle: vus.get(f, "")}, {col_reelle: saisies[f]})
+            try:
+                if changes:
+                    journal_merge(SHEET_TEMP_ID, nom_ws, changes)
+                    for i, f in enumerate(frigos):
+                        if saisies[f].strip():
+                            df_temp.at[i, col_reelle] = saisies[f]
+                st.session_state.pop(base_key, None)
+                st.success("✅ Relevés sauvegardés.")
+            except WriteConflict as e:
+                st.session_state.pop(base_key, None)
+                st.error(f"❌ {e}. Rechargez la page pour voir les valeurs actuelles.")
+
+disp = df_temp.replace("", "⛔️")
+st.subheader("📊 Aperçu complet")
+st.dataframe(
+    disp.style.applymap(
+        lambda v: "color:red;" if v == "⛔️" else "color:green;"
+    ),
+    use_container_width=True
+)
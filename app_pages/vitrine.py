@@ -0,0 +1,248 @@
+# app_pages/vitrine.py
+# Vitrine : ajouts, alertes DLC et retraits.
+import unicodedata
+from datetime import date, timedelta
+
+import pandas as pd
+import gspread
+import streamlit as st
+
+from yorgios_core.config import SHEET_COMMANDES_ID
+from yorgios_core.idempotency import dedup_frame, new_request_id
+from yorgios_core.journal import OP_APPEND_UNIQUE, OP_UPDATE_CELLS
+from app_pages.common import journal_write, load_catalogue, normalize_col, style_dlc_alert, ws_values_safe
+
+produits_list = load_catalogue().produits
+
+def load_vitrine():
+    """En-tête brut et lignes (colonnes normalisées, n° de ligne Sheets), écritures en attente comprises."""
+    raw = ws_values_safe(SHEET_COMMANDES_ID, "Vitrine")
+    if not raw:
+        return [], pd.DataFrame()
+
+    header_raw = list(raw[0])
+    cols_norm = [normalize_col(c) for c in header_raw]
+    rows = raw[1:]
+    df_all = pd.DataFrame(rows, columns=cols_norm)
+
+    df_all["__row__"] = range(2, 2 + len(df_all))
+    df_all = dedup_frame(df_all)
+
+    for missing in ["produit", "date_fabrication", "dlc", "date_ajout", "date_retrait"]:
+        if missing not in df_all.columns:
+            df_all[missing] = ""
+    return header_raw, df_all
+
+def retirer(gs_rows, col_idx_retrait: int) -> None:
+    """Date de retrait posée sur toutes les lignes en une écriture : un batch_update, une invalidation."""
+    today = date.today().isoformat()
+    journal_write(SHEET_COMMANDES_ID, "Vitrine", OP_UPDATE_CELLS, {
+        "cells": [
+            {"range": gspread.utils.rowcol_to_a1(int(r), col_idx_retrait), "values": [[today]]}
+            for r in gs_rows
+        ],
+    })
+
+st.header("🖥️ Vitrine")
+
+header_raw, df_all = load_vitrine()
+if not header_raw:
+    st.warning("Feuille Vitrine vide.")
+    st.stop()
+
+st.subheader("➕ Ajouter un produit en vitrine")
+
+try:
+    options_produits = produits_list
+except Exception:
+    options_produits = sorted(
+        [p for p in df_all["produit"].dropna().unique().tolist() if str(p).strip()]
+    )
+
+col1, col2, col3 = st.columns([2, 1, 1])
+
+with col1:
+    choix_prod = st.selectbox("Produit (ou choisissez 'Autre')",
+                              options=(["(Autre)"] + options_produits) if options_produits else ["(Autre)"])
+    if choix_prod == "(Autre)":
+        produit = st.text_input("Nom du produit")
+    else:
+        produit = choix_prod
+
+with col2:
+    fab = st.date_input("Date de fabrication", value=date.today())
+
+dlc_calc = fab + timedelta(days=3)
+with col3:
+    st.text_input("DLC (auto J+3, non éditable)", value=dlc_calc.strftime("%Y-%m-%d"), disabled=True)
+
+date_ajout = st.date_input("Date d’ajout (pour le lot si besoin)", value=date.today())
+
+ok = st.button("Enregistrer en vitrine", type="primary", use_container_width=True)
+
+if ok:
+    if not produit or not str(produit).strip():
+        st.error("Veuillez renseigner un nom de produit.")
+        st.stop()
+    try:
+        header_norm_map = {normalize_col(h): i for i, h in enumerate(header_raw)}
+        new_vals = [""] * len(header_raw)
+
+        def set_if_exists(key_norm, value):
+            idx = header_norm_map.get(key_norm)
+            if idx is not None:
+                new_vals[idx] = value
+
+        set_if_exists("produit", str(produit).strip())
+        set_if_exists("date_fabrication", fab.isoformat())
+        set_if_exists("dlc", dlc_calc.isoformat())
+        set_if_exists("date_ajout", date_ajout.isoformat())
+
+        req = st.session_state.setdefault("vit_add_req", new_request_id())
+        journal_write(SHEET_COMMANDES_ID, "Vitrine", OP_APPEND_UNIQUE, {
+            "rows": [new_vals],
+            "ids": [req],
+            "value_input_option": "RAW",
+        }, key=req)
+        st.session_state.pop("vit_add_req", None)
+        st.success("Produit ajouté en vitrine.")
+        st.rerun()
+    except Exception as e:
+        st.error(f"Échec de l’enregistrement : {e}")
+
+st.markdown("---")
+
+# Alertes et articles actifs dans un fragment : un retrait ne réexécute que
+# cette partie, relue depuis le cache et le journal.
+@st.fragment
+def articles_actifs():
+    header_raw, df_all = load_vitrine()
+    if not header_raw:
+        return
+
+    st.subheader("⚠️ Alertes DLC")
+    actifs = df_all[df_all["date_retrait"].astype(str).str.strip() == ""].copy()
+
+    if not actifs.empty and "dlc" in actifs.columns:
+        dlc_series = pd.to_datetime(actifs["dlc"], errors="coerce")
+        today_dt3 = pd.Timestamp(date.today())
+        depassee = actifs[dlc_series < today_dt3].copy()
+        dujour   = actifs[dlc_series.dt.date == date.today()].copy()
+    else:
+        depassee = pd.DataFrame()
+        dujour   = pd.DataFrame()
+
+    cA, cB = st.columns(2)
+    with cA:
+        st.caption("DLC dépassées")
+        if depassee.empty:
+            st.success("RAS")
+        else:
+            try:
+                st.dataframe(style_dlc_alert(depassee), use_container_width=True)
+            except Exception:
+                st.dataframe(depassee, use_container_width=True)
+    with cB:
+        st.caption("DLC du jour")
+        if dujour.empty:
+            st.success("RAS")
+        else:
+            try:
+                st.dataframe(style_dlc_alert(dujour), use_container_width=True)
+            except Exception:
+                st.dataframe(dujour, use_container_width=True)
+
+    st.markdown("---")
+
+    st.subheader("Articles actifs")
+    if actifs.empty:
+        st.info("Aucun article actif en vitrine.")
+        return
+
+    try:
+        col_idx_retrait = [normalize_col(h) for h in header_raw].index("date_retrait") + 1
+    except ValueError:
+        st.error("Colonne 'date_retrait' introuvable dans la feuille Vitrine.")
+        return
+
+    def _norm_txt(x):
+        s = str(x or "").strip().lower()
+        try:
+            s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+        except Exception:
+            pass
+        return s
+
+    actifs["_prod_sort"] = actifs["produit"].map(_norm_txt) if "produit" in actifs.columns else ""
+    actifs["_dlc_dt"] = pd.to_datetime(actifs["dlc"], errors="coerce") if "dlc" in actifs.columns else pd.NaT
+    actifs = actifs.sort_values(by=["_prod_sort", "_dlc_dt"], na_position="last").drop(columns=["_prod_sort"], errors="ignore")
+
+    # Fermeture : sélection multiple, retirée en une seule écriture
+    if st.toggle("🧹 Retrait en lot (fermeture)", key="vit_retrait_lot"):
+        gen = st.session_state.get("vit_retrait_gen", 0)
+        table = pd.DataFrame({
+            "Retirer": False,
+            "Produit": actifs["produit"].astype(str),
+            "Lot": actifs["lot"].astype(str) if "lot" in actifs.columns else "",
+            "DLC": actifs["dlc"].astype(str),
+        })
+        table.index = actifs["__row__"].astype(int)
+        edited = st.data_editor(
+            table,
+            key=f"vit_retrait_table_{gen}",
+            hide_index=True,
+            disabled=["Produit", "Lot", "DLC"],
+            column_config={"Retirer": st.column_config.CheckboxColumn("Retirer")},
+            use_container_width=True,
+        )
+        selection = edited.index[edited["Retirer"]].tolist()
+        perimes = actifs.loc[actifs["_dlc_dt"] <= pd.Timestamp(date.today()), "__row__"].astype(int).tolist()
+
+        c1, c2 = st.columns(2)
+        a_retirer = []
+        if c1.button(f"🗑️ Retirer la sélection ({len(selection)})", disabled=not selection,
+                     use_container_width=True, key="vit_retrait_selection"):
+            a_retirer = selection
+        if c2.button(f"⏰ Retirer tout ce qui a DLC ≤ aujourd'hui ({len(perimes)})", disabled=not perimes,
+                     use_container_width=True, key="vit_retrait_perimes"):
+            a_retirer = perimes
+        if a_retirer:
+            try:
+                retirer(a_retirer, col_idx_retrait)
+                st.session_state["vit_retrait_gen"] = gen + 1   # tableau remis à zéro
+                st.toast(f"🗑️ {len(a_retirer)} article(s) retiré(s) de la vitrine.")
+                st.rerun(scope="fragment")
+            except Exception as e:
+                st.error(f"Impossible de retirer la sélection : {e}")
+        return
+
+    for _, r in actifs.iterrows():
+        produit_txt = str(r.get("produit", "")).strip()
+        lot_txt     = str(r.get("lot", "")).strip() if "lot" in actifs.columns else ""
+        fab_txt     = str(r.get("date_fabrication", "")).strip()
+        dlc_txt     = str(r.get("dlc", "")).strip()
+
+        line = f"**{produit_txt}**"
+        meta = []
+        if lot_txt:
+            meta.append(f"Lot {lot_txt}")
+        if fab_txt:
+            meta.append(f"Fab {fab_txt}")
+        if dlc_txt:
+            meta.append(f"DLC {dlc_txt}")
+        if meta:
+            line += " — " + " • ".join(meta)
+
+        c1, c2 = st.columns([8, 2])
+        with c1:
+            st.markdown(line)
+        with c2:
+            gs_row = int(r["__row__"])
+            if st.button("🗑️ Retirer", key=f"retirer-{gs_row}", use_container_width=True):
+                try:
+                    retirer([gs_row], col_idx_retrait)
+                    st.rerun(scope="fragment")
+                except Exception as e:
+                    st.error(f"Impossible de retirer l’article (ligne {gs_row}) : {e}")
+
+articles_actifs()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Pré-génère les PDF « Contrôle Hygiène » mois par mois, sans passer par l'UI
+Streamlit (préparation d'un contrôle sanitaire).
+
+Les quatre sources (températures, hygiène, vitrine, livraisons) sont lues une
+seule fois, puis chaque mois est rendu sur un pool de processus.
+Un manifest.json récapitule les fichiers produits. Avec --raw, les données
+brutes de toute la période sont aussi exportées (xlsx / parquet / csv), lues
+au fil de l'eau depuis les Google Sheets.
+
+Usage :
+  python3 scripts/export_haccp_pdfs.py --last 12
+  python3 scripts/export_haccp_pdfs.py --from 2024-10 --to 2025-09 --out exports/haccp
+  python3 scripts/export_haccp_pdfs.py --last 24 --workers 4 --credentials service_account.json
+  python3 scripts/export_haccp_pdfs.py --last 12 --raw xlsx
+"""
+
+import argparse
+import calendar
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from yorgios_core.audit import AuditSources, fetch_audit_sources, iter_audit_tables  # noqa: E402
+from yorgios_core.audit_export import FORMATS, export_audit_tables  # noqa: E402
+from yorgios_core.config import SHEET_COMMANDES_ID, SHEET_HYGIENE_ID, SHEET_TEMP_ID  # noqa: E402
+from yorgios_core.credentials import gsheets_client, service_account_info  # noqa: E402
+from yorgios_core.pdf_report import generate_controle_hygiene_pdf  # noqa: E402
+
+
+def parse_month(s: str) -> date:
+    try:
+        return datetime.strptime(s.strip(), "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Mois invalide « {s} » (attendu AAAA-MM)")
+
+def positive_int(s: str) -> int:
+    try:
+        n = int(s)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"Nombre de mois invalide « {s} » (entier ≥ 1 attendu)")
+    return n
+
+def month_range(first: date, last: date):
+    y, m = first.year, first.month
+    while (y, m) <= (last.year, last.month):
+        yield date(y, m, 1)
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+
+def last_months(n: int, today: date):
+    y, m = today.year, today.month
+    out = []
+    for _ in range(n):
+        out.append(date(y, m, 1))
+        y, m = (y - 1, 12) if m == 1 else (y, m - 1)
+    return sorted(out)
+
+def month_bounds(first: date):
+    return first, first.replace(day=calendar.monthrange(first.year, first.month)[1])
+
+def render_month(month: date, data: AuditSources, out_dir: str) -> dict:
+    """Exécuté dans un processus fils : rend un mois (données déjà restreintes) et écrit le PDF."""
+    debut, fin = month_bounds(month)
+    t0 = time.time()
+    pdf = generate_controle_hygiene_pdf(
+        data.temperatures, data.hygiene, data.vitrine, debut, fin,
+        livraison_df=data.livraisons,
+    )
+    name = f"controle_hygiene_{month.strftime('%Y-%m')}.pdf"
+    with open(os.path.join(out_dir, name), "wb") as f:
+        f.write(pdf)
+    return {
+        "mois": month.strftime("%Y-%m"),
+        "fichier": name,
+        "date_debut": debut.isoformat(),
+        "date_fin": fin.isoformat(),
+        "lignes": data.row_counts(),
+        "octets": len(pdf),
+        "sha256": hashlib.sha256(pdf).hexdigest(),
+        "duree_s": round(time.time() - t0, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Export PDF Contrôle Hygiène par mois")
+    g = parser.add_mutually_exclusive_group(required=True)
+    g.add_argument("--last", type=positive_int, help="N derniers mois (mois courant inclus)")
+    g.add_argument("--from", dest="first", type=parse_month, help="premier mois AAAA-MM")
+    parser.add_argument("--to", dest="last_month", type=parse_month, help="dernier mois AAAA-MM (défaut : mois courant)")
+    parser.add_argument("--out", default="exports/controle_hygiene", help="dossier de sortie")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--credentials", help="JSON du compte de service (sinon env / secrets.toml)")
+    parser.add_argument("--raw", choices=sorted(FORMATS), help="exporte aussi les données brutes de la période")
+    args = parser.parse_args()
+
+    today = date.today()
+    if args.last is not None:
+        months = last_months(args.last, today)
+    else:
+        months = list(month_range(args.first, args.last_month or today))
+    if not months:
+        parser.error("Aucun mois à générer.")
+
+    os.makedirs(args.out, exist_ok=True)
+
+    print("🔐 Connexion Google Sheets…")
+    gc = gsheets_client(service_account_info(args.credentials))
+    t0 = time.time()
+    sources = fetch_audit_sources(
+        gc.open_by_key(SHEET_TEMP_ID),
+        gc.open_by_key(SHEET_HYGIENE_ID),
+        gc.open_by_key(SHEET_COMMANDES_ID),
+    )
+    print(f"📥 Sources chargées en {time.time() - t0:.1f}s : {sources.row_counts()}")
+
+    # on n'envoie à chaque processus que la tranche de données utile
+    entries, errors = [], 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            pool.submit(render_month, m, sources.period(*month_bounds(m)), args.out): m
+            for m in months
+        }
+        for fut in as_completed(futures):
+            m = futures[fut]
+            try:
+                entry = fut.result()
+                entries.append(entry)
+                print(f"✅ {entry['mois']} → {entry['fichier']} ({entry['octets'] // 1024} Ko, {entry['duree_s']}s)")
+            except Exception as e:
+                errors += 1
+                entries.append({"mois": m.strftime("%Y-%m"), "erreur": str(e)})
+                print(f"❌ {m.strftime('%Y-%m')} : {e}")
+
+    entries.sort(key=lambda e: e["mois"])
+    manifest = {
+        "genere_le": datetime.now().isoformat(timespec="seconds"),
+        "mois": entries,
+    }
+
+    if args.raw:
+        debut, fin = months[0], month_bounds(months[-1])[1]
+        ss = [gc.open_by_key(k) for k in (SHEET_TEMP_ID, SHEET_HYGIENE_ID, SHEET_COMMANDES_ID)]
+        data = export_audit_tables(
+            iter_audit_tables(*ss, debut, fin),
+            args.raw,
+            meta={"Période": f"{debut.strftime('%d/%m/%Y')} au {fin.strftime('%d/%m/%Y')}"},
+        )
+        name = f"donnees_{debut.strftime('%Y-%m')}_{fin.strftime('%Y-%m')}.{FORMATS[args.raw][1]}"
+        with open(os.path.join(args.out, name), "wb") as f:
+            f.write(data)
+        manifest["donnees_brutes"] = {"fichier": name, "format": args.raw, "octets": len(data)}
+        print(f"📊 Données brutes → {name} ({len(data) // 1024} Ko)")
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"📄 {len(entries) - errors} PDF générés dans {args.out} en {time.time() - t0:.1f}s (manifest.json)")
+    sys.exit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
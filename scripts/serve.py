@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Lance l'app Streamlit après avoir démarré, dans le même processus, le
+préchauffage des caches (spreadsheets, catalogue, dashboard, protocoles) et
+une sonde HTTP de disponibilité pour l'orchestrateur de conteneurs :
+
+  GET http://<hôte>:<port sonde>/ready  → 200 une fois les caches chauds, 503 avant
+  GET http://<hôte>:<port sonde>/live   → 200 tant que le processus répond
+
+Usage :
+  python3 scripts/serve.py
+  python3 scripts/serve.py --port 8501 --ready-port 8502
+  python3 scripts/serve.py --no-warmup          # sonde prête immédiatement
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from streamlit.web import bootstrap  # noqa: E402
+
+from yorgios_core.warmup import Warmup, default_tasks, serve_readiness  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur Streamlit préchauffé avec sonde de disponibilité")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8501)))
+    parser.add_argument("--ready-port", type=int, default=int(os.getenv("READINESS_PORT", 8502)))
+    parser.add_argument("--workers", type=int, default=6, help="chargements en parallèle")
+    parser.add_argument("--no-warmup", action="store_true")
+    args = parser.parse_args()
+
+    # secrets.toml et chemins relatifs résolus comme avec `streamlit run` depuis la racine
+    os.chdir(ROOT)
+
+    warmup = Warmup({} if args.no_warmup else default_tasks(), workers=args.workers)
+    serve_readiness(warmup, args.ready_port)
+    warmup.start()
+    print(f"Préchauffage lancé ({len(warmup.tasks)} tâches) ; sonde sur :{args.ready_port}/ready", flush=True)
+
+    flag_options = {"server.port": args.port, "server.headless": True}
+    bootstrap.load_config_options(flag_options)
+    bootstrap.run(os.path.join(ROOT, "app_yorgios.py"), False, [], flag_options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# yorgios_core/__init__.py
+# Briques partagées de l'app Streamlit Yorgios (couche données, caches, exports).
+# Les modules sont importés à la demande : pas de ré-export ici pour garder
+# l'import du paquet gratuit (le CLI ne doit pas tirer Streamlit).
@@ -0,0 +1,216 @@
+# yorgios_core/audit.py
+# Chargement des données du « Contrôle Hygiène » sans Streamlit :
+# utilisé par l'onglet de l'app et par scripts/export_haccp_pdfs.py.
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import fill_gaps
+
+from .config import HYGIENE_TYPES, LIVRAISON_HEADERS, LIVRAISON_WS
+from .idempotency import dedup_frame
+
+
+# ————————————————————————
+# Lecture groupée des onglets
+# ————————————————————————
+def _a1_sheet(title: str) -> str:
+    return "'" + title.replace("'", "''") + "'"
+
+def batch_values(ss, titles: Sequence[str]) -> List[Tuple[str, list]]:
+    """Valeurs de plusieurs onglets en un seul appel `values:batchGet` (lignes complétées à droite)."""
+    if not titles:
+        return []
+    resp = ss.values_batch_get([_a1_sheet(t) for t in titles])
+    out = []
+    for title, vr in zip(titles, resp.get("valueRanges", [])):
+        values = vr.get("values", [])
+        out.append((title, fill_gaps(values) if values else []))
+    return out
+
+def _stack(blocks: Iterable[Tuple[str, list]], label_col: str) -> pd.DataFrame:
+    frames = []
+    for title, vals in blocks:
+        if len(vals) < 2:
+            continue
+        dfw = pd.DataFrame(vals[1:], columns=vals[0])
+        dfw[label_col] = title
+        frames.append(dfw)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+# ————————————————————————
+# Sources complètes (non filtrées)
+# ————————————————————————
+def fetch_temperatures(ss_temp) -> pd.DataFrame:
+    titles = [ws.title.strip() for ws in ss_temp.worksheets() if ws.title.strip().lower().startswith("semaine")]
+    df = _stack(batch_values(ss_temp, titles), "Semaine")
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df
+
+def fetch_hygiene(ss_hygiene) -> pd.DataFrame:
+    existing = {ws.title for ws in ss_hygiene.worksheets()}
+    titles = [t for t in HYGIENE_TYPES if t in existing]
+    df = _stack(batch_values(ss_hygiene, titles), "Type")
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df
+
+def _public(df: pd.DataFrame) -> pd.DataFrame:
+    """Sans doublons d'ajout ni colonnes techniques (« __req_id », « __row__ »…)."""
+    df = dedup_frame(df)
+    return df.drop(columns=[c for c in df.columns if str(c).startswith("__")])
+
+def fetch_vitrine(ss_cmd) -> pd.DataFrame:
+    records = ss_cmd.worksheet("Vitrine").get_all_records()
+    df = _public(pd.DataFrame(records))
+    if "date_ajout" in df.columns:
+        df["DateAjout"] = pd.to_datetime(df["date_ajout"], format="%Y%m%d", errors="coerce")
+    return df
+
+def livraison_frame(values) -> pd.DataFrame:
+    """Journal de livraison brut → DataFrame, « Horodatage départ » en datetime."""
+    if not values:
+        return pd.DataFrame(columns=LIVRAISON_HEADERS)
+    df = _public(pd.DataFrame(values[1:], columns=values[0]))
+    if "Horodatage départ" in df.columns:
+        df["Horodatage départ"] = pd.to_datetime(df["Horodatage départ"], errors="coerce")
+    return df
+
+def fetch_livraisons(ss_cmd) -> pd.DataFrame:
+    try:
+        values = ss_cmd.worksheet(LIVRAISON_WS).get_all_values()
+    except WorksheetNotFound:
+        values = []
+    return livraison_frame(values)
+
+
+# ————————————————————————
+# Filtres par période (bornes incluses)
+# ————————————————————————
+def filter_temperatures(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    if "Date" not in df.columns:
+        return df
+    return df.loc[(df["Date"] >= start) & (df["Date"] <= end)].reset_index(drop=True)
+
+def filter_hygiene(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    if "Date" not in df.columns:
+        return pd.DataFrame()
+    return df.loc[(df["Date"] >= start) & (df["Date"] <= end)].reset_index(drop=True)
+
+def filter_vitrine(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    if "DateAjout" not in df.columns:
+        return pd.DataFrame()
+    return df.loc[(df["DateAjout"] >= start) & (df["DateAjout"] <= end)].reset_index(drop=True)
+
+def filter_livraisons(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    if df.empty or "Horodatage départ" not in df.columns:
+        return pd.DataFrame()
+    h = df["Horodatage départ"]
+    return df.loc[(h >= start) & (h < end + pd.Timedelta(days=1))].reset_index(drop=True)
+
+
+# ————————————————————————
+# Jeu de données d'audit
+# ————————————————————————
+TABLE_TEMPERATURES = "Températures"
+TABLE_VITRINE      = "Vitrine"
+TABLE_LIVRAISONS   = "Livraisons"
+
+def table_hygiene(typ: str) -> str:
+    return f"Hygiène {typ}"
+
+def _chunks(name: str, df: pd.DataFrame, chunk_rows: int):
+    for i in range(0, len(df), chunk_rows):
+        yield name, df.iloc[i : i + chunk_rows]
+
+@dataclass
+class AuditSources:
+    temperatures: pd.DataFrame
+    hygiene: pd.DataFrame
+    vitrine: pd.DataFrame
+    livraisons: pd.DataFrame
+
+    def period(self, date_debut: date, date_fin: date) -> "AuditSources":
+        """Restreint chaque table à [date_debut, date_fin] (bornes incluses)."""
+        start = pd.to_datetime(date_debut)
+        end   = pd.to_datetime(date_fin)
+        return AuditSources(
+            filter_temperatures(self.temperatures, start, end),
+            filter_hygiene(self.hygiene, start, end),
+            filter_vitrine(self.vitrine, start, end),
+            filter_livraisons(self.livraisons, start, end),
+        )
+
+    def row_counts(self) -> dict:
+        return {
+            "temperatures": len(self.temperatures),
+            "hygiene": len(self.hygiene),
+            "vitrine": len(self.vitrine),
+            "livraisons": len(self.livraisons),
+        }
+
+    def iter_tables(self, chunk_rows: int = 5000) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """(table, tranche) par blocs de `chunk_rows` lignes ; l’hygiène est séparée par type."""
+        yield from _chunks(TABLE_TEMPERATURES, self.temperatures, chunk_rows)
+        if "Type" in self.hygiene.columns:
+            for typ in HYGIENE_TYPES:
+                part = self.hygiene[self.hygiene["Type"] == typ]
+                if part.empty:
+                    continue
+                # chaque type a ses propres colonnes de tâches
+                part = part.drop(columns=["Type"]).dropna(axis=1, how="all")
+                yield from _chunks(table_hygiene(typ), part, chunk_rows)
+        yield from _chunks(TABLE_VITRINE, self.vitrine, chunk_rows)
+        yield from _chunks(TABLE_LIVRAISONS, self.livraisons, chunk_rows)
+
+
+def iter_audit_tables(
+    ss_temp, ss_hygiene, ss_cmd, date_debut: date, date_fin: date,
+    tabs_per_call: int = 12, chunk_rows: int = 5000,
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Même contenu que `fetch_audit_sources(...).period(...).iter_tables()`, mais lu
+    au fil de l’eau : les onglets « Semaine » sont récupérés par paquets et
+    filtrés aussitôt, si bien qu’un export pluriannuel ne tient jamais tout
+    l’historique brut en mémoire.
+    """
+    start = pd.to_datetime(date_debut)
+    end   = pd.to_datetime(date_fin)
+
+    titles = [ws.title.strip() for ws in ss_temp.worksheets() if ws.title.strip().lower().startswith("semaine")]
+    for i in range(0, len(titles), tabs_per_call):
+        block = _stack(batch_values(ss_temp, titles[i : i + tabs_per_call]), "Semaine")
+        if "Date" in block.columns:
+            block["Date"] = pd.to_datetime(block["Date"], errors="coerce")
+        yield from _chunks(TABLE_TEMPERATURES, filter_temperatures(block, start, end), chunk_rows)
+
+    existing = {ws.title for ws in ss_hygiene.worksheets()}
+    for typ in HYGIENE_TYPES:
+        if typ not in existing:
+            continue
+        part = _stack(batch_values(ss_hygiene, [typ]), "Type")
+        if "Date" in part.columns:
+            part["Date"] = pd.to_datetime(part["Date"], errors="coerce")
+        part = filter_hygiene(part, start, end)
+        yield from _chunks(table_hygiene(typ), part.drop(columns=["Type"], errors="ignore"), chunk_rows)
+
+    yield from _chunks(TABLE_VITRINE, filter_vitrine(fetch_vitrine(ss_cmd), start, end), chunk_rows)
+    yield from _chunks(TABLE_LIVRAISONS, filter_livraisons(fetch_livraisons(ss_cmd), start, end), chunk_rows)
+
+
+def fetch_audit_sources(ss_temp, ss_hygiene, ss_cmd, livraisons: Optional[pd.DataFrame] = None) -> AuditSources:
+    """
+    Lit les quatre sources une seule fois (un batchGet par classeur).
+    `livraisons` permet de réutiliser un instantané déjà en cache.
+    """
+    return AuditSources(
+        temperatures=fetch_temperatures(ss_temp),
+        hygiene=fetch_hygiene(ss_hygiene),
+        vitrine=fetch_vitrine(ss_cmd),
+        livraisons=fetch_livraisons(ss_cmd) if livraisons is None else _public(livraisons),
+    )
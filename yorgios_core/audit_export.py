@@ -0,0 +1,171 @@
+# yorgios_core/audit_export.py
+# Export des données brutes du Contrôle Hygiène (XLSX multi-onglets, Parquet, CSV).
+# Les tables arrivent par tranches (cf. audit.iter_audit_tables / AuditSources.iter_tables)
+# et sont écrites au fil de l'eau : aucune copie complète n'est construite.
+from __future__ import annotations
+import csv
+import io
+import math
+import re
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+FORMATS = {
+    "xlsx":    ("Excel (.xlsx)",  "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": ("Parquet (.zip)", "zip",  "application/zip"),
+    "csv":     ("CSV (.zip)",     "zip",  "application/zip"),
+}
+
+Chunks = Iterable[Tuple[str, pd.DataFrame]]
+
+
+# ————————————————————————
+# Utilitaires
+# ————————————————————————
+def _file_stem(name: str) -> str:
+    s = re.sub(r"[^\w-]+", "_", name, flags=re.UNICODE).strip("_")
+    return s or "table"
+
+def _sheet_title(name: str) -> str:
+    return re.sub(r"[\[\]\*\?/\\:]", "_", name)[:31]
+
+def _cell(v):
+    if v is None or v is pd.NaT:
+        return None
+    if isinstance(v, pd.Timestamp):
+        return None if pd.isna(v) else v.to_pydatetime()
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return v
+
+def _align(chunk: pd.DataFrame, header: list) -> pd.DataFrame:
+    """Tranche remise dans l’ordre de l’en-tête de sa section (colonnes absentes vides)."""
+    if list(chunk.columns) == header:
+        return chunk
+    return chunk.reindex(columns=header)
+
+def _sections(chunks: Chunks) -> Iterator[Tuple[str, pd.DataFrame, list]]:
+    """
+    (section, tranche, en-tête). Une tranche qui apporte des colonnes absentes de
+    l’en-tête en cours (ex. onglets « Semaine » de mise en page différente) ouvre
+    une nouvelle section « Table (2) »… plutôt que de perdre ces colonnes.
+    """
+    current, header, n = None, None, 0
+    for name, chunk in chunks:
+        cols = list(chunk.columns)
+        if name != current:
+            current, header, n = name, cols, 1
+            yield name, chunk, header
+            continue
+        if not set(cols) <= set(header):
+            header, n = cols, n + 1
+        yield (name if n == 1 else f"{name} ({n})"), chunk, header
+
+
+# ————————————————————————
+# XLSX (openpyxl write-only : les lignes partent sur disque au fur et à mesure)
+# ————————————————————————
+def _write_xlsx(chunks: Chunks, out: io.BytesIO, meta: Dict[str, str]) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    info = wb.create_sheet("Infos")
+    for k, v in meta.items():
+        info.append([k, v])
+
+    sheets: Dict[str, object] = {}
+    for name, chunk, header in _sections(chunks):
+        if name not in sheets:
+            ws = sheets[name] = wb.create_sheet(_sheet_title(name))
+            ws.append([str(c) for c in header])
+        ws = sheets[name]
+        for row in _align(chunk, header).itertuples(index=False, name=None):
+            ws.append([_cell(v) for v in row])
+    wb.save(out)
+
+
+# ————————————————————————
+# CSV (un fichier par table dans une archive zip, séparateur « ; » pour Excel FR)
+# ————————————————————————
+def _write_csv(chunks: Chunks, out: io.BytesIO, meta: Dict[str, str]) -> None:
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("infos.txt", "\n".join(f"{k} : {v}" for k, v in meta.items()))
+        current, raw, text, writer = None, None, None, None
+        for name, chunk, header in _sections(chunks):
+            if name != current:
+                if text is not None:
+                    text.close()
+                current = name
+                raw = zf.open(f"{_file_stem(name)}.csv", "w")
+                text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+                writer = csv.writer(text, delimiter=";")
+                writer.writerow([str(c) for c in header])
+            for row in _align(chunk, header).itertuples(index=False, name=None):
+                writer.writerow(["" if _cell(v) is None else _cell(v) for v in row])
+        if text is not None:
+            text.close()
+
+
+# ————————————————————————
+# Parquet (un fichier par table, un row group par tranche)
+# ————————————————————————
+def _parquet_ready(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Schéma stable d’une tranche à l’autre : dates en datetime, tout le reste en texte."""
+    out = {}
+    for c in chunk.columns:
+        s = chunk[c]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            out[str(c)] = s
+        else:
+            out[str(c)] = s.astype("string")
+    return pd.DataFrame(out, index=chunk.index)
+
+def _write_parquet(chunks: Chunks, out: io.BytesIO, meta: Dict[str, str]) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:  # dépendance optionnelle
+        raise RuntimeError("L’export Parquet nécessite le paquet 'pyarrow'.") from e
+
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr("infos.txt", "\n".join(f"{k} : {v}" for k, v in meta.items()))
+        current, raw, writer, schema = None, None, None, None
+        for name, chunk, header in _sections(chunks):
+            if name != current:
+                if writer is not None:
+                    writer.close()
+                    raw.close()
+                current = name
+                first = pa.Table.from_pandas(_parquet_ready(_align(chunk, header)), preserve_index=False)
+                schema = first.schema
+                raw = zf.open(f"{_file_stem(name)}.parquet", "w")
+                writer = pq.ParquetWriter(raw, schema, compression="zstd")
+                writer.write_table(first)
+                continue
+            table = pa.Table.from_pandas(_parquet_ready(_align(chunk, header)), preserve_index=False)
+            writer.write_table(table.cast(schema))
+        if writer is not None:
+            writer.close()
+            raw.close()
+
+
+# ————————————————————————
+# API publique
+# ————————————————————————
+_WRITERS = {"xlsx": _write_xlsx, "csv": _write_csv, "parquet": _write_parquet}
+
+def export_audit_tables(chunks: Chunks, fmt: str, meta: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Écrit les tranches `(table, DataFrame)` dans le format demandé et renvoie le fichier.
+    Les tranches d’une même table doivent se suivre (c’est le cas des itérateurs d’audit.py).
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Format d’export inconnu : {fmt}")
+    meta = dict(meta or {})
+    meta.setdefault("Généré le", datetime.now().strftime("%d/%m/%Y %H:%M"))
+    out = io.BytesIO()
+    _WRITERS[fmt](chunks, out, meta)
+    return out.getvalue()
@@ -0,0 +1,132 @@
+# yorgios_core/concurrency.py
+# Contrôle de concurrence optimiste pour les onglets partagés (hygiène,
+# relevés de températures, stockage frigo). Chaque écriture emporte l'état
+# qu'avait l'utilisateur sous les yeux ; au moment d'écrire, on fusionne avec
+# l'état courant (fusion à trois voies) et on ne lève une erreur que si la
+# même cellule / le même enregistrement a été modifié des deux côtés.
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+from gspread.utils import rowcol_to_a1
+
+
+class WriteConflict(Exception):
+    """Modification concurrente incompatible ; rien n'a été écrit."""
+
+    def __init__(self, conflicts: Sequence[str]):
+        self.conflicts = list(conflicts)
+        super().__init__("Conflit d’écriture : " + " ; ".join(self.conflicts))
+
+
+# ————————————————————————
+# Grilles indexées par la première colonne (date, frigo…) × en-tête
+# ————————————————————————
+@dataclass(frozen=True)
+class CellChange:
+    row_key: str    # valeur de la colonne clé (ex. « 2025-03-14 », « Frigo 2 »)
+    col: str        # nom de colonne (en-tête)
+    base: str       # valeur vue par l'utilisateur
+    new: str        # valeur voulue
+
+    def as_dict(self) -> dict:
+        return {"row_key": self.row_key, "col": self.col, "base": self.base, "new": self.new}
+
+
+def cell_changes(row_key: str, base: dict, new: dict) -> List[CellChange]:
+    """Changements d'une ligne : seules les cellules réellement modifiées."""
+    return [
+        CellChange(row_key, col, str(base.get(col, "")), str(v))
+        for col, v in new.items()
+        if str(v) != str(base.get(col, ""))
+    ]
+
+
+def merge_grid(
+    current: Sequence[Sequence[str]], changes: Iterable[dict], key_col: int = 0, strict: bool = True,
+) -> Tuple[List[dict], List[list]]:
+    """
+    Rebase `changes` sur la grille `current`.
+    Renvoie (cellules à écrire pour batch_update, lignes à ajouter). Une
+    cellule modifiée entre-temps par quelqu'un d'autre vers une autre valeur
+    est un conflit (WriteConflict si `strict`, ignorée sinon).
+    """
+    header = [h.strip() for h in current[0]] if current else []
+    rows_by_key = {}
+    for i, row in enumerate(current[1:], start=2):
+        key = row[key_col].strip() if key_col < len(row) else ""
+        if key and key not in rows_by_key:
+            rows_by_key[key] = (i, row)
+
+    cells, conflicts = [], []
+    new_rows = {}
+    for ch in changes:
+        col_name = ch["col"].strip()
+        if col_name not in header:
+            conflicts.append(f"colonne « {ch['col']} » introuvable")
+            continue
+        c = header.index(col_name)
+        found = rows_by_key.get(ch["row_key"])
+        if found is None:
+            if ch["base"] != "":
+                conflicts.append(f"ligne « {ch['row_key']} » supprimée entre-temps")
+                continue
+            row = new_rows.setdefault(ch["row_key"], [""] * len(header))
+            row[key_col] = ch["row_key"]
+            row[c] = ch["new"]
+            continue
+        r, row = found
+        theirs = row[c] if c < len(row) else ""
+        if theirs == ch["new"]:
+            continue
+        if theirs != ch["base"]:
+            conflicts.append(f"{ch['row_key']} / {ch['col']} : « {theirs} » saisi entre-temps (vous : « {ch['new']} »)")
+            continue
+        cells.append({"range": rowcol_to_a1(r, c + 1), "values": [[ch["new"]]]})
+
+    if conflicts and strict:
+        raise WriteConflict(conflicts)
+    return cells, list(new_rows.values())
+
+
+# ————————————————————————
+# Listes d'enregistrements sans clé (stockage frigo) : différence de multiensembles
+# ————————————————————————
+def merge_records(
+    current: Sequence[Sequence[str]], base: Sequence[Sequence[str]], new: Sequence[Sequence[str]],
+    strict: bool = True,
+) -> List[list]:
+    """
+    Applique à `current` ce que l'utilisateur a changé entre `base` et `new` :
+    suppressions (base − new) puis ajouts (new − base). Idempotent : un
+    enregistrement déjà retiré n'est pas retiré une seconde fois, un ajout déjà
+    présent (autant d'exemplaires que dans `new`) n'est pas refait — une écriture
+    rejouée après un timeout ne duplique rien. *Modifier* un enregistrement
+    (suppression + ajout dans la même écriture) qui a disparu entre-temps, sans
+    que la nouvelle version soit déjà là, est un conflit.
+    """
+    as_key = lambda r: tuple(str(v) for v in r)
+    base_c, new_c = Counter(map(as_key, base)), Counter(map(as_key, new))
+    removed = base_c - new_c
+    added   = new_c - base_c
+    available = Counter(map(as_key, current))
+
+    # ce qui reste à faire par rapport à l'état courant
+    to_remove = Counter({k: min(n, available[k] - new_c[k]) for k, n in removed.items() if available[k] > new_c[k]})
+    to_add    = Counter({k: min(n, new_c[k] - available[k]) for k, n in added.items() if new_c[k] > available[k]})
+
+    missing = removed - available
+    if missing and to_add and strict:
+        raise WriteConflict([f"« {' / '.join(k)} » modifié ou retiré entre-temps" for k in missing])
+
+    out = []
+    for row in current:
+        k = as_key(row)
+        if to_remove[k] > 0:
+            to_remove[k] -= 1
+            continue
+        out.append(list(k))
+    for k, n in to_add.items():
+        out.extend([list(k)] * n)
+    return out
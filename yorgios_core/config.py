@@ -0,0 +1,34 @@
+# yorgios_core/config.py
+from __future__ import annotations
+
+# ——— Google Sheets utilisés par l'app (et par les scripts en ligne de commande)
+SHEET_COMMANDES_ID = "1cBP7iEeWK5whbHzoZAWUhq_HQ5OcAEjTBkUro2cmkoc"
+SHEET_HYGIENE_ID   = "1phiQjSYqvHdVEqv7uAt8pitRE0NfKv4b1f4UUzUqbXQ"
+SHEET_TEMP_ID      = "1e4hS6iawCa1IizhzY3xhskLy8Gj3todP3zzk38s7aq0"
+SHEET_PLANNING_ID  = "1OBYGNHtHdDB2jufKKjoAwq6RiiS_pnz4ta63sAM-t_0"
+SHEET_PRODUITS_ID  = "1FbRV4KgXyCwqwLqJkyq8cHZbo_BfB7kyyPP3pO53Snk"
+SHEET_RESP_ID      = "1nWEel6nizI0LKC84uaBDyqTNg1hzwPSVdZw41YJaBV8"
+
+# ——— Dossiers Drive
+PROTOCOLES_FOLDER_ID              = "14Pa-svM3uF9JQtjKysP0-awxK0BDi35E"
+LIVRAISON_PHOTO_FOLDER_ID_DEFAULT = "1EF9JPKr8XV4XDlHm_rFhpbYofDkBvv5V"
+
+GOOGLE_SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+    "https://www.googleapis.com/auth/drive.readonly",
+]
+
+# ——— Onglet « Livraison Température » (feuille Commandes)
+LIVRAISON_WS = "Livraison Température"
+LIVRAISON_HEADERS = [
+    "Produit",
+    "Température départ (°C)",
+    "Horodatage départ",
+    "Température réception (°C)",
+    "Dénomination GEP",
+    "Résultat réception",
+    "Lien photo",
+]
+
+HYGIENE_TYPES = ["Quotidien", "Hebdomadaire", "Mensuel"]
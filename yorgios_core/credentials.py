@@ -0,0 +1,50 @@
+# yorgios_core/credentials.py
+# Compte de service Google hors Streamlit (scripts en ligne de commande).
+from __future__ import annotations
+import json
+import os
+import tomllib
+from typing import Optional
+
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+from .config import GOOGLE_SCOPES
+
+SECRETS_TOML = os.path.join(os.path.dirname(__file__), "..", ".streamlit", "secrets.toml")
+
+
+def load_secrets(path: str = SECRETS_TOML) -> dict:
+    """Contenu de .streamlit/secrets.toml (dict vide s'il n'existe pas)."""
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def service_account_info(path: Optional[str] = None) -> dict:
+    """
+    Ordre de recherche : fichier JSON passé en argument, variable d'env
+    GOOGLE_SERVICE_ACCOUNT_JSON, puis .streamlit/secrets.toml (comme l'app).
+    """
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+    elif os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON"):
+        info = json.loads(os.environ["GOOGLE_SERVICE_ACCOUNT_JSON"])
+    elif os.path.isfile(SECRETS_TOML):
+        with open(SECRETS_TOML, "rb") as f:
+            info = json.loads(tomllib.load(f)["GOOGLE_SERVICE_ACCOUNT_JSON"])
+    else:
+        raise RuntimeError(
+            "Compte de service introuvable : --credentials, GOOGLE_SERVICE_ACCOUNT_JSON "
+            "ou .streamlit/secrets.toml."
+        )
+    # Assure une bonne gestion des retours à la ligne dans la clé privée
+    info["private_key"] = info["private_key"].replace("\\n", "\n")
+    return info
+
+
+def gsheets_client(info: dict, http_client=gspread.http_client.HTTPClient) -> gspread.Client:
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(info, GOOGLE_SCOPES)
+    return gspread.authorize(creds, http_client=http_client)
@@ -0,0 +1,162 @@
+# yorgios_core/drive.py
+# Client HTTP Drive v3 partagé : une session requests avec pool keep-alive et
+# des jetons d'accès du compte de service mis en cache jusqu'à peu avant expiration.
+from __future__ import annotations
+import json
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from oauth2client.service_account import ServiceAccountCredentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DRIVE_FILES_URL  = "https://www.googleapis.com/drive/v3/files"
+DRIVE_UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files"
+
+SCOPE_DRIVE_READONLY = "https://www.googleapis.com/auth/drive.readonly"
+SCOPE_DRIVE          = "https://www.googleapis.com/auth/drive"
+
+FILE_FIELDS = "id, name, mimeType, modifiedTime, md5Checksum"
+
+
+def drive_q_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+def drive_view_link(file_id: str) -> str:
+    return f"https://drive.google.com/file/d/{file_id}/view?usp=drivesdk"
+
+
+class DriveClient:
+    """
+    Toutes les requêtes Drive passent par la même `requests.Session` (connexions
+    TLS réutilisées). Un jeton est demandé une fois par scope puis réutilisé
+    jusqu'à `refresh_margin` secondes de son expiration ; un 401 force un
+    renouvellement et la requête est rejouée une fois.
+    L'objet est thread-safe : il est partagé par toutes les sessions Streamlit.
+    """
+
+    def __init__(self, sa_info: dict, pool_size: int = 8, refresh_margin: int = 300):
+        self._sa_info = sa_info
+        self._refresh_margin = refresh_margin
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._ids: Dict[Tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+
+    # ————————————————————————
+    # Jetons
+    # ————————————————————————
+    def token(self, scope: str = SCOPE_DRIVE_READONLY, force: bool = False) -> str:
+        with self._lock:
+            cached = self._tokens.get(scope)
+            if cached and not force and time.monotonic() < cached[1]:
+                return cached[0]
+            creds = ServiceAccountCredentials.from_json_keyfile_dict(self._sa_info, [scope])
+            info = creds.get_access_token()
+            expires_in = info.expires_in or 3600
+            self._tokens[scope] = (
+                info.access_token,
+                time.monotonic() + max(0, expires_in - self._refresh_margin),
+            )
+            return info.access_token
+
+    def request(self, method: str, url: str, scope: str = SCOPE_DRIVE_READONLY, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", 60)
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers["Authorization"] = f"Bearer {self.token(scope)}"
+        resp = self.session.request(method, url, headers=headers, **kwargs)
+        if resp.status_code == 401:
+            headers["Authorization"] = f"Bearer {self.token(scope, force=True)}"
+            resp = self.session.request(method, url, headers=headers, **kwargs)
+        return resp
+
+    # ————————————————————————
+    # Lecture
+    # ————————————————————————
+    def find_file(self, name: str, folder_id: str, refresh: bool = False) -> Optional[dict]:
+        """Métadonnées du fichier `name` dans `folder_id` ; l'ID résolu est mémorisé."""
+        key = (folder_id, name)
+        if not refresh and key in self._ids:
+            return self._ids[key]
+        q = "name = '{name}' and '{folder}' in parents and trashed = false".format(
+            name=drive_q_escape(str(name)), folder=drive_q_escape(str(folder_id))
+        )
+        resp = self.request(
+            "GET", DRIVE_FILES_URL,
+            params={"q": q, "fields": f"files({FILE_FIELDS})", "pageSize": 1},
+            timeout=30,
+        )
+        if resp.status_code != 200:
+            return None
+        items = resp.json().get("files", [])
+        if not items:
+            return None
+        with self._lock:
+            self._ids[key] = items[0]
+        return items[0]
+
+    def list_folder(self, folder_id: str, names: Optional[Iterable[str]] = None) -> list:
+        """Fichiers (non supprimés) d'un dossier, éventuellement restreints à `names`, pagination comprise."""
+        q = "'{folder}' in parents and trashed = false".format(folder=drive_q_escape(str(folder_id)))
+        if names:
+            q += " and (" + " or ".join(f"name = '{drive_q_escape(str(n))}'" for n in names) + ")"
+        params = {"q": q, "fields": f"nextPageToken, files({FILE_FIELDS})", "pageSize": 1000}
+        files = []
+        while True:
+            resp = self.request("GET", DRIVE_FILES_URL, params=params, timeout=30)
+            resp.raise_for_status()
+            data = resp.json()
+            files.extend(data.get("files", []))
+            if not data.get("nextPageToken"):
+                return files
+            params["pageToken"] = data["nextPageToken"]
+
+    def read_text(self, file_id: str, mime: str) -> Optional[str]:
+        """Contenu texte : téléchargement direct pour un .txt, export pour un Google Doc."""
+        if mime == "text/plain":
+            r = self.request("GET", f"{DRIVE_FILES_URL}/{file_id}", params={"alt": "media"})
+        else:
+            r = self.request("GET", f"{DRIVE_FILES_URL}/{file_id}/export", params={"mimeType": "text/plain"})
+        if r.status_code != 200:
+            return None
+        return r.content.decode("utf-8", errors="replace")
+
+    def read_text_by_name(self, name: str, folder_id: str) -> Optional[str]:
+        meta = self.find_file(name, folder_id)
+        if meta is None:
+            return None
+        text = self.read_text(meta["id"], meta["mimeType"])
+        if text is None:
+            # ID mémorisé périmé (fichier remplacé) : on résout à nouveau
+            meta = self.find_file(name, folder_id, refresh=True)
+            if meta is not None:
+                text = self.read_text(meta["id"], meta["mimeType"])
+        return text
+
+    # ————————————————————————
+    # Écriture
+    # ————————————————————————
+    def upload(self, name: str, content: bytes, mime_type: str, parent_id: str) -> requests.Response:
+        """Upload multipart (métadonnées + contenu) en une requête."""
+        metadata = {"name": name, "parents": [parent_id]}
+        files = {
+            "metadata": ("metadata", json.dumps(metadata), "application/json; charset=UTF-8"),
+            "file": (name, content, mime_type),
+        }
+        return self.request(
+            "POST", DRIVE_UPLOAD_URL,
+            scope=SCOPE_DRIVE,
+            params={"uploadType": "multipart", "fields": "id"},
+            files=files,
+        )
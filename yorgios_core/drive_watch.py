@@ -0,0 +1,100 @@
+# yorgios_core/drive_watch.py
+# Surveillance du flux de modifications Drive (changes.list) : un appel léger
+# toutes les quelques secondes indique quels fichiers ont bougé, ce qui permet
+# d'invalider exactement les caches concernés — y compris quand le gérant
+# modifie un sheet directement dans Google Sheets.
+from __future__ import annotations
+import threading
+import time
+from typing import Callable, Iterable, Optional, Set
+
+from .drive import DriveClient
+
+DRIVE_CHANGES_URL = "https://www.googleapis.com/drive/v3/changes"
+CHANGE_FIELDS = "nextPageToken, newStartPageToken, changes(fileId, removed, file(parents))"
+
+
+class DriveChangeWatcher:
+    """
+    Part du `startPageToken` courant puis interroge `changes.list` toutes les
+    `poll` secondes. Les changements portant sur un fichier surveillé (par ID)
+    ou sur un fichier d'un dossier surveillé sont remontés à `on_change(ids)`,
+    où les IDs de dossiers remplacent ceux de leurs fichiers.
+    Le jeton n'est pas persisté : au redémarrage les caches sont vides de toute façon.
+    """
+
+    def __init__(
+        self, client: DriveClient, file_ids: Iterable[str], folder_ids: Iterable[str],
+        on_change: Callable[[Set[str]], None], poll: float = 10.0,
+    ):
+        self.client = client
+        self.file_ids = set(file_ids)
+        self.folder_ids = set(folder_ids)
+        self.on_change = on_change
+        self.poll = poll
+        self.last_ok: float = 0.0          # time.time() du dernier sondage réussi
+        self.last_error: Optional[str] = None
+        self._token: Optional[str] = None
+        self._started = False
+
+    def healthy(self) -> bool:
+        """Vrai si le flux a répondu récemment : les caches peuvent alors vivre longtemps."""
+        return bool(self.last_ok) and time.time() - self.last_ok < 3 * self.poll
+
+    def _get(self, url: str, params: dict) -> dict:
+        resp = self.client.request("GET", url, params=params, timeout=30)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _start_token(self) -> str:
+        data = self._get(f"{DRIVE_CHANGES_URL}/startPageToken", {"supportsAllDrives": "true"})
+        return data["startPageToken"]
+
+    def check(self) -> Set[str]:
+        """Un sondage : renvoie (et signale) les IDs surveillés modifiés depuis le précédent."""
+        if self._token is None:
+            self._token = self._start_token()
+            self.last_ok = time.time()
+            return set()
+
+        touched: Set[str] = set()
+        token = self._token
+        while True:
+            data = self._get(DRIVE_CHANGES_URL, {
+                "pageToken": token,
+                "fields": CHANGE_FIELDS,
+                "pageSize": 1000,
+                "includeItemsFromAllDrives": "true",
+                "supportsAllDrives": "true",
+            })
+            for ch in data.get("changes", []):
+                fid = ch.get("fileId")
+                if fid in self.file_ids:
+                    touched.add(fid)
+                parents = set((ch.get("file") or {}).get("parents") or [])
+                touched |= parents & self.folder_ids
+            if data.get("nextPageToken"):
+                token = data["nextPageToken"]
+                continue
+            self._token = data.get("newStartPageToken", token)
+            break
+
+        self.last_ok = time.time()
+        if touched:
+            self.on_change(touched)
+        return touched
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.check()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            time.sleep(self.poll)
+
+    def start(self) -> "DriveChangeWatcher":
+        if not self._started:
+            self._started = True
+            threading.Thread(target=self._run, name="drive-changes", daemon=True).start()
+        return self
@@ -0,0 +1,218 @@
+# yorgios_core/fefo.py
+# Index FEFO (premier périmé, premier sorti) commun au Stockage Frigo et à la
+# Vitrine : les lots sont gardés triés par DLC et mis à jour par différence avec
+# la dernière grille lue (seules les lignes nouvelles sont parsées), si bien que
+# « quoi utiliser / vendre en premier » ne coûte plus qu'une lecture de liste.
+from __future__ import annotations
+import itertools
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .idempotency import REQ_ID_COLUMN
+
+SOURCE_FRIGO = "frigo"
+SOURCE_VITRINE = "vitrine"
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%Y/%m/%d")
+
+
+def parse_dlc(value) -> Optional[date]:
+    s = str(value or "").strip()
+    if not s:
+        return None
+    s = s.split(" ")[0].split("T")[0]
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+def product_key(name: str) -> str:
+    s = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode("ascii")
+    return " ".join(s.lower().split())
+
+def _norm_col(c: str) -> str:
+    return product_key(c).replace(" ", "_")
+
+
+@dataclass(frozen=True)
+class Lot:
+    source: str          # SOURCE_FRIGO ou SOURCE_VITRINE
+    emplacement: str     # nom du frigo, ou « Vitrine »
+    produit: str
+    quantite: str
+    dlc: Optional[date]  # None : DLC absente ou illisible (rangé en dernier)
+    ligne: int           # n° de ligne Sheets
+
+    def jours_restants(self, today: Optional[date] = None) -> Optional[int]:
+        return None if self.dlc is None else (self.dlc - (today or date.today())).days
+
+    def as_dict(self, today: Optional[date] = None) -> dict:
+        return {
+            "Produit": self.produit,
+            "Emplacement": self.emplacement,
+            "Quantité": self.quantite,
+            "DLC": self.dlc.isoformat() if self.dlc else "",
+            "Jours restants": self.jours_restants(today),
+        }
+
+
+# Lecture d'une ligne selon la source : (lot | None si la ligne n'est pas en stock)
+def _frigo_lot(cols: Dict[str, int], row: Sequence[str], ligne: int) -> Optional[Lot]:
+    def get(name):
+        i = cols.get(name)
+        return str(row[i]).strip() if i is not None and i < len(row) else ""
+    article = get("article")
+    if not article:
+        return None
+    return Lot(SOURCE_FRIGO, get("frigo"), article, get("quantite"), parse_dlc(get("dlc")), ligne)
+
+def _vitrine_lot(cols: Dict[str, int], row: Sequence[str], ligne: int) -> Optional[Lot]:
+    def get(name):
+        i = cols.get(name)
+        return str(row[i]).strip() if i is not None and i < len(row) else ""
+    produit = get("produit")
+    if not produit or get("date_retrait"):
+        return None
+    return Lot(SOURCE_VITRINE, "Vitrine", produit, get("quantite") or "1", parse_dlc(get("dlc")), ligne)
+
+_READERS = {SOURCE_FRIGO: _frigo_lot, SOURCE_VITRINE: _vitrine_lot}
+
+
+def _sort_key(lot: Lot) -> tuple:
+    return (lot.dlc or date.max, product_key(lot.produit), lot.source, lot.emplacement)
+
+
+class FefoIndex:
+    """
+    `sync(source, valeurs)` avec la grille brute de l'onglet (en-tête en tête) :
+    les lignes disparues sortent de l'index, les nouvelles y entrent, le reste
+    n'est pas reparsé. Une grille inchangée (même objet, cas d'un hit de cache)
+    ne coûte rien. Les listes restent triées par (DLC, produit, source…), les
+    lots sans DLC lisible en dernier. Requêtes et `sync` partagent le même
+    verrou : une session ne lit jamais une liste en cours de mise à jour.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._seen: Dict[str, object] = {}                    # source → dernière grille vue
+        self._headers: Dict[str, tuple] = {}
+        self._rows: Dict[str, Dict[tuple, Optional[tuple]]] = {}  # source → clé de ligne → entrée
+        self._order: List[tuple] = []                         # (clé de tri, n°, lot)
+        self._by_product: Dict[str, List[tuple]] = {}
+
+    # ————————————————————————
+    # Mise à jour
+    # ————————————————————————
+    def _insert(self, lot: Lot) -> tuple:
+        entry = (_sort_key(lot), next(self._seq), lot)
+        insort(self._order, entry)
+        insort(self._by_product.setdefault(product_key(lot.produit), []), entry)
+        return entry
+
+    def _remove(self, entry: tuple) -> None:
+        pkey = product_key(entry[2].produit)
+        for lst in (self._order, self._by_product.get(pkey, [])):
+            i = bisect_left(lst, entry)
+            if i < len(lst) and lst[i] is entry:
+                del lst[i]
+        if not self._by_product.get(pkey):
+            self._by_product.pop(pkey, None)
+
+    def sync(self, source: str, values) -> Tuple[int, int]:
+        """Met l'index à jour pour `source` ; renvoie (lots ajoutés, lots retirés)."""
+        with self._lock:
+            if values is not None and self._seen.get(source) is values:
+                return 0, 0
+            grid = list(values or [])
+            header = tuple(_norm_col(c) for c in grid[0]) if grid else ()
+            current = self._rows.setdefault(source, {})
+            removed = 0
+            if header != self._headers.get(source):
+                # colonnes changées : toutes les lignes sont relues
+                for entry in current.values():
+                    if entry is not None:
+                        self._remove(entry)
+                        removed += 1
+                current.clear()
+                self._headers[source] = header
+            cols = {c: i for i, c in enumerate(header)}
+            rid_col = cols.get(_norm_col(REQ_ID_COLUMN))
+
+            # clé d'une ligne : son contenu et son rang parmi les lignes identiques.
+            # Le n° de ligne n'en fait pas partie : une suppression plus haut
+            # décale les lignes suivantes sans qu'elles soient reparsées.
+            keys, occurrences = [], Counter()
+            for row in grid[1:]:
+                row = tuple(row)
+                keys.append((row, occurrences[row]))
+                occurrences[row] += 1
+
+            wanted = set(keys)
+            for k in [k for k in current if k not in wanted]:
+                entry = current.pop(k)
+                if entry is not None:
+                    self._remove(entry)
+                    removed += 1
+
+            added, ids = 0, set()
+            read = _READERS[source]
+            for ligne, k in enumerate(keys, start=2):
+                row = k[0]
+                rid = str(row[rid_col]).strip() if rid_col is not None and rid_col < len(row) else ""
+                duplicate = bool(rid) and rid in ids          # doublon d'un ajout rejoué
+                ids.add(rid)
+                entry = current.get(k, ...)
+                if entry is ...:
+                    lot = None if duplicate else read(cols, row, ligne)
+                    current[k] = self._insert(lot) if lot is not None else None
+                    added += lot is not None
+                elif entry is not None and (duplicate or entry[2].ligne != ligne):
+                    self._remove(entry)
+                    current[k] = None if duplicate else self._insert(replace(entry[2], ligne=ligne))
+            self._seen[source] = values
+            return added, removed
+
+    # ————————————————————————
+    # Requêtes
+    # ————————————————————————
+    def first(self, n: Optional[int] = None, sources: Iterable[str] = ()) -> List[Lot]:
+        """Les lots à utiliser en premier, toutes sources confondues (ou limitées à `sources`)."""
+        sources = set(sources)
+        out = []
+        with self._lock:
+            for entry in self._order:
+                if sources and entry[2].source not in sources:
+                    continue
+                out.append(entry[2])
+                if n is not None and len(out) >= n:
+                    break
+        return out
+
+    def expiring(self, until: date) -> List[Lot]:
+        """Lots dont la DLC tombe au plus tard `until` (DLC dépassées comprises)."""
+        with self._lock:
+            i = bisect_left(self._order, ((until + timedelta(days=1),),))
+            return [entry[2] for entry in self._order[:i] if entry[2].dlc is not None]
+
+    def for_product(self, name: str) -> List[Lot]:
+        """Lots d'un produit (casse et accents ignorés), dans l'ordre FEFO."""
+        with self._lock:
+            return [entry[2] for entry in self._by_product.get(product_key(name), [])]
+
+    def products(self) -> List[str]:
+        """Un libellé par produit présent, trié par nom."""
+        with self._lock:
+            labels = [lst[0][2].produit for lst in self._by_product.values()]
+        return sorted(labels, key=product_key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._order)
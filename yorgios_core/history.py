@@ -0,0 +1,124 @@
+# yorgios_core/history.py
+from __future__ import annotations
+import math
+import unicodedata
+from typing import Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100]
+
+
+# ————————————————————————
+# Découpage côté serveur (pur pandas, testable sans Streamlit)
+# ————————————————————————
+def _fold(s: str) -> str:
+    s = unicodedata.normalize("NFKD", str(s or "")).encode("ascii", "ignore").decode("ascii")
+    return s.strip().lower()
+
+def search_text(df: pd.DataFrame) -> pd.Series:
+    """Texte concaténé et sans accents de chaque ligne, pour le filtre plein texte."""
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    return df.astype(str).agg(" ".join, axis=1).map(_fold)
+
+def page_frame(
+    df: pd.DataFrame,
+    query: str = "",
+    sort_col: Optional[str] = None,
+    ascending: bool = True,
+    page: int = 1,
+    page_size: int = 50,
+    haystack: Optional[pd.Series] = None,
+) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Filtre, trie puis découpe `df` ; seule la page demandée est renvoyée.
+    Retourne (page, nb_lignes_filtrées, nb_pages).
+    """
+    q = _fold(query)
+    if q:
+        if haystack is None:
+            haystack = search_text(df)
+        mask = pd.Series(True, index=df.index)
+        for term in q.split():
+            mask &= haystack.str.contains(term, regex=False)
+        df = df[mask]
+
+    total = len(df)
+    n_pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, int(page)), n_pages)
+
+    if sort_col and sort_col in df.columns:
+        df = df.sort_values(sort_col, ascending=ascending, kind="stable", na_position="last")
+
+    start = (page - 1) * page_size
+    return df.iloc[start : start + page_size], total, n_pages
+
+
+# ————————————————————————
+# Composant Streamlit : historique paginé
+# ————————————————————————
+def render_history_table(
+    df: pd.DataFrame,
+    key: str,
+    default_sort: Optional[str] = None,
+    default_ascending: bool = False,
+    hidden_cols: Sequence[str] = (),
+    haystack: Optional[pd.Series] = None,
+) -> None:
+    """
+    Affiche `df` page par page : filtre, tri et découpage se font ici, seul le
+    contenu de la page part vers le navigateur. L’état (page, tri, filtre) est
+    gardé dans la session sous le préfixe `key`.
+    """
+    cols = [c for c in df.columns if c not in hidden_cols]
+    if hidden_cols:
+        df = df[cols]
+
+    k_page = f"{key}__page"
+    k_sig  = f"{key}__sig"
+
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    with c1:
+        query = st.text_input("🔎 Filtrer", key=f"{key}__q", placeholder="produit, date, valeur…")
+    with c2:
+        sort_idx = cols.index(default_sort) if default_sort in cols else 0
+        sort_col = st.selectbox("Trier par", cols, index=sort_idx, key=f"{key}__sort") if cols else None
+    with c3:
+        ordre = st.selectbox(
+            "Ordre", ["↓", "↑"], index=0 if not default_ascending else 1, key=f"{key}__asc"
+        )
+    with c4:
+        page_size = st.selectbox("Lignes", PAGE_SIZES, index=1, key=f"{key}__size")
+
+    # nouveau filtre / tri → retour en page 1
+    sig = (query, sort_col, ordre, page_size)
+    if st.session_state.get(k_sig) != sig:
+        st.session_state[k_sig] = sig
+        st.session_state[k_page] = 1
+
+    page_df, total, n_pages = page_frame(
+        df,
+        query=query,
+        sort_col=sort_col,
+        ascending=(ordre == "↑"),
+        page=st.session_state.get(k_page, 1),
+        page_size=page_size,
+        haystack=haystack,
+    )
+    page = min(max(1, st.session_state.get(k_page, 1)), n_pages)
+
+    st.dataframe(page_df, use_container_width=True)
+
+    p1, p2, p3 = st.columns([1, 3, 1])
+    with p1:
+        if st.button("← Précédent", key=f"{key}__prev", disabled=page <= 1, use_container_width=True):
+            st.session_state[k_page] = page - 1
+            st.rerun()
+    with p2:
+        st.caption(f"Page {page} / {n_pages} • {total} ligne(s)")
+    with p3:
+        if st.button("Suivant →", key=f"{key}__next", disabled=page >= n_pages, use_container_width=True):
+            st.session_state[k_page] = page + 1
+            st.rerun()
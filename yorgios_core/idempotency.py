@@ -0,0 +1,87 @@
+# yorgios_core/idempotency.py
+# Ajouts idempotents : chaque ligne ajoutée porte un identifiant de requête dans
+# une colonne masquée. Un ajout rejoué (timeout réseau, double clic) ne recrée
+# pas la ligne, et les doublons éventuels sont écartés à la lecture.
+from __future__ import annotations
+import uuid
+from typing import List, Sequence
+
+import pandas as pd
+
+# préfixe « __ » : colonne ignorée par les rapports PDF et les exports
+REQ_ID_COLUMN = "__req_id"
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def ensure_id_column(ws) -> int:
+    """Index (1-based) de la colonne d'identifiants ; la crée et la masque au besoin."""
+    header = ws.row_values(1)
+    if REQ_ID_COLUMN in header:
+        return header.index(REQ_ID_COLUMN) + 1
+    col = len(header) + 1
+    if ws.col_count < col:
+        ws.add_cols(col - ws.col_count)
+    ws.update_cell(1, col, REQ_ID_COLUMN)
+    ws.spreadsheet.batch_update({"requests": [{
+        "updateDimensionProperties": {
+            "range": {"sheetId": ws.id, "dimension": "COLUMNS", "startIndex": col - 1, "endIndex": col},
+            "properties": {"hiddenByUser": True},
+            "fields": "hiddenByUser",
+        }
+    }]})
+    return col
+
+
+def with_request_id(row: Sequence, col: int, req_id: str) -> list:
+    """Ligne complétée jusqu'à la colonne `col` (1-based), identifiant placé dedans."""
+    r = [str(v) for v in row]
+    if len(r) < col:
+        r.extend([""] * (col - len(r)))
+    r[col - 1] = req_id
+    return r
+
+
+def append_unique(ws, rows: Sequence[Sequence], ids: Sequence[str], value_input_option: str = "USER_ENTERED") -> int:
+    """
+    Ajoute les lignes dont l'identifiant n'est pas encore présent dans l'onglet.
+    Sûr à rejouer autant de fois que nécessaire ; renvoie le nombre de lignes ajoutées.
+    """
+    col = ensure_id_column(ws)
+    existing = set(ws.col_values(col)[1:])
+    todo = [with_request_id(r, col, i) for r, i in zip(rows, ids) if i not in existing]
+    if todo:
+        ws.append_rows(todo, value_input_option=value_input_option)
+    return len(todo)
+
+
+# ————————————————————————
+# Déduplication à la lecture
+# ————————————————————————
+def dedup_values(values) -> List[list]:
+    """Valeurs brutes (en-tête en tête) sans les lignes dont l'identifiant est déjà apparu."""
+    if not values:
+        return []
+    header = list(values[0])
+    if REQ_ID_COLUMN not in header:
+        return [list(r) for r in values]
+    c = header.index(REQ_ID_COLUMN)
+    seen, out = set(), [header]
+    for row in values[1:]:
+        rid = row[c] if c < len(row) else ""
+        if rid:
+            if rid in seen:
+                continue
+            seen.add(rid)
+        out.append(list(row))
+    return out
+
+
+def dedup_frame(df: pd.DataFrame, column: str = REQ_ID_COLUMN) -> pd.DataFrame:
+    """Même règle sur un DataFrame ; l'index (donc le n° de ligne d'origine) est conservé."""
+    if column not in df.columns:
+        return df
+    ids = df[column].astype(str).str.strip()
+    return df[~(ids.ne("") & ids.duplicated())]
@@ -0,0 +1,455 @@
+# yorgios_core/journal.py
+# Journal local des écritures (SQLite en mode WAL). Toute modification des
+# Google Sheets y est d'abord enregistrée — l'écran répond sans attendre l'API —
+# puis un thread de fond la rejoue, dans l'ordre, onglet par onglet.
+# Les lectures superposent les écritures encore en attente à l'instantané en cache.
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
+
+from .concurrency import WriteConflict, merge_grid, merge_records
+from .idempotency import REQ_ID_COLUMN, append_unique, with_request_id
+
+# ——— Opérations supportées (payload JSON)
+OP_APPEND_UNIQUE  = "append_unique"    # {"rows": [[...]], "ids": ["…"], ...} : ajout idempotent (colonne __req_id)
+OP_UPDATE_CELLS   = "update_cells"     # {"cells": [{"range": "B4", "values": [["x"]]}], "value_input_option": "..."}
+OP_REPLACE_VALUES = "replace_values"   # {"column": "Lien photo", "default_col": 7, "mapping": {ancien: nouveau}}
+OP_MERGE_CELLS    = "merge_cells"      # {"changes": [CellChange.as_dict()], "key_col": 0} : fusion à trois voies
+OP_MERGE_RECORDS  = "merge_records"    # {"columns": [...], "base": [[...]], "new": [[...]]} : idem, sans clé
+OPS = {OP_APPEND_UNIQUE, OP_UPDATE_CELLS, OP_REPLACE_VALUES, OP_MERGE_CELLS, OP_MERGE_RECORDS}
+
+KEEP_APPLIED_S = 7 * 24 * 3600   # entrées appliquées gardées une semaine (diagnostic)
+LEASE_S        = 300             # entrée prise par un processus ; reprise par un autre passé ce délai
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    key        TEXT NOT NULL UNIQUE,
+    created    REAL NOT NULL,
+    device     TEXT NOT NULL DEFAULT '',
+    sheet_id   TEXT NOT NULL,
+    worksheet  TEXT NOT NULL,
+    op         TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    state      TEXT NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    next_try   REAL NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    applied_at REAL,
+    lease      REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_pending ON entries (state, sheet_id, worksheet, seq);
+CREATE TABLE IF NOT EXISTS drafts (
+    device  TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (device, name)
+);
+"""
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    seq: int
+    key: str
+    created: float
+    device: str
+    sheet_id: str
+    worksheet: str
+    op: str
+    payload: dict
+    state: str
+    attempts: int
+    last_error: str
+
+    @property
+    def target(self) -> Tuple[str, str]:
+        return self.sheet_id, self.worksheet
+
+
+# ————————————————————————
+# Application d'une entrée sur un onglet gspread
+# ————————————————————————
+def _column_index(ws, name: str, default: int) -> int:
+    headers = ws.row_values(1)
+    return headers.index(name) + 1 if name in headers else default
+
+def apply_entry(ws, op: str, payload: dict) -> None:
+    vio = payload.get("value_input_option", "USER_ENTERED")
+    if op == OP_APPEND_UNIQUE:
+        append_unique(ws, payload["rows"], payload["ids"], value_input_option=vio)
+    elif op == OP_UPDATE_CELLS:
+        if payload["cells"]:
+            ws.batch_update(payload["cells"], value_input_option=vio)
+    elif op == OP_REPLACE_VALUES:
+        col = _column_index(ws, payload["column"], payload.get("default_col", 1))
+        mapping = payload["mapping"]
+        data = [
+            {"range": rowcol_to_a1(i, col), "values": [[mapping[v]]]}
+            for i, v in enumerate(ws.col_values(col), start=1)
+            if v in mapping
+        ]
+        if data:
+            ws.batch_update(data, value_input_option=vio)
+    elif op == OP_MERGE_CELLS:
+        cells, new_rows = merge_grid(ws.get_all_values(), payload["changes"], payload.get("key_col", 0))
+        if cells:
+            ws.batch_update(cells, value_input_option=vio)
+        if new_rows:
+            ws.append_rows(new_rows, value_input_option=vio)
+    elif op == OP_MERGE_RECORDS:
+        columns = payload["columns"]
+        values = ws.get_all_values()
+        current = _records(values, columns)
+        merged = merge_records(current, payload["base"], payload["new"])
+        if merged == current:
+            return   # déjà appliqué (rejeu) ou sans effet
+        # une seule écriture, complétée par des cellules vides jusqu'à l'ancienne
+        # taille : jamais de clear() préalable, qu'un timeout laisserait sans suite
+        width = max([len(columns)] + [len(r) for r in values])
+        grid = [list(columns)] + merged
+        grid += [[]] * (len(values) - len(grid))
+        ws.update([r + [""] * (width - len(r)) for r in grid], "A1", value_input_option=vio)
+    else:
+        raise ValueError(f"Opération de journal inconnue : {op}")
+
+def is_permanent(e: Exception) -> bool:
+    """
+    Erreur qu'un nouvel essai ne corrigera pas : requête refusée par Google (4xx :
+    plage invalide, onglet ou droits manquants…) ou payload illisible. Réseau,
+    quota (429) et 5xx sont temporaires : l'entrée est retentée sans limite.
+    """
+    if isinstance(e, KeyError):
+        return True
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in (408, 429)
+
+def _records(values, columns) -> List[list]:
+    """Lignes de `values` réduites aux colonnes `columns` (par nom d'en-tête)."""
+    if not values:
+        return []
+    header = [h.strip().lower().replace(" ", "_") for h in values[0]]
+    idx = [header.index(c) if c in header else None for c in columns]
+    return [
+        [row[i] if i is not None and i < len(row) else "" for i in idx]
+        for row in values[1:]
+        if any(v.strip() for v in row)
+    ]
+
+
+# ————————————————————————
+# Superposition des écritures en attente (lecture « read your writes »)
+# ————————————————————————
+def overlay_values(values: Iterable[Iterable[str]], entries: Iterable[JournalEntry]) -> List[List[str]]:
+    """Grille de valeurs telle qu'elle sera une fois les entrées appliquées (dans l'ordre)."""
+    grid = [list(r) for r in values]
+    for e in entries:
+        p = e.payload
+        if e.op == OP_APPEND_UNIQUE:
+            if not grid:
+                grid.append([])
+            if REQ_ID_COLUMN not in grid[0]:
+                grid[0] = grid[0] + [REQ_ID_COLUMN]
+            col = grid[0].index(REQ_ID_COLUMN) + 1
+            seen = {r[col - 1] for r in grid[1:] if len(r) >= col}
+            grid.extend(with_request_id(r, col, i) for r, i in zip(p["rows"], p["ids"]) if i not in seen)
+        elif e.op == OP_UPDATE_CELLS:
+            for cell in p["cells"]:
+                r0, c0 = a1_to_rowcol(cell["range"].split(":")[0])
+                for dr, row_vals in enumerate(cell["values"]):
+                    for dc, v in enumerate(row_vals):
+                        r, c = r0 + dr, c0 + dc
+                        while len(grid) < r:
+                            grid.append([])
+                        row = grid[r - 1]
+                        if len(row) < c:
+                            row.extend([""] * (c - len(row)))
+                        row[c - 1] = str(v)
+        elif e.op == OP_MERGE_CELLS and grid:
+            cells, new_rows = merge_grid(grid, p["changes"], p.get("key_col", 0), strict=False)
+            for cell in cells:
+                r, c = a1_to_rowcol(cell["range"])
+                row = grid[r - 1]
+                if len(row) < c:
+                    row.extend([""] * (c - len(row)))
+                row[c - 1] = cell["values"][0][0]
+            grid.extend(new_rows)
+        elif e.op == OP_MERGE_RECORDS:
+            merged = merge_records(_records(grid, p["columns"]), p["base"], p["new"], strict=False)
+            grid = [list(p["columns"])] + merged
+        elif e.op == OP_REPLACE_VALUES and grid:
+            header = grid[0]
+            name = p["column"]
+            c = header.index(name) if name in header else p.get("default_col", 1) - 1
+            for row in grid:
+                if c < len(row) and row[c] in p["mapping"]:
+                    row[c] = p["mapping"][row[c]]
+    width = max((len(r) for r in grid), default=0)
+    return [r + [""] * (width - len(r)) for r in grid]
+
+
+# ————————————————————————
+# Journal
+# ————————————————————————
+class WriteJournal:
+    """
+    `submit()` n'écrit que dans SQLite (quelques ms) et réveille le worker.
+    Le worker rejoue les entrées par ordre de `seq` ; une entrée en échec
+    bloque les suivantes du même onglet (l'ordre est préservé) mais pas les
+    autres onglets, et est retentée avec un délai croissant (plafonné à 5 min),
+    aussi longtemps que la panne dure. Seule une erreur permanente (cf.
+    `is_permanent`) la passe en « failed » ; `retry_failed()` la remet en file.
+    La clé `key` rend la soumission idempotente (double clic, rerun).
+    `on_applied(entry)` est appelé après chaque application réussie.
+
+    Plusieurs répliques peuvent partager le même fichier (volume commun) : une
+    entrée est prise par un UPDATE conditionnel (état « running » + bail de
+    LEASE_S s) avant d'être appliquée, si bien qu'une seule réplique l'applique ;
+    celle d'un processus mort est reprise à l'expiration du bail. Le volume doit
+    gérer les verrous SQLite (disque local au nœud) ; sinon, un JOURNAL_PATH
+    par réplique.
+    """
+
+    def __init__(
+        self, path: str, opener: Callable[[str], object],
+        on_applied: Optional[Callable[[JournalEntry], None]] = None,
+        poll: float = 15.0,
+    ):
+        self.path = path
+        self.opener = opener
+        self.on_applied = on_applied
+        self.poll = poll
+        self.last_error: Optional[str] = None
+        self._wake = threading.Event()
+        self._replay_lock = threading.Lock()
+        self._worksheets: Dict[Tuple[str, str], object] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            cols = {row[1] for row in db.execute("PRAGMA table_info(entries)")}
+            if "lease" not in cols:   # journal créé avant les baux
+                db.execute("ALTER TABLE entries ADD COLUMN lease REAL NOT NULL DEFAULT 0")
+
+    @contextmanager
+    def _conn(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA synchronous=NORMAL")
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _entry(row) -> JournalEntry:
+        seq, key, created, device, sheet_id, ws, op, payload, state, attempts, last_error = row
+        return JournalEntry(seq, key, created, device, sheet_id, ws, op, json.loads(payload), state, attempts, last_error)
+
+    _COLS = "seq, key, created, device, sheet_id, worksheet, op, payload, state, attempts, last_error"
+
+    # ————————————————————————
+    # Écriture
+    # ————————————————————————
+    def submit(
+        self, sheet_id: str, worksheet: str, op: str, payload: dict,
+        key: Optional[str] = None, device: str = "",
+    ) -> str:
+        key = key or uuid.uuid4().hex
+        with self._conn() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO entries (key, created, device, sheet_id, worksheet, op, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, time.time(), device, sheet_id, worksheet, op, json.dumps(payload, ensure_ascii=False)),
+            )
+        self._wake.set()
+        return key
+
+    # ————————————————————————
+    # Lecture
+    # ————————————————————————
+    def pending(self, sheet_id: Optional[str] = None, worksheet: Optional[str] = None) -> List[JournalEntry]:
+        """Entrées pas encore appliquées (en attente ou en cours d'application)."""
+        sql = f"SELECT {self._COLS} FROM entries WHERE state IN ('pending', 'running')"
+        args: list = []
+        if sheet_id is not None:
+            sql += " AND sheet_id = ?"
+            args.append(sheet_id)
+        if worksheet is not None:
+            sql += " AND worksheet = ?"
+            args.append(worksheet)
+        with self._conn() as db:
+            rows = db.execute(sql + " ORDER BY seq", args).fetchall()
+        return [self._entry(r) for r in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Nombre d'entrées par état ; « pending » inclut celles en cours d'application."""
+        with self._conn() as db:
+            counts = dict(db.execute("SELECT state, COUNT(*) FROM entries GROUP BY state").fetchall())
+        if "running" in counts:
+            counts["pending"] = counts.get("pending", 0) + counts.pop("running")
+        return counts
+
+    def conflicts(self) -> List[JournalEntry]:
+        with self._conn() as db:
+            rows = db.execute(f"SELECT {self._COLS} FROM entries WHERE state = 'conflict' ORDER BY seq").fetchall()
+        return [self._entry(r) for r in rows]
+
+    def retry_failed(self) -> int:
+        """Remet en file les entrées refusées (après correction de l'onglet) ; renvoie leur nombre."""
+        with self._conn() as db:
+            n = db.execute(
+                "UPDATE entries SET state = 'pending', next_try = 0, attempts = 0 WHERE state = 'failed'"
+            ).rowcount
+        self._wake.set()
+        return n
+
+    def dismiss(self, seq: int) -> None:
+        """Conflit pris en compte par l'utilisateur : l'entrée est archivée."""
+        with self._conn() as db:
+            db.execute(
+                "UPDATE entries SET state = 'dismissed', applied_at = ? WHERE seq = ? AND state = 'conflict'",
+                (time.time(), seq),
+            )
+
+    def overlay(self, sheet_id: str, worksheet: str, values) -> list:
+        """Valeurs de l'onglet avec les écritures en attente ; renvoie `values` inchangé s'il n'y en a pas."""
+        entries = self.pending(sheet_id, worksheet)
+        return overlay_values(values, entries) if entries else values
+
+    # ————————————————————————
+    # Brouillons par appareil (ex. buffer de départ livraison)
+    # ————————————————————————
+    def save_draft(self, device: str, name: str, value) -> None:
+        with self._conn() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO drafts (device, name, payload, updated) VALUES (?, ?, ?, ?)",
+                (device, name, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+
+    def load_draft(self, device: str, name: str, default=None):
+        with self._conn() as db:
+            row = db.execute("SELECT payload FROM drafts WHERE device = ? AND name = ?", (device, name)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def clear_draft(self, device: str, name: str) -> None:
+        with self._conn() as db:
+            db.execute("DELETE FROM drafts WHERE device = ? AND name = ?", (device, name))
+
+    # ————————————————————————
+    # Rejeu
+    # ————————————————————————
+    def _worksheet(self, sheet_id: str, title: str):
+        ws = self._worksheets.get((sheet_id, title))
+        if ws is None:
+            ws = self.opener(sheet_id).worksheet(title)
+            self._worksheets[(sheet_id, title)] = ws
+        return ws
+
+    def _claim(self, seq: int, now: float) -> bool:
+        """Prend l'entrée pour ce processus ; False si une autre réplique l'a déjà."""
+        with self._conn() as db:
+            cur = db.execute(
+                "UPDATE entries SET state = 'running', lease = ? "
+                "WHERE seq = ? AND (state = 'pending' OR (state = 'running' AND lease < ?))",
+                (now + LEASE_S, seq, now),
+            )
+            return cur.rowcount == 1
+
+    def replay(self) -> int:
+        """Une passe : applique les entrées dues, dans l'ordre. Renvoie le nombre d'entrées appliquées."""
+        with self._replay_lock:
+            now = time.time()
+            with self._conn() as db:
+                rows = db.execute(
+                    f"SELECT {self._COLS}, next_try, lease FROM entries "
+                    "WHERE state IN ('pending', 'running') ORDER BY seq"
+                ).fetchall()
+            blocked = set()
+            applied = 0
+            for row in rows:
+                entry, next_try, lease = self._entry(row[:-2]), row[-2], row[-1]
+                if entry.target in blocked:
+                    continue
+                if entry.state == "running" and lease >= now:
+                    # en cours chez une autre réplique : les suivantes de l'onglet attendent
+                    blocked.add(entry.target)
+                    continue
+                if next_try > now or not self._claim(entry.seq, now):
+                    blocked.add(entry.target)
+                    continue
+                try:
+                    apply_entry(self._worksheet(*entry.target), entry.op, entry.payload)
+                except WriteConflict as e:
+                    # conflit réel : rien n'a été écrit, inutile de réessayer ; l'onglet n'est pas bloqué
+                    self.last_error = f"{entry.worksheet} : {e}"
+                    with self._conn() as db:
+                        db.execute(
+                            "UPDATE entries SET state = 'conflict', last_error = ? WHERE seq = ?",
+                            (str(e)[:2000], entry.seq),
+                        )
+                    continue
+                except Exception as e:
+                    blocked.add(entry.target)
+                    self._worksheets.pop(entry.target, None)
+                    attempts = entry.attempts + 1
+                    state = "failed" if entry.op not in OPS or is_permanent(e) else "pending"
+                    self.last_error = f"{entry.worksheet} : {e}"
+                    with self._conn() as db:
+                        db.execute(
+                            "UPDATE entries SET attempts = ?, next_try = ?, last_error = ?, state = ? WHERE seq = ?",
+                            (attempts, time.time() + min(300, 2 * 2 ** (attempts - 1)), str(e)[:500], state, entry.seq),
+                        )
+                    continue
+                with self._conn() as db:
+                    db.execute(
+                        "UPDATE entries SET state = 'applied', applied_at = ?, last_error = '' WHERE seq = ?",
+                        (time.time(), entry.seq),
+                    )
+                applied += 1
+                if self.on_applied is not None:
+                    try:
+                        self.on_applied(entry)
+                    except Exception:
+                        pass
+            if applied:
+                with self._conn() as db:
+                    db.execute(
+                        "DELETE FROM entries WHERE state IN ('applied', 'dismissed') AND applied_at < ?",
+                        (time.time() - KEEP_APPLIED_S,),
+                    )
+            return applied
+
+    def _next_wakeup(self) -> float:
+        with self._conn() as db:
+            row = db.execute(
+                "SELECT MIN(CASE state WHEN 'running' THEN lease ELSE next_try END) "
+                "FROM entries WHERE state IN ('pending', 'running')"
+            ).fetchone()
+        if row[0] is None:
+            return self.poll
+        return max(0.2, min(self.poll, row[0] - time.time()))
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=self._next_wakeup())
+            self._wake.clear()
+            try:
+                self.replay()
+            except Exception as e:
+                self.last_error = str(e)
+
+    def start(self) -> "WriteJournal":
+        self._wake.set()  # rejoue ce qui restait d'un précédent processus
+        threading.Thread(target=self._run, name="write-journal", daemon=True).start()
+        return self
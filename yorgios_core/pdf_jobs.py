@@ -0,0 +1,111 @@
+# yorgios_core/pdf_jobs.py
+from __future__ import annotations
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Optional, Sequence
+
+import pandas as pd
+
+
+# ————————————————————————
+# Clé de cache : période + empreinte des données sources
+# ————————————————————————
+def frame_digest(df: Optional[pd.DataFrame]) -> str:
+    """Empreinte stable du contenu d’un DataFrame (colonnes + valeurs, index ignoré)."""
+    h = hashlib.blake2b(digest_size=16)
+    if df is None or df.empty:
+        h.update(b"<vide>")
+        if df is not None:
+            h.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+        return h.hexdigest()
+    h.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+def report_key(date_debut: date, date_fin: date, frames: Sequence[Optional[pd.DataFrame]]) -> str:
+    parts = [date_debut.isoformat(), date_fin.isoformat()] + [frame_digest(df) for df in frames]
+    return hashlib.blake2b("|".join(parts).encode("ascii"), digest_size=16).hexdigest()
+
+
+# ————————————————————————
+# Tâches de rendu en arrière-plan
+# ————————————————————————
+class PdfJob:
+    """Rendu en cours ou terminé ; `progress` est mis à jour par le thread de rendu."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.progress = 0.0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    def set_progress(self, value: float) -> None:
+        self.progress = value
+
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        if not self.done:
+            return None
+        return self.future.exception()
+
+    @property
+    def result(self) -> Optional[bytes]:
+        if not self.done or self.future.exception() is not None:
+            return None
+        return self.future.result()
+
+
+class PdfJobManager:
+    """
+    File de rendu PDF partagée par toutes les sessions.
+    Une même clé (période + données identiques) n’est rendue qu’une fois :
+    les exports répétés renvoient le résultat déjà en mémoire.
+    """
+
+    def __init__(self, max_workers: int = 2, max_results: int = 12):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf")
+        self._jobs: "OrderedDict[str, PdfJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_results = max_results
+
+    def get(self, key: str) -> Optional[PdfJob]:
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self._jobs.move_to_end(key)
+            return job
+
+    def submit(self, key: str, render: Callable[..., bytes], *args: Any, **kwargs: Any) -> PdfJob:
+        """Lance `render(*args, progress=…, **kwargs)` sauf si la même clé est déjà prête ou en cours."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.error is None:
+                self._jobs.move_to_end(key)
+                return job
+            job = PdfJob(key)
+            self._jobs[key] = job
+
+            def _run():
+                try:
+                    return render(*args, progress=job.set_progress, **kwargs)
+                finally:
+                    job.finished_at = time.time()
+
+            job.future = self._pool.submit(_run)
+            self._evict()
+            return job
+
+    def _evict(self) -> None:
+        # on ne garde que les N derniers rendus terminés (les PDF pèsent quelques Mo)
+        done = [k for k, j in self._jobs.items() if j.done]
+        for k in done[: max(0, len(done) - self._max_results)]:
+            self._jobs.pop(k, None)
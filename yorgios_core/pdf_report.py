@@ -0,0 +1,266 @@
+# yorgios_core/pdf_report.py
+from __future__ import annotations
+import math
+from functools import lru_cache
+from datetime import date, datetime
+from io import BytesIO
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+# ——— Mise en page (A4 paysage)
+PAGE_SIZE   = landscape(A4)
+MARGIN      = 1.5 * cm
+HEADER_H    = 2.6 * cm      # titre + période + titre de tableau
+FONT        = "Helvetica"
+FONT_BOLD   = "Helvetica-Bold"
+FONT_SIZE   = 7.5
+ROW_H       = 0.42 * cm
+CELL_PAD    = 0.12 * cm
+COL_MIN_W   = 1.4 * cm
+COL_MAX_W   = 7.0 * cm
+WIDTH_SAMPLE = 25           # nb de valeurs les plus longues mesurées par colonne
+
+# Helvetica (WinAnsi) n’a pas les emojis du sheet : on les traduit.
+_SYMBOLS = {"✅": "OK", "❌": "NON", "⛔️": "-", "⛔": "-", "️": ""}
+
+ProgressFn = Callable[[float], None]
+
+
+# ————————————————————————
+# Formatage des cellules
+# ————————————————————————
+def _pdf_safe(text: str) -> str:
+    for sym, rep in _SYMBOLS.items():
+        if sym in text:
+            text = text.replace(sym, rep)
+    return text.encode("cp1252", "ignore").decode("cp1252")
+
+def cell_text(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, (pd.Timestamp, datetime)):
+        if pd.isna(v):
+            return ""
+        if (v.hour, v.minute, v.second) == (0, 0, 0):
+            return v.strftime("%d/%m/%Y")
+        return v.strftime("%d/%m/%Y %H:%M")
+    if isinstance(v, date):
+        return v.strftime("%d/%m/%Y")
+    if isinstance(v, float) and math.isnan(v):
+        return ""
+    if v is pd.NaT:
+        return ""
+    return _pdf_safe(str(v).strip())
+
+@lru_cache(maxsize=8192)
+def _fit(text: str, width: float, font: str = FONT, size: float = FONT_SIZE) -> str:
+    """Coupe `text` avec « … » pour tenir dans `width` (seules les cellules trop longues paient)."""
+    if stringWidth(text, font, size) <= width:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if stringWidth(text[:mid] + "…", font, size) <= width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + "…"
+
+
+# ————————————————————————
+# Calcul de la mise en page d’un tableau (une seule fois par tableau)
+# ————————————————————————
+def column_widths(df: pd.DataFrame) -> List[float]:
+    """Largeur naturelle de chaque colonne, mesurée sur l’en-tête et les valeurs les plus longues."""
+    widths = []
+    for col in df.columns:
+        w = stringWidth(cell_text(col), FONT_BOLD, FONT_SIZE)
+        s = df[col]
+        if len(s):
+            lengths = s.map(lambda v: len(cell_text(v)))
+            for idx in lengths.nlargest(WIDTH_SAMPLE).index:
+                w = max(w, stringWidth(cell_text(s.at[idx]), FONT, FONT_SIZE))
+        widths.append(min(COL_MAX_W, max(COL_MIN_W, w + 2 * CELL_PAD + 1)))
+    return widths
+
+def column_bands(widths: Sequence[float], usable_w: float, repeat_first: bool = True) -> List[List[int]]:
+    """
+    Répartit les colonnes en « bandes » qui tiennent dans la largeur de page.
+    La première colonne (frigo, produit, date…) est répétée dans chaque bande.
+    """
+    n = len(widths)
+    if n == 0:
+        return []
+    if sum(widths) <= usable_w:
+        return [list(range(n))]
+    first = [0] if repeat_first and widths[0] < usable_w / 2 else []
+    start = 1 if first else 0
+    bands, current, used = [], list(first), sum(widths[i] for i in first)
+    for i in range(start, n):
+        if current != first and used + widths[i] > usable_w:
+            bands.append(current)
+            current, used = list(first), sum(widths[j] for j in first)
+        current.append(i)
+        used += widths[i]
+    bands.append(current)
+    return bands
+
+
+# ————————————————————————
+# Moteur PDF
+# ————————————————————————
+class PdfReport:
+    """
+    Rapport tabulaire écrit dans un tampon mémoire : pas de fichier temporaire,
+    donc deux exports simultanés ne se marchent plus dessus.
+    """
+
+    def __init__(self, title: str, subtitle: str = "", progress: Optional[ProgressFn] = None):
+        self.buf = BytesIO()
+        self.c = canvas.Canvas(self.buf, pagesize=PAGE_SIZE, pageCompression=1)
+        self.c.setTitle(title)
+        self.width, self.height = PAGE_SIZE
+        self.title = title
+        self.subtitle = subtitle
+        self.page_no = 0
+        self.progress = progress
+        self._rows_total = 0
+        self._rows_done = 0
+        self._layouts: dict = {}
+
+    def plan(self, frames: Sequence[Tuple[str, pd.DataFrame]]) -> None:
+        """Calcule la mise en page de chaque tableau et le volume total (barre de progression)."""
+        for _, df in frames:
+            if df is not None and not df.empty:
+                self._rows_total += len(df) * len(self._layout(df)[1])
+
+    def _tick(self, n_rows: int) -> None:
+        self._rows_done += n_rows
+        if self.progress and self._rows_total:
+            self.progress(min(1.0, self._rows_done / self._rows_total))
+
+    def _layout(self, df: pd.DataFrame) -> Tuple[List[float], List[List[int]]]:
+        cached = self._layouts.get(id(df))
+        if cached is not None:
+            return cached
+        usable_w = self.width - 2 * MARGIN
+        widths = column_widths(df)
+        bands = column_bands(widths, usable_w)
+        for band in bands:
+            # une bande trop large (colonne seule très longue) est resserrée à la page
+            total = sum(widths[i] for i in band)
+            if total > usable_w:
+                for i in band:
+                    widths[i] *= usable_w / total
+        self._layouts[id(df)] = (widths, bands)
+        return widths, bands
+
+    def _page_header(self, table_title: str) -> float:
+        self.page_no += 1
+        c = self.c
+        c.setFont(FONT_BOLD, 14)
+        c.drawCentredString(self.width / 2, self.height - MARGIN, _pdf_safe(self.title))
+        if self.subtitle:
+            c.setFont(FONT, 10)
+            c.drawCentredString(self.width / 2, self.height - MARGIN - 0.6 * cm, _pdf_safe(self.subtitle))
+        c.setFont(FONT_BOLD, 11)
+        c.drawString(MARGIN, self.height - MARGIN - 1.5 * cm, _pdf_safe(table_title))
+        c.setFont(FONT, 7)
+        c.setFillColor(colors.grey)
+        c.drawRightString(self.width - MARGIN, MARGIN / 2, f"Page {self.page_no}")
+        c.setFillColor(colors.black)
+        return self.height - MARGIN - HEADER_H
+
+    def _draw_row(self, y: float, cells: Sequence[str], xs: Sequence[float], ws: Sequence[float],
+                  bold: bool = False, fill=None) -> None:
+        c = self.c
+        if fill is not None:
+            c.setFillColor(fill)
+            c.rect(xs[0], y - ROW_H + 0.1 * cm, sum(ws), ROW_H, stroke=0, fill=1)
+            c.setFillColor(colors.black)
+        font = FONT_BOLD if bold else FONT
+        c.setFont(font, FONT_SIZE)
+        for text, x, w in zip(cells, xs, ws):
+            c.drawString(x + CELL_PAD, y - ROW_H + 0.22 * cm, _fit(text, w - 2 * CELL_PAD, font))
+
+    def add_table(self, title: str, df: Optional[pd.DataFrame]) -> None:
+        if df is None or df.empty:
+            return
+        widths, bands = self._layout(df)
+        usable_h = self.height - 2 * MARGIN - HEADER_H
+        rows_per_page = max(1, int(usable_h // ROW_H) - 1)  # -1 : ligne d’en-tête
+        headers = [cell_text(h) for h in df.columns]
+        n_bands = len(bands)
+
+        for b, band in enumerate(bands):
+            ws = [widths[i] for i in band]
+            xs, x = [], MARGIN
+            for w in ws:
+                xs.append(x)
+                x += w
+            band_title = title if n_bands == 1 else f"{title} — colonnes {b + 1}/{n_bands}"
+            head = [headers[i] for i in band]
+
+            y = None
+            row_on_page = 0
+            for n, row in enumerate(df.itertuples(index=False, name=None)):
+                if y is None or row_on_page >= rows_per_page:
+                    if y is not None:
+                        self._tick(row_on_page)
+                        self.c.showPage()
+                    suffix = "" if n == 0 else " (suite)"
+                    y = self._page_header(band_title + suffix)
+                    self._draw_row(y, head, xs, ws, bold=True, fill=colors.Color(0.85, 0.89, 0.93))
+                    y -= ROW_H
+                    row_on_page = 0
+                fill = colors.Color(0.96, 0.96, 0.96) if row_on_page % 2 else None
+                self._draw_row(y, [cell_text(row[i]) for i in band], xs, ws, fill=fill)
+                y -= ROW_H
+                row_on_page += 1
+            self._tick(row_on_page)
+            self.c.showPage()
+
+    def render(self) -> bytes:
+        if self.page_no == 0:
+            self._page_header("Aucune donnée sur la période sélectionnée.")
+            self.c.showPage()
+        self.c.save()
+        return self.buf.getvalue()
+
+
+# ————————————————————————
+# Export Contrôle Hygiène
+# ————————————————————————
+def generate_controle_hygiene_pdf(
+    temp_df: pd.DataFrame,
+    hygiene_df: pd.DataFrame,
+    vitrine_df: pd.DataFrame,
+    date_debut: date,
+    date_fin: date,
+    livraison_df: Optional[pd.DataFrame] = None,
+    progress: Optional[ProgressFn] = None,
+) -> bytes:
+    """Construit le PDF Contrôle Hygiène (toutes colonnes, livraisons incluses) et renvoie ses octets."""
+    if livraison_df is not None:
+        livraison_df = livraison_df[[c for c in livraison_df.columns if not str(c).startswith("__")]]
+    tables = [
+        ("Températures relevées", temp_df),
+        ("Relevés Hygiène", hygiene_df),
+        ("Articles en Vitrine", vitrine_df),
+        ("Températures de livraison", livraison_df),
+    ]
+    report = PdfReport(
+        "Export Contrôle Hygiène Yorgios",
+        f"Période : {date_debut.strftime('%d/%m/%Y')} au {date_fin.strftime('%d/%m/%Y')}",
+        progress=progress,
+    )
+    report.plan(tables)
+    for title, df in tables:
+        report.add_table(title, df)
+    return report.render()
@@ -0,0 +1,274 @@
+# yorgios_core/photo_queue.py
+# File d'attente d'upload des photos de réception : la photo est d'abord écrite
+# sur disque, la ligne du sheet reçoit un marqueur « en attente », puis un
+# thread de fond envoie les photos vers Drive (avec reprises) et remplace les
+# marqueurs par les liens, en un seul batch_update par vague.
+# Le traitement éventuel de l'image (`prepare`) se fait aussi dans le worker.
+# Les photos sont adressées par contenu : une image déjà envoyée (ou déjà en
+# file) réutilise le même fichier Drive au lieu d'être retéléversée.
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .drive import DriveClient, drive_view_link
+
+PENDING_PREFIX = "⏳ en attente"
+LEASE_S = 600   # photo prise par un processus ; reprise par un autre passé ce délai
+
+
+def pending_marker(job_id: str) -> str:
+    return f"{PENDING_PREFIX} #{job_id}"
+
+def is_pending(link: str) -> bool:
+    return str(link or "").startswith(PENDING_PREFIX)
+
+
+class PhotoHashIndex:
+    """Index local sha256 du contenu original → ID du fichier Drive, persisté en JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._ids: Dict[str, str] = json.load(f)
+        except (OSError, ValueError):
+            self._ids = {}
+
+    def get(self, digest: str) -> Optional[str]:
+        return self._ids.get(digest)
+
+    def put(self, digest: str, file_id: str) -> None:
+        with self._lock:
+            self._ids[digest] = file_id
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._ids, f)
+            os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class PhotoUploadQueue:
+    """
+    Chaque photo = `<id>.bin` (contenu) + `<id>.json` (nom, mime, état, essais)
+    dans `spool_dir` : les envois non terminés survivent à un redémarrage.
+    États : "pending" → "uploaded" (lien connu) → fichiers supprimés une fois
+    le lien reporté dans le sheet par `backfill({marqueur: lien})`.
+
+    Plusieurs répliques peuvent partager `spool_dir` : avant d'envoyer une photo
+    (ou d'en reporter le lien), un processus la prend en renommant
+    `<id>.json` en `<id>.<horodatage>.claimed` — un seul renommage réussit.
+    Une prise plus vieille que LEASE_S (processus mort) est remise en file.
+    """
+
+    def __init__(
+        self, client: DriveClient, folder_id: str, spool_dir: str,
+        backfill: Callable[[Dict[str, str]], None],
+        prepare: Optional[Callable[[bytes, str, str], Tuple[bytes, str, str]]] = None,
+        workers: int = 3, batch_delay: float = 1.0, poll: float = 30.0,
+    ):
+        self.client = client
+        self.folder_id = folder_id
+        self.spool_dir = spool_dir
+        self.backfill = backfill
+        self.prepare = prepare
+        self.workers = workers
+        self.batch_delay = batch_delay
+        self.poll = poll
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._lock_enqueue = threading.Lock()
+        self._wake = threading.Event()
+        os.makedirs(spool_dir, exist_ok=True)
+        self.index = PhotoHashIndex(os.path.join(spool_dir, "index.json"))
+        self._wake.set()  # reprend les envois laissés par un précédent processus
+        threading.Thread(target=self._run, name="photo-upload", daemon=True).start()
+
+    # ————————————————————————
+    # Spool disque
+    # ————————————————————————
+    def _path(self, job_id: str, ext: str) -> str:
+        return os.path.join(self.spool_dir, f"{job_id}.{ext}")
+
+    def _save(self, job: dict) -> None:
+        tmp = self._path(job["id"], "json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp, self._path(job["id"], "json"))
+
+    def _jobs(self, include_claimed: bool = False) -> List[dict]:
+        jobs = []
+        for fname in sorted(os.listdir(self.spool_dir)):
+            if fname == "index.json":
+                continue
+            if not (fname.endswith(".json") or (include_claimed and fname.endswith(".claimed"))):
+                continue
+            try:
+                with open(os.path.join(self.spool_dir, fname), "r", encoding="utf-8") as f:
+                    jobs.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return jobs
+
+    def _drop(self, job_id: str) -> None:
+        for ext in ("bin", "json"):
+            try:
+                os.remove(self._path(job_id, ext))
+            except FileNotFoundError:
+                pass
+
+    # ————————————————————————
+    # Prise d'une photo (plusieurs répliques sur le même spool)
+    # ————————————————————————
+    def _claim(self, job_id: str, state: str) -> Optional[Tuple[dict, str]]:
+        """(job relu, chemin de la prise) si ce processus a pris la photo et qu'elle est toujours `state`."""
+        claimed = os.path.join(self.spool_dir, f"{job_id}.{int(time.time())}.claimed")
+        try:
+            os.rename(self._path(job_id, "json"), claimed)
+            with open(claimed, "r", encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if job.get("state") != state:   # traitée entre-temps par une autre réplique
+            self._release(claimed)
+            return None
+        return job, claimed
+
+    def _release(self, claimed: str) -> None:
+        job_id = os.path.basename(claimed).split(".")[0]
+        try:
+            if os.path.exists(self._path(job_id, "json")):
+                os.remove(claimed)
+            else:
+                os.rename(claimed, self._path(job_id, "json"))
+        except FileNotFoundError:
+            pass
+
+    def _claims(self) -> List[Tuple[str, float]]:
+        out = []
+        for fname in os.listdir(self.spool_dir):
+            if fname.endswith(".claimed"):
+                try:
+                    out.append((os.path.join(self.spool_dir, fname), float(fname.split(".")[1])))
+                except (IndexError, ValueError):
+                    continue
+        return out
+
+    def _requeue_stale(self, now: float) -> None:
+        for claimed, taken in self._claims():
+            if taken < now - LEASE_S:
+                self._release(claimed)
+
+    # ————————————————————————
+    # API
+    # ————————————————————————
+    def enqueue(self, data: bytes, name: str, mime: str) -> str:
+        """
+        Met la photo en file (écriture disque seulement) et renvoie ce qu'il faut
+        écrire dans le sheet : le lien direct si ce contenu est déjà sur Drive,
+        sinon un marqueur « en attente » (partagé si la même image est déjà en file).
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        file_id = self.index.get(digest)
+        if file_id:
+            return drive_view_link(file_id)
+        with self._lock_enqueue:
+            for job in self._jobs(include_claimed=True):
+                if job.get("sha256") == digest:
+                    return pending_marker(job["id"])
+            job_id = uuid.uuid4().hex[:12]
+            with open(self._path(job_id, "bin"), "wb") as f:
+                f.write(data)
+            self._save({
+                "id": job_id, "name": name, "mime": mime, "state": "pending", "sha256": digest,
+                "attempts": 0, "next_try": 0.0, "link": "", "created": time.time(),
+            })
+        self._wake.set()
+        return pending_marker(job_id)
+
+    def pending_count(self) -> int:
+        return len(self._jobs(include_claimed=True))
+
+    # ————————————————————————
+    # Worker
+    # ————————————————————————
+    def _upload(self, job: dict, claimed: str) -> dict:
+        try:
+            with open(self._path(job["id"], "bin"), "rb") as f:
+                data = f.read()
+            name, mime = job["name"], job["mime"]
+            if self.prepare is not None:
+                data, name, mime = self.prepare(data, name, mime)
+            resp = self.client.upload(name, data, mime, self.folder_id)
+            if resp.status_code not in (200, 201) or not resp.json().get("id"):
+                raise RuntimeError(f"Drive a répondu {resp.status_code}")
+            file_id = resp.json()["id"]
+            job.update(state="uploaded", link=drive_view_link(file_id))
+            if job.get("sha256"):
+                self.index.put(job["sha256"], file_id)
+        except Exception as e:
+            job["attempts"] += 1
+            # 5 s, 10 s, 20 s… plafonné à 10 min : on ne perd jamais une preuve HACCP
+            job["next_try"] = time.time() + min(600, 5 * 2 ** (job["attempts"] - 1))
+            self.last_error = f"{job['name']} : {e}"
+        self._save(job)
+        try:
+            os.remove(claimed)
+        except FileNotFoundError:
+            pass
+        return job
+
+    def process(self) -> None:
+        """Une vague : envoie en parallèle les photos dues, puis reporte tous les liens connus."""
+        with self._lock:
+            now = time.time()
+            self._requeue_stale(now)
+            due = [j for j in self._jobs() if j["state"] == "pending" and j["next_try"] <= now]
+            taken = [c for c in (self._claim(j["id"], "pending") for j in due) if c]
+            if taken:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    list(pool.map(lambda c: self._upload(*c), taken))
+
+            uploaded = [j for j in self._jobs() if j["state"] == "uploaded"]
+            taken = [c for c in (self._claim(j["id"], "uploaded") for j in uploaded) if c]
+            if not taken:
+                return
+            ready = {pending_marker(job["id"]): job["link"] for job, _ in taken}
+            try:
+                self.backfill(ready)
+            except Exception as e:
+                self.last_error = f"report des liens : {e}"
+                for _, claimed in taken:
+                    self._release(claimed)
+                return
+            for job, claimed in taken:
+                self._drop(job["id"])
+                try:
+                    os.remove(claimed)
+                except FileNotFoundError:
+                    pass
+
+    def _next_wakeup(self) -> float:
+        due = [j["next_try"] for j in self._jobs() if j["state"] == "pending"]
+        due += [taken + LEASE_S for _, taken in self._claims()]
+        if not due:
+            return self.poll
+        return max(0.5, min(self.poll, min(due) - time.time()))
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=self._next_wakeup())
+            self._wake.clear()
+            time.sleep(self.batch_delay)  # regroupe les photos d'un même enregistrement
+            try:
+                self.process()
+            except Exception as e:
+                self.last_error = str(e)
@@ -0,0 +1,77 @@
+# yorgios_core/photos.py
+# Préparation des photos de réception avant envoi sur Drive : orientation EXIF
+# appliquée, redimensionnement et recompression JPEG/WebP.
+from __future__ import annotations
+import io
+from dataclasses import dataclass
+from typing import Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+FORMATS = {
+    "JPEG": ("image/jpeg", "jpg"),
+    "WEBP": ("image/webp", "webp"),
+}
+
+
+@dataclass(frozen=True)
+class PhotoSettings:
+    max_edge: int = 1600        # plus grand côté en pixels (lisible comme preuve HACCP)
+    format: str = "JPEG"        # JPEG ou WEBP
+    quality: int = 80
+
+    @classmethod
+    def from_mapping(cls, cfg) -> "PhotoSettings":
+        """Depuis st.secrets (clés PHOTO_MAX_EDGE, PHOTO_FORMAT, PHOTO_QUALITY…), valeurs par défaut sinon."""
+        d = cls()
+        fmt = str(cfg.get("PHOTO_FORMAT", d.format)).upper()
+        return cls(
+            max_edge=int(cfg.get("PHOTO_MAX_EDGE", d.max_edge)),
+            format=fmt if fmt in FORMATS else d.format,
+            quality=int(cfg.get("PHOTO_QUALITY", d.quality)),
+        )
+
+
+@dataclass(frozen=True)
+class PreparedPhoto:
+    data: bytes
+    mime: str
+    ext: str
+    size: Tuple[int, int]
+    original_bytes: int
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """RGB sans transparence (fond blanc), requis pour le JPEG."""
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        bg = Image.new("RGB", img.size, (255, 255, 255))
+        bg.paste(img, mask=img.getchannel("A"))
+        return bg
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+def _encode(img: Image.Image, fmt: str, quality: int) -> bytes:
+    buf = io.BytesIO()
+    if fmt == "WEBP":
+        img.save(buf, "WEBP", quality=quality, method=4)
+    else:
+        img.save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buf.getvalue()
+
+def prepare_photo(raw: bytes, settings: PhotoSettings = PhotoSettings(), mime: str = "image/jpeg") -> PreparedPhoto:
+    """
+    Photo prête à l'envoi. Si le fichier n'est pas une image lisible par Pillow,
+    il est renvoyé tel quel plutôt que de bloquer la réception.
+    """
+    try:
+        with Image.open(io.BytesIO(raw)) as src:
+            img = ImageOps.exif_transpose(src)
+            img = _flatten(img)
+    except (UnidentifiedImageError, OSError):
+        ext = mime.rsplit("/", 1)[-1].replace("jpeg", "jpg")
+        return PreparedPhoto(raw, mime, ext, (0, 0), len(raw))
+
+    img.thumbnail((settings.max_edge, settings.max_edge), Image.LANCZOS)
+    out_mime, ext = FORMATS[settings.format]
+    data = _encode(img, settings.format, settings.quality)
+    return PreparedPhoto(data, out_mime, ext, img.size, len(raw))
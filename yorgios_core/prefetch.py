@@ -0,0 +1,131 @@
+# yorgios_core/prefetch.py
+# Préchargement prédictif de l'onglet suivant : les transitions entre onglets
+# sont comptées par appareil (chaîne de Markov d'ordre 1, persistée en SQLite) ;
+# pendant que l'utilisateur est sur un onglet, les données de l'onglet suivant
+# le plus probable sont chargées dans le cache partagé par un thread de fond.
+from __future__ import annotations
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+ALL_DEVICES = "*"   # compteurs tous appareils confondus (repli pour un appareil nouveau)
+
+
+class TransitionModel:
+    """Compteurs onglet → onglet suivant, par appareil et globaux."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS transitions (
+        device  TEXT NOT NULL,
+        src     TEXT NOT NULL,
+        dst     TEXT NOT NULL,
+        count   INTEGER NOT NULL DEFAULT 0,
+        updated REAL NOT NULL,
+        PRIMARY KEY (device, src, dst)
+    );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._conn() as db:
+            db.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _conn(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record(self, device: str, src: str, dst: str) -> None:
+        if not src or src == dst:
+            return
+        now = time.time()
+        with self._conn() as db:
+            db.executemany(
+                """
+                INSERT INTO transitions (device, src, dst, count, updated) VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT (device, src, dst) DO UPDATE SET count = count + 1, updated = excluded.updated
+                """,
+                [(device, src, dst, now), (ALL_DEVICES, src, dst, now)],
+            )
+
+    def predict(self, device: str, src: str, k: int = 1, min_count: int = 2) -> List[str]:
+        """
+        Les `k` onglets suivants les plus fréquents après `src` pour cet appareil
+        (au moins `min_count` passages), sinon d'après tous les appareils.
+        """
+        with self._conn() as db:
+            for dev in (device, ALL_DEVICES):
+                rows = db.execute(
+                    "SELECT dst FROM transitions WHERE device = ? AND src = ? AND count >= ? "
+                    "ORDER BY count DESC, updated DESC LIMIT ?",
+                    (dev, src, min_count, k),
+                ).fetchall()
+                if rows:
+                    return [r[0] for r in rows]
+        return []
+
+
+class Prefetcher:
+    """
+    `visit(device, précédent, courant)` enregistre la transition puis lance en
+    arrière-plan les chargeurs de l'onglet suivant prédit. Un même onglet n'est
+    pas rechargé plus d'une fois par `cooldown` secondes ni en double.
+    Les chargeurs ne doivent pas utiliser Streamlit (ils tournent hors session).
+    """
+
+    def __init__(
+        self, model: TransitionModel, loaders: Dict[str, List[Callable[[], object]]],
+        workers: int = 2, cooldown: float = 30.0, k: int = 1,
+    ):
+        self.model = model
+        self.loaders = loaders
+        self.cooldown = cooldown
+        self.k = k
+        self.last_error: Optional[str] = None
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._last_run: Dict[str, float] = {}
+        self._running: set = set()
+
+    def visit(self, device: str, previous: Optional[str], current: str) -> List[str]:
+        try:
+            if previous:
+                self.model.record(device, previous, current)
+            nexts = self.model.predict(device, current, k=self.k)
+        except sqlite3.Error as e:
+            self.last_error = str(e)
+            return []
+        for tab in nexts:
+            self.prefetch(tab)
+        return nexts
+
+    def prefetch(self, tab: str) -> bool:
+        if tab not in self.loaders:
+            return False
+        now = time.time()
+        with self._lock:
+            if tab in self._running or now - self._last_run.get(tab, 0) < self.cooldown:
+                return False
+            self._running.add(tab)
+            self._last_run[tab] = now
+        self._pool.submit(self._run, tab)
+        return True
+
+    def _run(self, tab: str) -> None:
+        try:
+            for load in self.loaders[tab]:
+                try:
+                    load()
+                except Exception as e:
+                    self.last_error = f"{tab} : {e}"
+        finally:
+            with self._lock:
+                self._running.discard(tab)
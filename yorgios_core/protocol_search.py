@@ -0,0 +1,191 @@
+# yorgios_core/protocol_search.py
+# Recherche plein texte dans les protocoles : index inversé par paragraphe,
+# insensible aux accents et à la casse, reconstruit document par document
+# uniquement quand la révision Drive change.
+from __future__ import annotations
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Set, Tuple
+
+from .protocols import ProtocolDoc
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# mots vides fréquents : ils n'aident pas à classer les paragraphes
+STOPWORDS = {
+    "a", "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "en", "est",
+    "et", "il", "la", "le", "les", "leur", "on", "ou", "par", "pas", "pour", "qu",
+    "que", "qui", "se", "sur", "un", "une", "y", "l", "d", "s", "n", "c", "j",
+}
+
+SNIPPET_CHARS = 260
+
+
+def fold(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s.lower())
+    return "".join(ch for ch in s if not unicodedata.combining(ch))
+
+def _term(word: str) -> str:
+    """Mot replié + pluriel simple retiré (« glaçons » → « glacon »)."""
+    w = fold(word)
+    if len(w) > 3 and w[-1] in "sx":
+        w = w[:-1]
+    return w
+
+def terms(text: str) -> List[str]:
+    return [t for t in (_term(w) for w in _WORD.findall(text)) if t and t not in STOPWORDS]
+
+def paragraphs(text: str) -> List[str]:
+    """Découpe en paragraphes (lignes vides) puis en puces « • » comme à l'affichage."""
+    out = []
+    for block in re.split(r"\n\s*\n", text.replace("\r\n", "\n")):
+        for part in block.split("•"):
+            part = " ".join(part.split())
+            if part:
+                out.append(part)
+    return out
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    label: str
+    paragraph: str
+    snippet: str     # extrait avec les mots trouvés en **gras** (markdown)
+    score: float
+
+
+def snippet(paragraph: str, query_terms: Set[str], width: int = SNIPPET_CHARS) -> str:
+    spans = [m.span() for m in _WORD.finditer(paragraph) if _term(m.group()) in query_terms]
+    if not spans:
+        return paragraph[:width] + ("…" if len(paragraph) > width else "")
+    start = max(0, spans[0][0] - width // 4)
+    end = min(len(paragraph), start + width)
+    out, pos = [], start
+    for a, b in spans:
+        if a < start or b > end:
+            continue
+        out.append(paragraph[pos:a])
+        out.append(f"**{paragraph[a:b]}**")
+        pos = b
+    out.append(paragraph[pos:end])
+    return ("…" if start > 0 else "") + "".join(out) + ("…" if end < len(paragraph) else "")
+
+
+class ProtocolIndex:
+    """
+    Postings `terme → {(document, n° paragraphe): occurrences}`. `update()`
+    compare les révisions et ne réindexe que les documents modifiés ; la
+    recherche (tf-idf, les paragraphes contenant tous les termes d'abord)
+    tient dans quelques millisecondes pour une dizaine de protocoles.
+    Le dernier terme de la requête est aussi cherché comme préfixe.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Tuple[str, int], int]] = {}
+        self._paras: Dict[str, List[str]] = {}
+        self._lengths: Dict[Tuple[str, int], int] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._revisions: Dict[str, str] = {}
+        self._vocab: List[str] = []
+        self._lock = threading.Lock()
+
+    # ————————————————————————
+    # Construction
+    # ————————————————————————
+    def _remove(self, label: str) -> None:
+        for t in self._doc_terms.pop(label, ()):
+            post = self._postings.get(t)
+            if post is None:
+                continue
+            for key in [k for k in post if k[0] == label]:
+                del post[key]
+            if not post:
+                del self._postings[t]
+        for i in range(len(self._paras.pop(label, []))):
+            self._lengths.pop((label, i), None)
+        self._revisions.pop(label, None)
+
+    def _add(self, doc: ProtocolDoc) -> None:
+        paras = paragraphs(doc.text)
+        seen: Set[str] = set()
+        for i, para in enumerate(paras):
+            ts = terms(para)
+            self._lengths[(doc.label, i)] = len(ts)
+            for t in ts:
+                post = self._postings.setdefault(t, {})
+                post[(doc.label, i)] = post.get((doc.label, i), 0) + 1
+            seen.update(ts)
+        self._paras[doc.label] = paras
+        self._doc_terms[doc.label] = seen
+        self._revisions[doc.label] = doc.revision
+
+    def update(self, docs: Mapping[str, ProtocolDoc]) -> bool:
+        """Réindexe les documents dont la révision a changé ; renvoie True si l'index a bougé."""
+        with self._lock:
+            changed = False
+            for label in list(self._revisions):
+                if label not in docs:
+                    self._remove(label)
+                    changed = True
+            for label, doc in docs.items():
+                if self._revisions.get(label) == doc.revision:
+                    continue
+                self._remove(label)
+                self._add(doc)
+                changed = True
+            if changed:
+                self._vocab = sorted(self._postings)
+            return changed
+
+    # ————————————————————————
+    # Recherche
+    # ————————————————————————
+    def _expand_prefix(self, prefix: str, limit: int = 50) -> List[str]:
+        out = []
+        i = bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix) and len(out) < limit:
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        q = terms(query)
+        if not q:
+            return []
+        with self._lock:
+            n_paras = max(1, len(self._lengths))
+            avg_len = sum(self._lengths.values()) / n_paras if self._lengths else 1.0
+
+            # chaque terme de la requête → variantes présentes dans l'index
+            groups: List[List[str]] = [[t] for t in q[:-1]]
+            last = q[-1]
+            groups.append(sorted({last, *self._expand_prefix(last)}))
+
+            scores: Dict[Tuple[str, int], float] = {}
+            matched: Dict[Tuple[str, int], int] = {}
+            hit_terms: Set[str] = set()
+            for group in groups:
+                best: Dict[Tuple[str, int], float] = {}
+                for t in group:
+                    post = self._postings.get(t)
+                    if not post:
+                        continue
+                    hit_terms.add(t)
+                    idf = math.log(1 + n_paras / len(post))
+                    for key, tf in post.items():
+                        norm = tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * self._lengths[key] / avg_len))
+                        best[key] = max(best.get(key, 0.0), idf * norm)
+                for key, sc in best.items():
+                    scores[key] = scores.get(key, 0.0) + sc
+                    matched[key] = matched.get(key, 0) + 1
+
+            ranked = sorted(scores, key=lambda k: (matched[k], scores[k]), reverse=True)[:limit]
+            hits = []
+            for label, i in ranked:
+                para = self._paras[label][i]
+                hits.append(SearchHit(label, para, snippet(para, hit_terms), round(scores[(label, i)], 3)))
+            return hits
@@ -0,0 +1,203 @@
+# yorgios_core/protocols.py
+# Protocoles opérationnels (fichiers texte du dossier Drive) : cache mémoire
+# préchargé en arrière-plan et revalidé par un simple listing des métadonnées.
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+from .drive import DriveClient
+
+# Libellé affiché → nom du fichier dans le dossier PROTOCOLES_FOLDER_ID
+PROTOCOLES = {
+    "Arrivée":                 "protocoles_arrivee.txt",
+    "Fermeture":               "protocoles_fermeture.txt",
+    "Temps calme":             "protocoles_tempscalmes.txt",
+    "Stockage":                "protocole_stockage.txt",
+    "Hygiène du personnel":    "protocoles_hygiene du personnel.txt",
+    "Service du midi":         "protocoles_midi.txt",
+    "Règles en stand":         "protocoles_regles en stand.txt",
+    "Hygiène générale":        "protocole_hygiene.txt",
+    "TooGoodToGo":             "TooGoodToGo.txt",
+}
+
+
+@dataclass(frozen=True)
+class ProtocolDoc:
+    label: str
+    file_id: str
+    mime: str
+    modified_time: str   # RFC 3339, tel que renvoyé par Drive
+    revision: str        # md5 (fichiers binaires) ou modifiedTime (Google Docs)
+    text: str
+
+
+def _revision(meta: dict) -> str:
+    return meta.get("md5Checksum") or meta.get("modifiedTime") or ""
+
+
+class ProtocolStore:
+    """
+    Un seul `files.list` (restreint aux noms connus) résout tous les fichiers et
+    donne leur révision ; seuls les documents nouveaux ou modifiés sont
+    retéléchargés, en parallèle. `get()` répond toujours depuis la mémoire et
+    déclenche une revalidation en arrière-plan quand la copie a plus de
+    `revalidate_after` secondes. En cas d'échec Drive, la dernière copie reste servie ;
+    avec `persist_path`, elle est aussi gardée sur disque et rechargée au
+    démarrage, pour survivre à un redémarrage pendant une panne Drive.
+    """
+
+    def __init__(
+        self, client: DriveClient, folder_id: str, files: Dict[str, str],
+        revalidate_after: float = 120, max_workers: int = 4,
+        persist_path: Optional[str] = None,
+    ):
+        self.client = client
+        self.folder_id = folder_id
+        self.files = dict(files)
+        self.revalidate_after = revalidate_after
+        self.max_workers = max_workers
+        self._docs: Dict[str, ProtocolDoc] = {}
+        self._missing: set = set()
+        self._refresh_lock = threading.Lock()
+        self.checked_at: float = 0.0     # time.time() du dernier listing réussi
+        self.last_error: Optional[Exception] = None
+        self.persist_path = persist_path
+        self.saved_at: Optional[float] = None   # date de la copie disque servie tant que Drive n'a pas répondu
+        self._load_persisted()
+
+    # ————————————————————————
+    # Copie disque
+    # ————————————————————————
+    def _load_persisted(self) -> None:
+        if not self.persist_path:
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            docs = {d["label"]: ProtocolDoc(**d) for d in data["docs"] if d["label"] in self.files}
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._docs.update(docs)
+        self.saved_at = data.get("saved_at")
+
+    def _persist(self) -> None:
+        if not self.persist_path:
+            return
+        tmp = f"{self.persist_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.persist_path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"saved_at": time.time(), "docs": [asdict(d) for d in self._docs.values()]},
+                          f, ensure_ascii=False)
+            os.replace(tmp, self.persist_path)
+        except OSError:
+            pass
+
+    # ————————————————————————
+    # Rafraîchissement
+    # ————————————————————————
+    def _fresh(self, max_age: float) -> bool:
+        return bool(self.checked_at) and time.time() - self.checked_at < max_age
+
+    def refresh(self, max_age: float = 0) -> None:
+        """Revalide tous les documents (bloquant). Sans effet si le dernier listing a moins de `max_age` s."""
+        with self._refresh_lock:
+            if self._fresh(max_age):
+                return
+            try:
+                listing = self.client.list_folder(self.folder_id, names=self.files.values())
+                # à nom égal, le plus récemment modifié l'emporte
+                by_name: Dict[str, dict] = {}
+                for meta in sorted(listing, key=lambda m: m.get("modifiedTime", "")):
+                    by_name[meta["name"]] = meta
+
+                stale = {}
+                for label, fname in self.files.items():
+                    meta = by_name.get(fname)
+                    doc = self._docs.get(label)
+                    if meta is None:
+                        continue
+                    if doc is None or doc.file_id != meta["id"] or doc.revision != _revision(meta):
+                        stale[label] = meta
+
+                def fetch(label):
+                    meta = stale[label]
+                    try:
+                        text = self.client.read_text(meta["id"], meta["mimeType"])
+                    except Exception as e:
+                        return label, e
+                    if text is None:
+                        return label, RuntimeError(f"téléchargement impossible : {meta['name']}")
+                    return label, ProtocolDoc(label, meta["id"], meta["mimeType"],
+                                              meta.get("modifiedTime", ""), _revision(meta), text)
+
+                # supprimé (ou renommé) sur Drive : retiré du cache et de la copie disque
+                gone = [label for label in self._docs if self.files.get(label) not in by_name]
+                for label in gone:
+                    del self._docs[label]
+
+                error = None
+                if stale:
+                    with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                        results = list(pool.map(fetch, stale))
+                    # un document en échec garde sa copie précédente, les autres sont mis à jour
+                    for label, res in results:
+                        if isinstance(res, Exception):
+                            error = res
+                        else:
+                            self._docs[label] = res
+                if stale or gone:
+                    self._persist()
+
+                self._missing = {label for label, fname in self.files.items() if fname not in by_name}
+                self.checked_at = time.time()
+                self.saved_at = None
+                self.last_error = error
+            except Exception as e:
+                self.last_error = e
+
+    def prefetch(self) -> None:
+        """Lance une revalidation en arrière-plan si aucune n'est en cours."""
+        if self._refresh_lock.locked():
+            return
+        threading.Thread(
+            target=self.refresh, kwargs={"max_age": self.revalidate_after},
+            name="protocol-prefetch", daemon=True,
+        ).start()
+
+    def invalidate(self) -> None:
+        """Le dossier a changé (flux Drive) : revalidation immédiate en arrière-plan."""
+        self.checked_at = 0.0
+        self.prefetch()
+
+    # ————————————————————————
+    # Lecture
+    # ————————————————————————
+    def get(self, label: str) -> Optional[ProtocolDoc]:
+        """
+        Document en cache (revalidé en arrière-plan s'il est ancien). Au premier
+        accès, attend le préchargement. None si le fichier n'existe pas sur Drive ;
+        exception si Drive est injoignable et qu'aucune copie n'existe.
+        """
+        doc = self._docs.get(label)
+        if doc is not None:
+            if not self._fresh(self.revalidate_after):
+                self.prefetch()
+            return doc
+        self.refresh(max_age=self.revalidate_after)
+        doc = self._docs.get(label)
+        if doc is None and label not in self._missing and self.last_error is not None:
+            raise self.last_error
+        return doc
+
+    def docs(self) -> Dict[str, ProtocolDoc]:
+        return dict(self._docs)
+
+    def is_stale(self) -> bool:
+        """Vrai si la dernière revalidation a échoué (on sert une copie plus ancienne)."""
+        return self.last_error is not None
@@ -0,0 +1,115 @@
+# yorgios_core/resilience.py
+# Mode dégradé quand les API Google ne répondent plus : un disjoncteur par
+# spreadsheet évite d'attendre des timeouts en série, et les dernières valeurs
+# lues avec succès sont gardées sur disque pour servir les vues en lecture seule
+# (alertes DLC, températures, protocoles…) pendant la panne.
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .shared_cache import encode_key, freeze_json
+
+
+class CircuitOpenError(RuntimeError):
+    """Appel refusé sans tentative : le service a échoué trop de fois récemment."""
+
+
+class CircuitBreaker:
+    """
+    Fermé → ouvert après `failure_threshold` échecs consécutifs. Ouvert, les
+    appels échouent aussitôt pendant `reset_after` secondes, puis un seul appel
+    d'essai passe (semi-ouvert) : succès → fermé, échec → rouvert.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_after: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def _allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        if not self._allow():
+            raise CircuitOpenError(f"{self.name} indisponible ({self.last_error})")
+        try:
+            result = fn()
+        except Exception as e:
+            with self._lock:
+                self._trial = False
+                self.failures += 1
+                self.last_error = str(e)[:200]
+                if self.opened_at is not None or self.failures >= self.failure_threshold:
+                    self.opened_at = time.time()
+            raise
+        with self._lock:
+            self._trial = False
+            self.failures = 0
+            self.opened_at = None
+        return result
+
+
+class LastKnownStore:
+    """
+    Dernière valeur lue avec succès pour chaque clé, en JSON dans `directory`
+    (un fichier par clé, écriture atomique). Gardée aussi en mémoire.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._memory: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, k: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(k.encode("utf-8")).hexdigest() + ".json")
+
+    def save(self, key: Hashable, value: Any) -> None:
+        k = encode_key(key)
+        saved_at = time.time()
+        self._memory[k] = (saved_at, value)
+        path = self._path(k)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"key": k, "saved_at": saved_at, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+
+    def load(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """(horodatage time.time(), valeur) ou None si jamais lue."""
+        k = encode_key(key)
+        hit = self._memory.get(k)
+        if hit is not None:
+            return hit
+        try:
+            with open(self._path(k), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        hit = (data["saved_at"], freeze_json(data["value"]))
+        self._memory[k] = hit
+        return hit
@@ -0,0 +1,252 @@
+# yorgios_core/runtime.py
+# Services partagés par tout le processus : client Sheets, handles de
+# spreadsheets, cache d'instantanés, client Drive, protocoles et flux de
+# modifications. Indépendants de Streamlit : le lanceur (scripts/serve.py)
+# les préchauffe avant la première session et l'app réutilise les mêmes objets.
+# Chaque spreadsheet a son disjoncteur ; si Google ne répond plus, les lectures
+# sont servies depuis la dernière valeur connue (mode dégradé, cf. resilience.py).
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import gspread
+
+from .config import (
+    SHEET_COMMANDES_ID, SHEET_HYGIENE_ID, SHEET_TEMP_ID, SHEET_PLANNING_ID,
+    SHEET_PRODUITS_ID, SHEET_RESP_ID, PROTOCOLES_FOLDER_ID,
+)
+from .credentials import gsheets_client, load_secrets, service_account_info
+from .drive import DriveClient
+from .drive_watch import DriveChangeWatcher
+from .protocols import PROTOCOLES, ProtocolStore
+from .resilience import CircuitBreaker, LastKnownStore
+from .shared_cache import SharedCache, open_backend
+from .snapshots import SnapshotCache, freeze_values, sheet_tag, worksheet_tag
+
+ALL_SHEETS = [SHEET_COMMANDES_ID, SHEET_HYGIENE_ID, SHEET_TEMP_ID,
+              SHEET_PLANNING_ID, SHEET_PRODUITS_ID, SHEET_RESP_ID]
+
+_lock = threading.RLock()
+_config: Dict[str, Any] = {"sa_info": None, "settings": None}
+_objects: Dict[str, Any] = {}
+_spreadsheets: Dict[str, gspread.Spreadsheet] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_degraded: Dict[tuple, float] = {}       # clé de lecture → horodatage de la valeur servie
+
+SPOOL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".spool")
+
+
+# ————————————————————————
+# Configuration
+# ————————————————————————
+def configure(sa_info: Optional[dict] = None, settings: Optional[Mapping] = None) -> None:
+    """Côté app : compte de service et st.secrets. Sinon, lus depuis l'environnement / secrets.toml."""
+    with _lock:
+        if sa_info is not None and _config["sa_info"] is None:
+            _config["sa_info"] = sa_info
+        if settings is not None and _config["settings"] is None:
+            _config["settings"] = settings
+
+def setting(name: str, default: Any = None) -> Any:
+    if _config["settings"] is None:
+        _config["settings"] = load_secrets()
+    settings = _config["settings"]
+    if name in settings:
+        return settings[name]
+    return os.getenv(name, default)
+
+def _sa_info() -> dict:
+    if _config["sa_info"] is None:
+        _config["sa_info"] = service_account_info()
+    return _config["sa_info"]
+
+def _once(name: str, factory: Callable[[], Any]) -> Any:
+    obj = _objects.get(name)
+    if obj is None:
+        with _lock:
+            obj = _objects.get(name)
+            if obj is None:
+                obj = _objects[name] = factory()
+    return obj
+
+
+# ————————————————————————
+# Google Sheets
+# ————————————————————————
+def sheets_client() -> gspread.Client:
+    return _once("sheets", lambda: gsheets_client(_sa_info()))
+
+def retrying_sheets_client() -> gspread.Client:
+    """Même compte de service, avec reprises automatiques (429/5xx) : client du journal d'écritures."""
+    return _once("sheets_retry", lambda: gsheets_client(
+        _sa_info(), http_client=gspread.http_client.BackOffHTTPClient,
+    ))
+
+def breaker(key: str) -> CircuitBreaker:
+    with _lock:
+        br = _breakers.get(key)
+        if br is None:
+            br = _breakers[key] = CircuitBreaker(
+                key, reset_after=float(setting("CIRCUIT_RESET_AFTER", 60)),
+            )
+        return br
+
+def spreadsheet(key: str, retries: int = 3, delay: float = 0.7) -> gspread.Spreadsheet:
+    """Handle ouvert une seule fois par processus (open_by_key coûte un aller-retour)."""
+    sh = _spreadsheets.get(key)
+    if sh is not None:
+        return sh
+
+    def _open():
+        last_err = None
+        for i in range(retries):
+            try:
+                return sheets_client().open_by_key(key)
+            except Exception as e:
+                last_err = e
+                if i < retries - 1:
+                    time.sleep(delay * (i + 1))
+        raise last_err
+
+    sh = _spreadsheets[key] = breaker(key).call(_open)
+    return sh
+
+
+class LazySpreadsheet:
+    """
+    Handle ouvert au premier usage : un spreadsheet injoignable n'empêche plus
+    le chargement de l'app, seules les actions qui en ont besoin échouent.
+    """
+
+    def __init__(self, key: str):
+        self.id = key
+
+    def __getattr__(self, name: str):
+        return getattr(spreadsheet(self.id), name)
+
+
+# ————————————————————————
+# Caches
+# ————————————————————————
+# Instantanés immuables partagés par toutes les sessions : un hit de cache
+# ne coûte ni désérialisation ni copie (cf. snapshots.py). Avec plusieurs
+# répliques, SHARED_CACHE_URL (sqlite:///… ou redis://…) met les valeurs brutes
+# des onglets en commun et diffuse les invalidations (cf. shared_cache.py).
+def _make_snapshot_cache() -> SnapshotCache:
+    url = str(setting("SHARED_CACHE_URL", "") or "").strip()
+    if not url:
+        return SnapshotCache()
+    if url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(url[len("sqlite:///"):])), exist_ok=True)
+    return SnapshotCache(shared=SharedCache(open_backend(url)))
+
+def snapshot_cache() -> SnapshotCache:
+    return _once("snapshots", _make_snapshot_cache)
+
+def read_ttl(short: float) -> float:
+    """Durée de vie des lectures : courte par défaut, longue tant que le flux Drive invalide les caches."""
+    # le flux est démarré par l'app (app_yorgios.py) : on ne le crée pas ici
+    watcher = _objects.get("watcher")
+    return float(setting("LONG_READ_TTL", 3600)) if watcher is not None and watcher.healthy() else short
+
+def last_known() -> LastKnownStore:
+    return _once("last_known", lambda: LastKnownStore(
+        str(setting("LAST_KNOWN_DIR", "") or os.path.join(SPOOL_DIR, "last_known"))
+    ))
+
+def _read(cache_key: tuple, sheet_id: str, load: Callable[[], Any], ttl: float, tags) -> Any:
+    """
+    Lecture en cache passant par le disjoncteur du spreadsheet. En cas d'échec,
+    la dernière valeur connue est servie et la clé notée comme dégradée ; la
+    première lecture réussie du spreadsheet lève l'état dégradé de toutes ses clés.
+    """
+    def _load():
+        value = breaker(sheet_id).call(load)
+        try:
+            last_known().save(cache_key, value)
+        except OSError:
+            pass
+        return value
+    try:
+        value = snapshot_cache().get(cache_key, _load, ttl=read_ttl(ttl), tags=tags, shared=True)
+    except Exception:
+        saved = last_known().load(cache_key)
+        if saved is None:
+            raise
+        _degraded[cache_key] = saved[0]
+        return saved[1]
+    if _degraded:
+        with _lock:
+            for k in [k for k in _degraded if k[1] == sheet_id]:
+                _degraded.pop(k, None)
+    return value
+
+def worksheet_titles(key: str, ttl: float = 60) -> List[str]:
+    def _load():
+        return tuple(w.title for w in spreadsheet(key).worksheets())
+    return list(_read(("titles", key), key, _load, ttl, [sheet_tag(key)]))
+
+def worksheet_values(key: str, title: str, ttl: float = 60, load: Optional[Callable[[], list]] = None):
+    """
+    Valeurs brutes (tuples immuables) de l'onglet, sans les écritures en attente
+    du journal. `load` remplace la lecture par défaut (get_all_values).
+    """
+    def _load():
+        if load is not None:
+            return freeze_values(load())
+        return freeze_values(spreadsheet(key).worksheet(title).get_all_values())
+    return _read(("values", key, title), key, _load, ttl, [sheet_tag(key), worksheet_tag(key, title)])
+
+def worksheet_records(key: str, title: str, ttl: float = 600) -> List[dict]:
+    """`get_all_records()` mis en cache (catalogue produits…)."""
+    def _load():
+        return spreadsheet(key).worksheet(title).get_all_records()
+    records = _read(("records", key, title), key, _load, ttl, [sheet_tag(key), worksheet_tag(key, title)])
+    return [dict(r) for r in records]
+
+def degraded_since() -> Optional[float]:
+    """Horodatage de la plus ancienne donnée servie hors ligne, None si tout est frais."""
+    return min(_degraded.values()) if _degraded else None
+
+def unavailable_sheets() -> List[str]:
+    return [key for key, br in list(_breakers.items()) if br.state != "closed"]
+
+
+# ————————————————————————
+# Drive
+# ————————————————————————
+def drive_client() -> DriveClient:
+    """Session HTTP et jetons partagés par toutes les sessions (cf. drive.py)."""
+    return _once("drive", lambda: DriveClient(_sa_info()))
+
+def _make_protocol_store() -> ProtocolStore:
+    store = ProtocolStore(
+        drive_client(), PROTOCOLES_FOLDER_ID, PROTOCOLES,
+        persist_path=os.path.join(last_known().directory, "protocoles.json"),
+    )
+    store.prefetch()
+    return store
+
+def protocol_store() -> ProtocolStore:
+    """Protocoles en mémoire, préchargés dès la création et revalidés en arrière-plan."""
+    return _once("protocols", _make_protocol_store)
+
+def _make_drive_watcher() -> DriveChangeWatcher:
+    cache, store = snapshot_cache(), protocol_store()
+
+    def on_change(ids):
+        for fid in ids:
+            if fid == PROTOCOLES_FOLDER_ID:
+                store.invalidate()
+                continue
+            cache.invalidate_sheet(fid)
+
+    return DriveChangeWatcher(
+        drive_client(), ALL_SHEETS, [PROTOCOLES_FOLDER_ID], on_change,
+        poll=float(setting("DRIVE_WATCH_POLL", 10)),
+    ).start()
+
+def drive_watcher() -> DriveChangeWatcher:
+    return _once("watcher", _make_drive_watcher)
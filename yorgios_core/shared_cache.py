@@ -0,0 +1,333 @@
+# yorgios_core/shared_cache.py
+# Cache partagé entre répliques Streamlit (cuisine, corner, bureau) : les valeurs
+# brutes des onglets sont stockées une fois pour toutes les instances, et chaque
+# invalidation est diffusée aux autres. N répliques = un seul budget de quota
+# Sheets et un seul cache chaud.
+# Deux backends : un fichier SQLite (répliques sur la même machine / le même
+# volume) ou un serveur compatible Redis (redis, valkey, KeyDB…).
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterable, Optional, Sequence, Tuple
+
+
+def encode_key(key: Hashable) -> str:
+    return json.dumps(list(key) if isinstance(key, tuple) else key, ensure_ascii=False)
+
+def freeze_json(value: Any) -> Any:
+    """Listes JSON → tuples : on retrouve les valeurs immuables de snapshots.freeze_values."""
+    if isinstance(value, list):
+        return tuple(freeze_json(v) for v in value)
+    return value
+
+
+# ————————————————————————
+# Backends
+# ————————————————————————
+class SQLiteBackend:
+    """
+    Fichier SQLite (WAL) partagé. Les invalidations sont des lignes numérotées
+    dans `messages`, lues par chaque réplique depuis son dernier numéro ; chacune
+    incrémente aussi la version de son tag (`versions`).
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        key     TEXT PRIMARY KEY,
+        value   TEXT NOT NULL,
+        stored  REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS tags (
+        tag TEXT NOT NULL,
+        key TEXT NOT NULL,
+        PRIMARY KEY (tag, key)
+    );
+    CREATE TABLE IF NOT EXISTS versions (
+        tag     TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS leases (
+        key     TEXT PRIMARY KEY,
+        expires REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS messages (
+        seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+        sender  TEXT NOT NULL,
+        tag     TEXT NOT NULL,
+        sent    REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path: str, poll: float = 1.0, keep_messages: float = 3600):
+        self.path = path
+        self.poll = poll
+        self.keep_messages = keep_messages
+        with self._conn() as db:
+            db.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _conn(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._conn() as db:
+            row = db.execute("SELECT stored, value FROM entries WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    @staticmethod
+    def _versions(db, tags: Sequence[str]) -> Tuple[int, ...]:
+        found = dict(db.execute(
+            f"SELECT tag, version FROM versions WHERE tag IN ({','.join('?' * len(tags))})", list(tags)
+        ).fetchall()) if tags else {}
+        return tuple(found.get(t, 0) for t in tags)
+
+    def versions(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        with self._conn() as db:
+            return self._versions(db, tags)
+
+    def set(self, key: str, value: str, tags: Sequence[str], ttl: float,
+            versions: Optional[Tuple[int, ...]] = None) -> bool:
+        with self._conn() as db:
+            db.execute("BEGIN IMMEDIATE")
+            if versions is not None and self._versions(db, tags) != tuple(versions):
+                return False
+            db.execute("INSERT OR REPLACE INTO entries (key, value, stored) VALUES (?, ?, ?)", (key, value, time.time()))
+            db.executemany("INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)", [(t, key) for t in tags])
+        return True
+
+    def delete_tag(self, tag: str) -> None:
+        with self._conn() as db:
+            db.execute("DELETE FROM entries WHERE key IN (SELECT key FROM tags WHERE tag = ?)", (tag,))
+            db.execute("DELETE FROM tags WHERE tag = ?", (tag,))
+            db.execute(
+                "INSERT INTO versions (tag, version) VALUES (?, 1) "
+                "ON CONFLICT(tag) DO UPDATE SET version = version + 1", (tag,)
+            )
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with self._conn() as db:
+            db.execute("DELETE FROM leases WHERE key = ? AND expires < ?", (key, now))
+            cur = db.execute("INSERT OR IGNORE INTO leases (key, expires) VALUES (?, ?)", (key, now + ttl))
+            return cur.rowcount == 1
+
+    def release(self, key: str) -> None:
+        with self._conn() as db:
+            db.execute("DELETE FROM leases WHERE key = ?", (key,))
+
+    def publish(self, sender: str, tag: str) -> None:
+        now = time.time()
+        with self._conn() as db:
+            db.execute("INSERT INTO messages (sender, tag, sent) VALUES (?, ?, ?)", (sender, tag, now))
+            db.execute("DELETE FROM messages WHERE sent < ?", (now - self.keep_messages,))
+
+    def subscribe(self, callback: Callable[[str, str], None]) -> None:
+        with self._conn() as db:
+            last = db.execute("SELECT COALESCE(MAX(seq), 0) FROM messages").fetchone()[0]
+
+        def run():
+            nonlocal last
+            while True:
+                time.sleep(self.poll)
+                try:
+                    with self._conn() as db:
+                        rows = db.execute(
+                            "SELECT seq, sender, tag FROM messages WHERE seq > ? ORDER BY seq", (last,)
+                        ).fetchall()
+                except sqlite3.Error:
+                    continue
+                for seq, sender, tag in rows:
+                    last = seq
+                    callback(sender, tag)
+
+        threading.Thread(target=run, name="shared-cache-sqlite", daemon=True).start()
+
+
+class RedisBackend:
+    """
+    Serveur compatible Redis : valeurs avec expiration, index de tags en sets,
+    compteur de version par tag (écriture conditionnelle par WATCH), pub/sub.
+    """
+
+    CHANNEL = "yorgios:invalidate"
+
+    def __init__(self, url: str, prefix: str = "yorgios:"):
+        try:
+            import redis
+        except ImportError as e:  # dépendance optionnelle
+            raise RuntimeError("Le cache partagé Redis nécessite le paquet 'redis'.") from e
+        self.redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._watch_error = redis.WatchError
+
+    def _k(self, kind: str, name: str) -> str:
+        return f"{self.prefix}{kind}:{name}"
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        raw = self.redis.get(self._k("v", key))
+        if raw is None:
+            return None
+        stored, _, value = raw.decode("utf-8").partition("\n")
+        return float(stored), value
+
+    @staticmethod
+    def _parse_versions(raw) -> Tuple[int, ...]:
+        return tuple(int(v) if v is not None else 0 for v in raw)
+
+    def versions(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        if not tags:
+            return ()
+        return self._parse_versions(self.redis.mget([self._k("n", t) for t in tags]))
+
+    def set(self, key: str, value: str, tags: Sequence[str], ttl: float,
+            versions: Optional[Tuple[int, ...]] = None) -> bool:
+        vkeys = [self._k("n", t) for t in tags]
+        with self.redis.pipeline() as pipe:
+            try:
+                if versions is not None and vkeys:
+                    pipe.watch(*vkeys)
+                    if self._parse_versions(pipe.mget(vkeys)) != tuple(versions):
+                        return False
+                pipe.multi()
+                pipe.set(self._k("v", key), f"{time.time()}\n{value}", ex=max(1, int(ttl)))
+                for t in tags:
+                    pipe.sadd(self._k("t", t), key)
+                pipe.execute()
+            except self._watch_error:
+                return False  # tag invalidé entre la lecture de version et l'écriture
+        return True
+
+    def delete_tag(self, tag: str) -> None:
+        keys = [k.decode("utf-8") for k in self.redis.smembers(self._k("t", tag))]
+        pipe = self.redis.pipeline()
+        for k in keys:
+            pipe.delete(self._k("v", k))
+        pipe.delete(self._k("t", tag))
+        pipe.incr(self._k("n", tag))
+        pipe.execute()
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        return bool(self.redis.set(self._k("l", key), "1", nx=True, ex=max(1, int(ttl))))
+
+    def release(self, key: str) -> None:
+        self.redis.delete(self._k("l", key))
+
+    def publish(self, sender: str, tag: str) -> None:
+        self.redis.publish(self.CHANNEL, json.dumps([sender, tag]))
+
+    def subscribe(self, callback: Callable[[str, str], None]) -> None:
+        def run():
+            while True:
+                try:
+                    pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self.CHANNEL)
+                    for msg in pubsub.listen():
+                        sender, tag = json.loads(msg["data"])
+                        callback(sender, tag)
+                except Exception:
+                    time.sleep(2)  # connexion perdue : on se réabonne
+
+        threading.Thread(target=run, name="shared-cache-redis", daemon=True).start()
+
+
+def open_backend(url: str):
+    """`sqlite:///chemin/cache.db` ou `redis://hôte:6379/0` (aussi `rediss://`)."""
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Cache partagé : URL non reconnue « {url} »")
+
+
+# ————————————————————————
+# Cache partagé
+# ————————————————————————
+class SharedCache:
+    """
+    Second niveau sous SnapshotCache : valeurs sérialisables en JSON (grilles de
+    valeurs, listes d'onglets). Une seule réplique recharge une clé expirée
+    (bail `acquire`), les autres attendent sa valeur au lieu d'appeler Sheets.
+    Les versions des tags sont relevées avant le chargement : une invalidation
+    survenue pendant `loader()` fait abandonner l'écriture de la valeur périmée.
+    Une panne du backend ne bloque jamais la lecture : on charge en direct.
+    """
+
+    def __init__(self, backend, lease: float = 20.0, wait: float = 15.0):
+        self.backend = backend
+        self.lease = lease
+        self.wait = wait
+        self.node = uuid.uuid4().hex[:12]
+        self.last_error: Optional[str] = None
+
+    def _lookup(self, k: str, ttl: float) -> Tuple[bool, Any]:
+        hit = self.backend.get(k)
+        if hit is not None and time.time() - hit[0] < ttl:
+            return True, freeze_json(json.loads(hit[1]))
+        return False, None
+
+    def fetch(self, key: Hashable, loader: Callable[[], Any], ttl: float, tags: Iterable[Hashable] = ()) -> Any:
+        k = encode_key(key)
+        tag_keys = [encode_key(t) for t in tags]
+        try:
+            found, value = self._lookup(k, ttl)
+            if found:
+                return value
+            deadline = time.time() + self.wait
+            while not self.backend.acquire(k, self.lease):
+                if time.time() > deadline:
+                    return loader()
+                time.sleep(0.25)
+                found, value = self._lookup(k, ttl)
+                if found:
+                    return value
+        except Exception as e:
+            self.last_error = str(e)
+            return loader()
+
+        try:
+            versions = self.backend.versions(tag_keys)
+        except Exception as e:
+            self.last_error = str(e)
+            versions = None
+
+        try:
+            value = loader()
+            if versions is not None:
+                try:
+                    self.backend.set(k, json.dumps(value, ensure_ascii=False), tag_keys, ttl, versions)
+                except Exception as e:
+                    self.last_error = str(e)
+            return value
+        finally:
+            try:
+                self.backend.release(k)
+            except Exception:
+                pass
+
+    def invalidate_tag(self, tag: Hashable) -> None:
+        """Supprime les valeurs partagées du tag et prévient les autres répliques."""
+        t = encode_key(tag)
+        try:
+            self.backend.delete_tag(t)
+            self.backend.publish(self.node, t)
+        except Exception as e:
+            self.last_error = str(e)
+
+    def subscribe(self, on_tag: Callable[[Hashable], None]) -> None:
+        """`on_tag(tag)` pour chaque invalidation venue d'une autre réplique."""
+        def callback(sender: str, t: str):
+            if sender == self.node:
+                return
+            tag = json.loads(t)
+            on_tag(tuple(tag) if isinstance(tag, list) else tag)
+        self.backend.subscribe(callback)
@@ -0,0 +1,158 @@
+# yorgios_core/snapshots.py
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+import pandas as pd
+
+
+# ————————————————————————
+# Instantané immuable d'une feuille
+# ————————————————————————
+class Snapshot:
+    """
+    DataFrame partagé entre toutes les sessions, jamais modifié en place.
+    `view()` rend une vue sans copie ; les colonnes dérivées (dates parsées…)
+    sont calculées une seule fois par instantané. Suppose pandas en mode
+    Copy-on-Write (défaut à partir de pandas 3, activé par app_yorgios.py avant).
+    """
+
+    __slots__ = ("_frame", "_derived", "_lock", "loaded_at")
+
+    def __init__(self, frame: pd.DataFrame, derived: Optional[Dict[str, Callable[[pd.DataFrame], Any]]] = None):
+        frame = frame.copy(deep=False)
+        for name, fn in (derived or {}).items():
+            frame[name] = fn(frame)
+        self._frame = frame
+        self._derived: Dict[str, pd.Series] = {}
+        self._lock = threading.Lock()
+        self.loaded_at = time.time()
+
+    @property
+    def empty(self) -> bool:
+        return self._frame.empty
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._frame.columns
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    def view(self) -> pd.DataFrame:
+        """Vue zéro-copie : l'appelant peut ajouter/modifier des colonnes sans toucher l'instantané."""
+        return self._frame.copy(deep=False)
+
+    def derived(self, name: str, fn: Callable[[pd.DataFrame], pd.Series]) -> pd.Series:
+        """Série calculée à la demande puis mémorisée pour la durée de vie de l'instantané."""
+        cached = self._derived.get(name)
+        if cached is not None:
+            return cached
+        with self._lock:
+            cached = self._derived.get(name)
+            if cached is None:
+                cached = fn(self._frame)
+                self._derived[name] = cached
+        return cached
+
+
+def freeze_values(values) -> Tuple[Tuple[str, ...], ...]:
+    """Valeurs brutes d'une feuille (liste de listes) → tuples immuables partageables."""
+    return tuple(tuple(row) for row in (values or []))
+
+
+# ————————————————————————
+# Cache partagé d'instantanés (tenu par st.cache_resource côté app)
+# ————————————————————————
+def sheet_tag(sheet_id: str) -> tuple:
+    return ("sheet", sheet_id)
+
+def worksheet_tag(sheet_id: str, title: str) -> tuple:
+    return ("ws", sheet_id, title)
+
+
+class SnapshotCache:
+    """
+    Cache clé → objet immuable avec TTL. Les lectures concurrentes d'une même clé
+    attendent un seul chargement (pas de rafale d'appels Sheets au démarrage).
+    Le TTL est évalué à la lecture : un appelant peut le raccourcir à tout moment
+    (ex. flux de modifications Drive indisponible).
+
+    Chaque entrée peut porter des étiquettes (spreadsheet, onglet, ou tout autre
+    tag) : une écriture invalide seulement ce qu'elle a touché. Un chargement en
+    cours pendant une invalidation n'est pas mémorisé (il peut être périmé).
+
+    Avec `shared` (cf. shared_cache.SharedCache), les entrées demandées avec
+    `shared=True` passent par le cache commun aux répliques, et les
+    invalidations par tag leur sont diffusées.
+    """
+
+    def __init__(self, shared=None):
+        self.shared = shared
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._tags: Dict[Hashable, Set[Hashable]] = {}      # tag → clés
+        self._generation: Dict[Hashable, int] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._guard = threading.Lock()
+        if shared is not None:
+            shared.subscribe(lambda tag: self.invalidate_tag(tag, broadcast=False))
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get(
+        self, key: Hashable, loader: Callable[[], Any], ttl: float,
+        tags: Iterable[Hashable] = (), shared: bool = False,
+    ) -> Any:
+        tags = list(tags)
+        if shared and self.shared is not None:
+            local_loader = loader
+            loader = lambda: self.shared.fetch(key, local_loader, ttl, tags)
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[0] < ttl:
+            return entry[1]
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] < ttl:
+                return entry[1]
+            generation = self._generation.get(key, 0)
+            value = loader()
+            with self._guard:
+                if self._generation.get(key, 0) == generation:
+                    self._entries[key] = (time.time(), value)
+                    for tag in tags:
+                        self._tags.setdefault(tag, set()).add(key)
+            return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._guard:
+            self._generation[key] = self._generation.get(key, 0) + 1
+            self._entries.pop(key, None)
+
+    def invalidate_tag(self, tag: Hashable, broadcast: bool = True) -> int:
+        """Invalide toutes les entrées étiquetées `tag` (et chez les autres répliques) ; renvoie leur nombre."""
+        with self._guard:
+            keys = self._tags.pop(tag, set())
+        for k in keys:
+            self.invalidate(k)
+        if broadcast and self.shared is not None:
+            self.shared.invalidate_tag(tag)
+        return len(keys)
+
+    def invalidate_sheet(self, sheet_id: str) -> int:
+        return self.invalidate_tag(sheet_tag(sheet_id))
+
+    def invalidate_worksheet(self, sheet_id: str, title: str) -> int:
+        return self.invalidate_tag(worksheet_tag(sheet_id, title))
+
+    def clear(self) -> None:
+        with self._guard:
+            for k in self._entries:
+                self._generation[k] = self._generation.get(k, 0) + 1
+            self._entries.clear()
+            self._tags.clear()
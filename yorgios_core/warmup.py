@@ -0,0 +1,134 @@
+# yorgios_core/warmup.py
+# Préchauffage au démarrage du serveur et sonde de disponibilité : les handles
+# de spreadsheets, le catalogue, les onglets du dashboard et les protocoles sont
+# chargés en parallèle avant la première session ; /ready ne répond 200 qu'une
+# fois ce préchauffage terminé, pour que l'orchestrateur n'envoie du trafic
+# qu'aux instances chaudes.
+from __future__ import annotations
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+from . import runtime
+from .config import (
+    HYGIENE_TYPES, LIVRAISON_WS,
+    SHEET_COMMANDES_ID, SHEET_HYGIENE_ID, SHEET_PRODUITS_ID, SHEET_RESP_ID, SHEET_TEMP_ID,
+)
+
+
+class Warmup:
+    """
+    Tâches nommées exécutées une fois, en parallèle. Une tâche en échec est
+    notée mais ne bloque pas la disponibilité : l'app sait recharger à la demande.
+    """
+
+    def __init__(self, tasks: Dict[str, Callable[[], object]], workers: int = 6):
+        self.tasks = dict(tasks)
+        self.workers = workers
+        self.status: Dict[str, str] = {name: "pending" for name in self.tasks}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _run_task(self, name: str) -> None:
+        t0 = time.perf_counter()
+        try:
+            self.tasks[name]()
+            self.status[name] = f"ok ({time.perf_counter() - t0:.1f} s)"
+        except Exception as e:
+            self.status[name] = f"erreur : {e}"
+
+    def run(self) -> None:
+        self.started_at = time.time()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(self._run_task, self.tasks))
+        self.finished_at = time.time()
+        self._done.set()
+
+    def start(self) -> "Warmup":
+        threading.Thread(target=self.run, name="warmup", daemon=True).start()
+        return self
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "duration_s": round(self.finished_at - self.started_at, 2) if self.ready else None,
+            "tasks": dict(self.status),
+        }
+
+
+def load_current_temperatures(today: Optional[date] = None):
+    """Onglet « Semaine N AAAA » (ou « Semaine N ») de la semaine en cours."""
+    iso_year, iso_week, _ = (today or date.today()).isocalendar()
+    titles = runtime.worksheet_titles(SHEET_TEMP_ID)
+    for cand in (f"Semaine {iso_week} {iso_year}", f"Semaine {iso_week}"):
+        if cand in titles:
+            return runtime.worksheet_values(SHEET_TEMP_ID, cand)
+
+def load_responsables():
+    titles = runtime.worksheet_titles(SHEET_RESP_ID)
+    if titles:
+        return runtime.worksheet_values(SHEET_RESP_ID, titles[0])
+
+
+def default_tasks(today: Optional[date] = None) -> Dict[str, Callable[[], object]]:
+    """Ce que la première session charge : handles, catalogue, dashboard, protocoles."""
+    tasks: Dict[str, Callable[[], object]] = {
+        f"spreadsheet {key}": (lambda key=key: runtime.spreadsheet(key)) for key in runtime.ALL_SHEETS
+    }
+    tasks.update({
+        "catalogue": lambda: runtime.worksheet_records(SHEET_PRODUITS_ID, "Produits"),
+        "catalogue (valeurs)": lambda: runtime.worksheet_values(SHEET_PRODUITS_ID, "Produits"),
+        "températures": lambda: load_current_temperatures(today),
+        "responsables": load_responsables,
+        "vitrine": lambda: runtime.worksheet_values(SHEET_COMMANDES_ID, "Vitrine"),
+        "livraisons": lambda: runtime.worksheet_values(SHEET_COMMANDES_ID, LIVRAISON_WS),
+        "protocoles": lambda: runtime.protocol_store().refresh(),
+        "flux drive": runtime.drive_watcher,
+    })
+    for typ in HYGIENE_TYPES:
+        tasks[f"hygiène {typ}"] = lambda typ=typ: runtime.worksheet_values(SHEET_HYGIENE_ID, typ)
+    return tasks
+
+
+# ————————————————————————
+# Sonde HTTP
+# ————————————————————————
+def serve_readiness(warmup: Warmup, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    GET /ready : 200 une fois le préchauffage fini, 503 avant (détail en JSON).
+    GET /live  : 200 tant que le processus répond.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/live"):
+                code, body = 200, {"alive": True}
+            elif self.path.startswith("/ready"):
+                body = warmup.report()
+                code = 200 if warmup.ready else 503
+            else:
+                code, body = 404, {"error": "not found"}
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass  # pas de ligne de log à chaque sonde
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="readiness", daemon=True).start()
+    return server